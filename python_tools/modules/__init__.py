@@ -10,13 +10,36 @@ from .config.data_types import (
     DataGenRule,
     DataGenConfig,
     ComponentConfig,
-    CommConfig
+    CommConfig,
+    ClockMode,
+    FrameFormat,
+    BinaryFrameConfig,
+    ChecksumAlgorithm,
+    DecoderMethod
 )
 
 from .config.defaults import DefaultConfigs
 from .communication.manager import CommunicationManager
+from .communication.coalescer import CoalescingWriter
+from .communication.async_manager import AsyncCommunicationManager
+from .communication.fanout import FanoutServer
+from .communication.send_queue import SendQueue
+from .communication.ring_buffer import CircularBuffer, FrameScanner
+from .communication.reader import BackgroundReader
+from .communication.sinks import NullSink, FileSink, PipeSink
+from .communication.port_inventory import SerialPortInventory, get_port_inventory
 from .components.base import BaseComponentGenerator
 from .components.factory import ComponentGeneratorFactory
+from .components.scheduler import ComponentScheduler
+from .components.pacing import Pacer, DeadlineSleeper
+from .components.clock import SampleClock, WallClock, MonotonicClock, VirtualClock, create_clock
+from .protocol.formatter import FrameFormatter
+from .protocol.binary import BinaryFrameLayout
+from .protocol.merged import MergedFrameBuilder
+from .engine.send_loop import SendLoop
+from .engine.shared import SharedFrameRing, SharedStats
+from .engine.process import EngineProcess
+from .engine.preview import PreviewBuffer
 
 __version__ = "2.1.0"
 __author__ = "Claude Code Assistant"
@@ -28,8 +51,41 @@ __all__ = [
     'DataGenConfig',
     'ComponentConfig',
     'CommConfig',
+    'ClockMode',
+    'FrameFormat',
+    'BinaryFrameConfig',
+    'ChecksumAlgorithm',
+    'DecoderMethod',
     'DefaultConfigs',
     'CommunicationManager',
+    'CoalescingWriter',
+    'AsyncCommunicationManager',
+    'FanoutServer',
+    'SendQueue',
+    'CircularBuffer',
+    'FrameScanner',
+    'BackgroundReader',
+    'NullSink',
+    'FileSink',
+    'PipeSink',
+    'SerialPortInventory',
+    'get_port_inventory',
     'BaseComponentGenerator',
-    'ComponentGeneratorFactory'
+    'ComponentGeneratorFactory',
+    'ComponentScheduler',
+    'Pacer',
+    'DeadlineSleeper',
+    'SampleClock',
+    'WallClock',
+    'MonotonicClock',
+    'VirtualClock',
+    'create_clock',
+    'FrameFormatter',
+    'BinaryFrameLayout',
+    'MergedFrameBuilder',
+    'SendLoop',
+    'SharedFrameRing',
+    'SharedStats',
+    'EngineProcess',
+    'PreviewBuffer'
 ]
\ No newline at end of file
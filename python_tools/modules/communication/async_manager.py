@@ -0,0 +1,239 @@
+"""
+异步通讯管理器
+
+基于 asyncio 的通讯后端，配置与 CommunicationManager 相同（CommConfig）：
+TCP 使用流（StreamReader/StreamWriter），UDP 与组播使用数据报端点，
+pyserial 没有异步接口，串口写操作在专用线程中执行并以 await 等待完成。
+一个事件循环即可同时驱动多个连接，慢速对端不会阻塞其他连接。
+"""
+
+import asyncio
+import socket
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Union
+
+from ..config.data_types import CommConfig, CommType
+from .manager import CommunicationManager
+from .port_inventory import get_port_inventory
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    """UDP 端点协议，只记录发送错误"""
+
+    def __init__(self):
+        self.error: Optional[Exception] = None
+
+    def error_received(self, exc: Exception):
+        self.error = exc
+
+class AsyncCommunicationManager:
+    """异步通讯管理器
+
+    每个实例管理一个连接，接口与 CommunicationManager 一致，但 connect/send_data/
+    disconnect 为协程。多个实例可以在同一事件循环中并发使用。
+    """
+
+    def __init__(self):
+        self.active_connection = None
+        self.is_connected = False
+        self.udp_remote: Optional[Tuple[str, int]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # 串口枚举等静态查询与同步管理器共用
+    get_available_serial_ports = staticmethod(CommunicationManager.get_available_serial_ports)
+    refresh_serial_ports = staticmethod(CommunicationManager.refresh_serial_ports)
+    get_default_serial_port = staticmethod(CommunicationManager.get_default_serial_port)
+    get_common_serial_baudrates = staticmethod(CommunicationManager.get_common_serial_baudrates)
+    get_serial_databits_options = staticmethod(CommunicationManager.get_serial_databits_options)
+    get_serial_parity_options = staticmethod(CommunicationManager.get_serial_parity_options)
+    get_serial_stopbits_options = staticmethod(CommunicationManager.get_serial_stopbits_options)
+
+    async def connect(self, config: CommConfig) -> bool:
+        """建立连接"""
+        try:
+            if config.comm_type == CommType.SERIAL:
+                return await self._connect_serial(config)
+            elif config.comm_type == CommType.TCP_CLIENT:
+                return await self._connect_tcp_client(config)
+            elif config.comm_type == CommType.TCP_SERVER:
+                return await self._connect_tcp_server(config)
+            elif config.comm_type == CommType.UDP:
+                return await self._connect_udp(config)
+            elif config.comm_type == CommType.UDP_MULTICAST:
+                return await self._connect_udp_multicast(config)
+            else:
+                print(f"不支持的通讯类型: {config.comm_type}")
+                return False
+        except Exception as e:
+            print(f"连接失败: {e}")
+            return False
+
+    async def _connect_serial(self, config: CommConfig) -> bool:
+        """在专用线程中打开串口，之后的写操作也在该线程中串行执行"""
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serial-writer")
+        loop = asyncio.get_running_loop()
+        try:
+            inventory = get_port_inventory()
+            if not inventory.contains(config.port):
+                await loop.run_in_executor(self._executor, inventory.refresh)
+                if not inventory.contains(config.port):
+                    available_ports = [p['device'] for p in inventory.ports()]
+                    print(f"串口 {config.port} 不存在。可用串口: {available_ports}")
+                    self._shutdown_executor()
+                    return False
+
+            conn = await loop.run_in_executor(self._executor, CommunicationManager.open_serial, config)
+            self.active_connection = conn
+            self.is_connected = True
+            print(f"串口连接成功: {config.port} @ {config.baudrate}bps")
+            return True
+        except Exception as e:
+            print(f"串口连接失败: {e}")
+            self._shutdown_executor()
+            return False
+
+    async def _connect_tcp_client(self, config: CommConfig) -> bool:
+        """连接TCP客户端"""
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(config.host, config.tcp_port), config.timeout)
+            self.active_connection = writer
+            self.is_connected = True
+            return True
+        except Exception as e:
+            print(f"TCP客户端连接失败: {e}")
+            return False
+
+    async def _connect_tcp_server(self, config: CommConfig) -> bool:
+        """启动TCP服务器并等待第一个客户端连接"""
+        accepted: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        def on_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            if accepted.done():
+                writer.close()
+            else:
+                accepted.set_result(writer)
+
+        try:
+            self._server = await asyncio.start_server(on_client, config.host, config.tcp_port, reuse_address=True)
+            print(f"TCP服务器在 {config.host}:{config.tcp_port} 等待连接...")
+            writer = await asyncio.wait_for(accepted, config.timeout)
+            print(f"客户端已连接: {writer.get_extra_info('peername')}")
+            self.active_connection = writer
+            self.is_connected = True
+            return True
+        except asyncio.TimeoutError:
+            print("TCP服务器连接超时")
+            await self._close_server()
+            return False
+        except Exception as e:
+            print(f"TCP服务器启动失败: {e}")
+            await self._close_server()
+            return False
+
+    async def _connect_udp(self, config: CommConfig) -> bool:
+        """设置UDP通讯"""
+        try:
+            transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                _DatagramProtocol, local_addr=('0.0.0.0', config.udp_local_port))
+            self.active_connection = transport
+            self.udp_remote = (config.host, config.udp_remote_port)
+            self.is_connected = True
+            return True
+        except Exception as e:
+            print(f"UDP设置失败: {e}")
+            return False
+
+    async def _connect_udp_multicast(self, config: CommConfig) -> bool:
+        """设置UDP组播"""
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+            # 设置组播
+            mreq = struct.pack("4sl", socket.inet_aton(config.host), socket.INADDR_ANY)
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+
+            sock.bind(('', config.udp_local_port))
+            sock.setblocking(False)
+
+            transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                _DatagramProtocol, sock=sock)
+            self.active_connection = transport
+            self.udp_remote = (config.host, config.udp_remote_port)
+            self.is_connected = True
+            return True
+        except Exception as e:
+            print(f"UDP组播设置失败: {e}")
+            return False
+
+    async def send_data(self, data: Union[str, bytes, bytearray, memoryview], config: CommConfig) -> bool:
+        """发送数据
+
+        TCP 写入后等待发送缓冲区回落到水位线以下（drain），慢速对端只阻塞自身的协程。
+
+        Args:
+            data: 文本帧（按UTF-8编码）或已编码的字节数据，字节数据原样发送
+            config: 通讯配置
+        """
+        if not self.is_connected or not self.active_connection:
+            return False
+
+        try:
+            data_bytes = data.encode('utf-8') if isinstance(data, str) else data
+
+            if config.comm_type == CommType.SERIAL:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.active_connection.write, bytes(data_bytes))
+                return True
+
+            elif config.comm_type in [CommType.TCP_CLIENT, CommType.TCP_SERVER]:
+                self.active_connection.write(data_bytes)
+                await asyncio.wait_for(self.active_connection.drain(), config.timeout)
+                return True
+
+            elif config.comm_type in [CommType.UDP, CommType.UDP_MULTICAST]:
+                self.active_connection.sendto(bytes(data_bytes), self.udp_remote)
+                return True
+
+        except Exception as e:
+            print(f"数据发送失败: {e}")
+            return False
+
+        return False
+
+    async def disconnect(self):
+        """断开连接"""
+        try:
+            conn = self.active_connection
+            self.active_connection = None
+            self.is_connected = False
+
+            if isinstance(conn, asyncio.StreamWriter):
+                conn.close()
+                try:
+                    await conn.wait_closed()
+                except ConnectionError:
+                    pass
+            elif conn is not None and self._executor is not None:
+                # 串口在写线程中关闭，保证已提交的写操作先完成
+                await asyncio.get_running_loop().run_in_executor(self._executor, conn.close)
+            elif conn is not None:
+                conn.close()
+
+            await self._close_server()
+            self._shutdown_executor()
+        except Exception as e:
+            print(f"断开连接失败: {e}")
+
+    async def _close_server(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def _shutdown_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,202 @@
+"""
+写合并
+
+将连续的小帧收集到缓冲区，在累计字节数达到阈值或最早一帧等待超过最大延迟时
+一次写出（以先到者为准），减少高频发送时的系统调用次数，同时保证延迟有上界。
+数据报模式（UDP）下帧不会跨数据报拆分，每个数据报不超过长度上限，超过上限的单帧直接拒绝。
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional
+
+# UDP 单个数据报的最大有效载荷（IPv4）
+MAX_UDP_PAYLOAD = 65507
+
+# 刷新原因
+FLUSH_SIZE = 'size'          # 达到字节阈值
+FLUSH_LATENCY = 'latency'    # 达到最大延迟
+FLUSH_DATAGRAM = 'datagram'  # 再加一帧会超出数据报上限
+FLUSH_MANUAL = 'manual'      # 主动调用 flush()
+FLUSH_CLOSE = 'close'        # 关闭时写出剩余数据
+
+@dataclass
+class WriteStats:
+    """写合并统计
+
+    Attributes:
+        frames: 提交的帧数
+        writes: 实际写操作次数
+        bytes: 写出的字节数
+        flush_reasons: 刷新原因 -> 次数
+        errors: 写失败次数
+        max_delay: 帧在缓冲区中的最长等待时间（秒）
+    """
+    frames: int = 0
+    writes: int = 0
+    bytes: int = 0
+    flush_reasons: Dict[str, int] = field(default_factory=dict)
+    errors: int = 0
+    max_delay: float = 0.0
+
+    @property
+    def frames_per_write(self) -> float:
+        """平均每次写操作包含的帧数"""
+        return self.frames / self.writes if self.writes else 0.0
+
+class CoalescingWriter:
+    """写合并器
+
+    缓冲区只在条件锁内交换出去，实际写出在锁外进行，慢速写出不会阻塞提交新帧。
+    交换出的数据按顺序排队，同一时刻只有一个线程负责写出，保证字节顺序。
+    写出失败会计入统计，并在下一次 write()/flush() 时以 RuntimeError 抛给调用方。
+
+    Args:
+        write: 实际写函数，接收 bytes，失败时抛出异常
+        max_bytes: 字节阈值，缓冲区达到该大小立即写出
+        max_latency: 最大延迟（秒），缓冲区中最早一帧等待超过该时间即写出
+        datagram: 是否为数据报模式（帧不跨数据报拆分）
+        max_datagram: 数据报模式下每次写出的最大字节数，单帧超过该长度时拒绝提交
+    """
+
+    def __init__(self, write: Callable[[bytes], None], max_bytes: int = 4096,
+                 max_latency: float = 0.005, datagram: bool = False,
+                 max_datagram: int = MAX_UDP_PAYLOAD):
+        if max_bytes <= 0:
+            raise ValueError(f"写合并字节阈值必须大于0: {max_bytes}")
+        if max_latency <= 0:
+            raise ValueError(f"写合并最大延迟必须大于0: {max_latency}")
+
+        self._write = write
+        self.datagram = datagram
+        self.max_datagram = max_datagram
+        self.max_bytes = min(max_bytes, max_datagram) if datagram else max_bytes
+        self.max_latency = max_latency
+        self.stats = WriteStats()
+        self.last_error: Optional[Exception] = None
+
+        self._buffer = bytearray()
+        self._first_time: Optional[float] = None  # 缓冲区中最早一帧的入队时刻
+        self._pending: Deque[bytes] = deque()     # 已交换出、等待写出的数据
+        self._writing = False                     # 是否有线程正在写出 _pending
+        self._unreported: Optional[Exception] = None  # 尚未报告给调用方的写出错误
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._flush_loop, name="coalescing-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, data: bytes):
+        """提交一帧
+
+        Raises:
+            ValueError: 数据报模式下单帧超过数据报上限
+            RuntimeError: 写合并器已关闭，或之前的写出失败
+        """
+        if self.datagram and len(data) > self.max_datagram:
+            raise ValueError(f"帧长度 {len(data)} 超过数据报上限 {self.max_datagram}")
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("写合并器已关闭")
+            self._raise_unreported_locked()
+            drain = False
+            if self.datagram and self._buffer and len(self._buffer) + len(data) > self.max_bytes:
+                drain = self._take_locked(FLUSH_DATAGRAM)
+            if not self._buffer:
+                self._first_time = time.monotonic()
+                self._condition.notify_all()
+            self._buffer += data
+            self.stats.frames += 1
+            if len(self._buffer) >= self.max_bytes:
+                drain = self._take_locked(FLUSH_SIZE) or drain
+        if drain:
+            self._drain()
+
+    def flush(self, reason: str = FLUSH_MANUAL):
+        """立即写出缓冲区中的数据，返回时之前提交的帧都已写出
+
+        Raises:
+            RuntimeError: 写出失败
+        """
+        with self._condition:
+            drain = self._take_locked(reason)
+            if not drain:
+                # 其他线程正在写出，等它把队列写完
+                while self._writing:
+                    self._condition.wait()
+        if drain:
+            self._drain()
+        with self._condition:
+            self._raise_unreported_locked()
+
+    def close(self):
+        """写出剩余数据并停止后台刷新线程"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout=1.0)
+        try:
+            self.flush(FLUSH_CLOSE)
+        except RuntimeError:
+            pass  # 已计入 stats.errors / last_error
+
+    def _take_locked(self, reason: str) -> bool:
+        """在持有条件锁时把缓冲区交换到写出队列，返回调用方是否应负责写出"""
+        if self._buffer:
+            stats = self.stats
+            stats.flush_reasons[reason] = stats.flush_reasons.get(reason, 0) + 1
+            stats.max_delay = max(stats.max_delay, time.monotonic() - self._first_time)
+            self._pending.append(bytes(self._buffer))
+            self._buffer.clear()
+            self._first_time = None
+        if self._writing or not self._pending:
+            return False
+        self._writing = True
+        return True
+
+    def _drain(self):
+        """在锁外按顺序写出队列中的数据（同一时刻只有一个线程执行）"""
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._writing = False
+                    self._condition.notify_all()
+                    return
+                data = self._pending.popleft()
+            try:
+                self._write(data)
+            except Exception as e:
+                with self._condition:
+                    self.stats.errors += 1
+                    self.last_error = e
+                    self._unreported = e
+            else:
+                with self._condition:
+                    self.stats.writes += 1
+                    self.stats.bytes += len(data)
+
+    def _raise_unreported_locked(self):
+        error = self._unreported
+        if error is not None:
+            self._unreported = None
+            raise RuntimeError(f"写合并写出失败: {error}") from error
+
+    def _flush_loop(self):
+        """后台线程：在最早一帧到达最大延迟时写出"""
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                if self._first_time is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._first_time + self.max_latency - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                drain = self._take_locked(FLUSH_LATENCY)
+            if drain:
+                self._drain()
@@ -0,0 +1,264 @@
+"""
+多客户端 TCP 广播服务器
+
+基于 selectors 的非阻塞服务器：后台线程持续接受客户端连接，每帧数据广播给所有客户端。
+每个客户端有独立的有界发送缓冲区，对端接收慢时缓冲区积压，超过上限后按策略
+断开该客户端（drop）或对其跳过当前帧（skip），不会阻塞其他客户端和发送线程。
+"""
+
+import selectors
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+# 慢速客户端处理策略
+SLOW_CLIENT_DROP = 'drop'  # 断开连接
+SLOW_CLIENT_SKIP = 'skip'  # 跳过放不下的帧，保持连接
+SLOW_CLIENT_POLICIES = (SLOW_CLIENT_DROP, SLOW_CLIENT_SKIP)
+
+@dataclass
+class FanoutStats:
+    """广播服务器统计
+
+    Attributes:
+        clients_accepted: 累计接受的客户端数
+        clients_dropped: 因发送缓冲区溢出被断开的客户端数
+        clients_closed: 对端主动断开或出错的客户端数
+        frames: 广播的帧数
+        frames_skipped: 因缓冲区已满对某个客户端跳过的帧数（按客户端累计）
+        bytes_sent: 实际写入套接字的字节数（所有客户端合计）
+    """
+    clients_accepted: int = 0
+    clients_dropped: int = 0
+    clients_closed: int = 0
+    frames: int = 0
+    frames_skipped: int = 0
+    bytes_sent: int = 0
+
+class _Client:
+    """客户端连接及其待发送数据"""
+
+    __slots__ = ('sock', 'address', 'pending', 'writing')
+
+    def __init__(self, sock: socket.socket, address: Tuple):
+        self.sock = sock
+        self.address = address
+        self.pending = bytearray()
+        self.writing = False  # 是否已注册可写事件
+
+class FanoutServer:
+    """多客户端 TCP 广播服务器
+
+    Args:
+        host: 监听地址
+        port: 监听端口（0 表示自动分配）
+        client_buffer_size: 每个客户端发送缓冲区上限（字节）
+        slow_client_policy: 缓冲区溢出时的处理策略，'drop' 或 'skip'
+    """
+
+    def __init__(self, host: str, port: int, client_buffer_size: int = 65536,
+                 slow_client_policy: str = SLOW_CLIENT_DROP):
+        if slow_client_policy not in SLOW_CLIENT_POLICIES:
+            raise ValueError(f"不支持的慢速客户端策略: {slow_client_policy}，可选: {list(SLOW_CLIENT_POLICIES)}")
+        if client_buffer_size <= 0:
+            raise ValueError(f"客户端缓冲区大小必须大于0: {client_buffer_size}")
+
+        self.host = host
+        self.port = port
+        self.client_buffer_size = client_buffer_size
+        self.slow_client_policy = slow_client_policy
+        self.stats = FanoutStats()
+
+        self._clients: Dict[socket.socket, _Client] = {}
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._server: Optional[socket.socket] = None
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """实际监听地址"""
+        return self._server.getsockname() if self._server else (self.host, self.port)
+
+    @property
+    def client_count(self) -> int:
+        """当前客户端数"""
+        with self._lock:
+            return len(self._clients)
+
+    def clients(self) -> List[Dict]:
+        """当前客户端及其积压字节数"""
+        with self._lock:
+            return [{'address': c.address, 'pending': len(c.pending)} for c in self._clients.values()]
+
+    def start(self):
+        """开始监听并启动事件线程"""
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        server.bind((self.host, self.port))
+        server.listen(16)
+        server.setblocking(False)
+        self._server = server
+
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._selector.register(server, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._running = True
+        self._thread = threading.Thread(target=self._event_loop, name="fanout-server", daemon=True)
+        self._thread.start()
+
+    def broadcast(self, data: Union[bytes, bytearray, memoryview]):
+        """向所有客户端发送一帧
+
+        缓冲区为空时直接尝试非阻塞发送，未写完的部分及后续帧进入缓冲区，
+        由事件线程在套接字可写时继续发送。未写完的部分同样受缓冲区上限约束。
+        """
+        data = bytes(data)
+        size = len(data)
+        wake = False
+        with self._lock:
+            self.stats.frames += 1
+            for client in list(self._clients.values()):
+                if client.pending:
+                    if len(client.pending) + size > self.client_buffer_size:
+                        self._overflow_locked(client)
+                        continue
+                    client.pending += data
+                    continue
+
+                if size > self.client_buffer_size and self.slow_client_policy == SLOW_CLIENT_SKIP:
+                    # 剩余部分可能放不下，而半帧无法跳过，超过缓冲区上限的帧整帧跳过
+                    self.stats.frames_skipped += 1
+                    continue
+                try:
+                    sent = client.sock.send(data)
+                except (BlockingIOError, InterruptedError):
+                    sent = 0
+                except OSError:
+                    self.stats.clients_closed += 1
+                    self._remove_locked(client)
+                    continue
+                self.stats.bytes_sent += sent
+                if sent < size:
+                    if size - sent > self.client_buffer_size:
+                        self._overflow_locked(client)
+                        continue
+                    client.pending += data[sent:]
+                    wake = True
+        if wake:
+            self._wakeup()
+
+    def close(self):
+        """停止服务器并断开所有客户端"""
+        if not self._running:
+            return
+        self._running = False
+        self._wakeup()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        with self._lock:
+            for client in list(self._clients.values()):
+                self._remove_locked(client)
+        self._selector.close()
+        self._server.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+    def _wakeup(self):
+        try:
+            self._wakeup_w.send(b'\0')
+        except (BlockingIOError, OSError):
+            pass
+
+    def _overflow_locked(self, client: _Client):
+        """在持有锁时按策略处理放不下当前帧的客户端"""
+        if self.slow_client_policy == SLOW_CLIENT_DROP:
+            self.stats.clients_dropped += 1
+            self._remove_locked(client)
+        else:
+            self.stats.frames_skipped += 1
+
+    def _remove_locked(self, client: _Client):
+        """在持有锁时移除客户端"""
+        self._clients.pop(client.sock, None)
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    def _event_loop(self):
+        """事件线程：接受连接、发送积压数据、检测对端断开"""
+        while self._running:
+            for key, events in self._selector.select(timeout=0.5):
+                sock = key.fileobj
+                if sock is self._server:
+                    self._accept()
+                elif sock is self._wakeup_r:
+                    try:
+                        while self._wakeup_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    with self._lock:
+                        client = self._clients.get(sock)
+                        if client is None:
+                            continue
+                        if events & selectors.EVENT_READ:
+                            self._read_locked(client)
+                        if events & selectors.EVENT_WRITE and sock in self._clients:
+                            self._flush_locked(client)
+            self._update_interest()
+
+    def _accept(self):
+        try:
+            sock, address = self._server.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self._lock:
+            self._clients[sock] = _Client(sock, address)
+            self._selector.register(sock, selectors.EVENT_READ)
+            self.stats.clients_accepted += 1
+        print(f"客户端已连接: {address}")
+
+    def _read_locked(self, client: _Client):
+        """读取并丢弃客户端发来的数据，读到 EOF 视为断开"""
+        try:
+            data = client.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self.stats.clients_closed += 1
+            self._remove_locked(client)
+
+    def _flush_locked(self, client: _Client):
+        """发送积压数据"""
+        try:
+            sent = client.sock.send(client.pending)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self.stats.clients_closed += 1
+            self._remove_locked(client)
+            return
+        self.stats.bytes_sent += sent
+        del client.pending[:sent]
+
+    def _update_interest(self):
+        """有积压数据的客户端关注可写事件，其余只关注可读事件"""
+        with self._lock:
+            for client in self._clients.values():
+                writing = bool(client.pending)
+                if writing != client.writing:
+                    events = selectors.EVENT_READ | (selectors.EVENT_WRITE if writing else 0)
+                    self._selector.modify(client.sock, events)
+                    client.writing = writing
@@ -0,0 +1,172 @@
+"""
+端到端延迟测量
+
+发送端在每帧结束分隔符之后附加文本尾标 <序号,发送时刻>（time.monotonic_ns），
+位于帧分隔符之外，Serial Studio 解析时按帧间数据丢弃，不影响数据集。
+回环接收端（设备回显、TCP 回显服务或 TX/RX 短接的串口）从接收缓冲区中扫描尾标，
+按序号统计往返时延分位数、丢帧、乱序和重复。
+"""
+
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Set, Union
+
+import numpy as np
+
+from .ring_buffer import CircularBuffer, FrameScanner
+
+# 尾标分隔符：不会出现在 CSV 文本帧中
+TRAILER_START = b'<'
+TRAILER_END = b'>'
+
+class FrameStamper:
+    """为发送帧附加序号和发送时刻尾标"""
+
+    def __init__(self):
+        self.sequence = 0
+
+    @property
+    def sent(self) -> int:
+        """已附加尾标的帧数"""
+        return self.sequence
+
+    def stamp(self, frame: Union[str, bytes]) -> bytes:
+        """在帧末尾（换行符之前）插入尾标"""
+        data = frame.encode('utf-8') if isinstance(frame, str) else bytes(frame)
+        trailer = b'%s%d,%d%s' % (TRAILER_START, self.sequence, time.monotonic_ns(), TRAILER_END)
+        self.sequence += 1
+        if data.endswith(b'\n'):
+            return data[:-1] + trailer + b'\n'
+        return data + trailer
+
+@dataclass
+class LatencyReport:
+    """延迟统计报告（时间单位：毫秒）
+
+    Attributes:
+        sent: 发送帧数
+        received: 收到的不重复帧数
+        lost: 未收到的帧数
+        reordered: 序号小于已收到最大序号的帧数
+        duplicates: 重复收到的帧数
+        malformed: 无法解析的尾标数
+        rtt_mean/rtt_p50/rtt_p90/rtt_p99/rtt_max: 往返时延统计
+    """
+    sent: int = 0
+    received: int = 0
+    lost: int = 0
+    reordered: int = 0
+    duplicates: int = 0
+    malformed: int = 0
+    rtt_mean: float = 0.0
+    rtt_p50: float = 0.0
+    rtt_p90: float = 0.0
+    rtt_p99: float = 0.0
+    rtt_max: float = 0.0
+
+    @property
+    def loss_rate(self) -> float:
+        return self.lost / self.sent if self.sent else 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class LatencyTracker:
+    """从回环数据中匹配尾标并统计延迟
+
+    Args:
+        buffer: 回环接收缓冲区（如 CommunicationManager.start_reader 返回的缓冲区）
+    """
+
+    def __init__(self, buffer: CircularBuffer):
+        self.scanner = FrameScanner(buffer, start=TRAILER_START, end=TRAILER_END)
+        self._seen: Set[int] = set()
+        self._highest = -1
+        self._rtts: List[int] = []
+        self.reordered = 0
+        self.duplicates = 0
+        self.malformed = 0
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """启动后台匹配线程，数据一到达即匹配，接收时刻不受发送循环休眠影响"""
+        self._running = True
+        self._thread = threading.Thread(target=self._match_loop, name="latency-tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止后台匹配线程"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _match_loop(self):
+        buffer = self.scanner.buffer
+        while self._running:
+            # 缓冲区中可能留有不完整的尾标，等待新数据到达
+            if buffer.wait_for_data(len(buffer) + 1, 0.05):
+                self.poll()
+
+    def poll(self) -> int:
+        """处理缓冲区中已到达的尾标，返回本次匹配的帧数"""
+        with self._lock:
+            return self._poll()
+
+    def _poll(self) -> int:
+        now = time.monotonic_ns()
+        matched = 0
+        for trailer in self.scanner.frames():
+            try:
+                sequence, sent_ns = (int(field) for field in bytes(trailer).split(b','))
+            except ValueError:
+                self.malformed += 1
+                continue
+            if sequence in self._seen:
+                self.duplicates += 1
+                continue
+            if sequence < self._highest:
+                self.reordered += 1
+            else:
+                self._highest = sequence
+            self._seen.add(sequence)
+            self._rtts.append(now - sent_ns)
+            matched += 1
+        return matched
+
+    def wait(self, sent: int, timeout: float = 1.0) -> bool:
+        """等待全部 sent 帧回环到达或超时，返回是否全部到达"""
+        deadline = time.monotonic() + timeout
+        buffer = self.scanner.buffer
+        while True:
+            self.poll()
+            remaining = deadline - time.monotonic()
+            if len(self._seen) >= sent or remaining <= 0:
+                return len(self._seen) >= sent
+            # 缓冲区中可能留有不完整的尾标，等待新数据到达
+            buffer.wait_for_data(len(buffer) + 1, min(remaining, 0.05))
+
+    def report(self, sent: int) -> LatencyReport:
+        """生成统计报告"""
+        report = LatencyReport(sent=sent, received=len(self._seen), lost=max(0, sent - len(self._seen)),
+                               reordered=self.reordered, duplicates=self.duplicates, malformed=self.malformed)
+        if self._rtts:
+            # 后台线程可能仍在追加
+            with self._lock:
+                rtts = list(self._rtts)
+            rtts = np.asarray(rtts, dtype=np.float64) / 1e6
+            report.rtt_mean = float(rtts.mean())
+            report.rtt_p50, report.rtt_p90, report.rtt_p99 = (float(v) for v in np.percentile(rtts, [50, 90, 99]))
+            report.rtt_max = float(rtts.max())
+        return report
+
+    def reset(self):
+        """清空统计（缓冲区中尚未处理的数据保留）"""
+        with self._lock:
+            self._seen.clear()
+            self._highest = -1
+            self._rtts.clear()
+            self.reordered = self.duplicates = self.malformed = 0
@@ -5,12 +5,18 @@
 """
 
 import serial
-import serial.tools.list_ports
 import socket
 import struct
 import platform
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Union
 from ..config.data_types import CommConfig, CommType
+from .coalescer import CoalescingWriter, WriteStats, MAX_UDP_PAYLOAD
+from .fanout import FanoutServer
+from .send_queue import SendQueue, QueueStats
+from .reader import BackgroundReader, ReceiveStats
+from .ring_buffer import CircularBuffer
+from .sinks import Sink, SinkStats, SINK_TYPES, create_sink
+from .port_inventory import get_port_inventory
 
 class CommunicationManager:
     """高级通讯管理器"""
@@ -19,33 +25,28 @@ class CommunicationManager:
         self.connections = {}
         self.active_connection = None
         self.is_connected = False
+        self.writer: Optional[CoalescingWriter] = None
+        self.send_queue: Optional[SendQueue] = None
+        self.reader: Optional[BackgroundReader] = None
+        self.receive_buffer: Optional[CircularBuffer] = None
     
     @staticmethod
     def get_available_serial_ports() -> List[Dict[str, str]]:
-        """获取可用的串口列表（跨平台）"""
-        ports = []
-        try:
-            available_ports = serial.tools.list_ports.comports()
-            for port in available_ports:
-                port_info = {
-                    'device': port.device,
-                    'description': port.description or '未知设备',
-                    'hwid': port.hwid or '',
-                    'manufacturer': getattr(port, 'manufacturer', '') or '',
-                    'product': getattr(port, 'product', '') or '',
-                    'serial_number': getattr(port, 'serial_number', '') or ''
-                }
-                ports.append(port_info)
-        except Exception as e:
-            print(f"获取串口列表失败: {e}")
-        
-        return ports
+        """获取可用的串口列表（跨平台，读取后台刷新的缓存）"""
+        return get_port_inventory().ports()
+    
+    @staticmethod
+    def refresh_serial_ports() -> List[Dict[str, str]]:
+        """立即重新枚举串口并更新缓存"""
+        inventory = get_port_inventory()
+        inventory.refresh()
+        return inventory.ports()
     
     @staticmethod
     def get_default_serial_port() -> Optional[str]:
         """获取默认串口（跨平台）"""
         try:
-            available_ports = serial.tools.list_ports.comports()
+            available_ports = get_port_inventory().ports()
             if not available_ports:
                 return None
                 
@@ -53,26 +54,26 @@ class CommunicationManager:
             system = platform.system().lower()
             
             for port in available_ports:
-                device = port.device.lower()
-                description = (port.description or '').lower()
+                device = port['device'].lower()
+                description = port['description'].lower()
                 
                 # Windows: 优先选择USB串口
                 if system == 'windows':
                     if 'usb' in description or 'ch340' in description or 'cp210' in description or 'ftdi' in description:
-                        return port.device
+                        return port['device']
                 
                 # Linux: 优先选择USB串口
                 elif system == 'linux':
                     if device.startswith('/dev/ttyusb') or device.startswith('/dev/ttyacm'):
-                        return port.device
+                        return port['device']
                 
                 # macOS: 优先选择USB串口
                 elif system == 'darwin':
                     if 'usb' in device or device.startswith('/dev/cu.usb'):
-                        return port.device
+                        return port['device']
             
             # 如果没有找到USB串口，返回第一个可用串口
-            return available_ports[0].device
+            return available_ports[0]['device']
             
         except Exception as e:
             print(f"获取默认串口失败: {e}")
@@ -111,56 +112,86 @@ class CommunicationManager:
         """建立连接"""
         try:
             if config.comm_type == CommType.SERIAL:
-                return self._connect_serial(config)
+                connected = self._connect_serial(config)
             elif config.comm_type == CommType.TCP_CLIENT:
-                return self._connect_tcp_client(config)
+                connected = self._connect_tcp_client(config)
             elif config.comm_type == CommType.TCP_SERVER:
-                return self._connect_tcp_server(config)
+                connected = self._connect_tcp_server(config)
             elif config.comm_type == CommType.UDP:
-                return self._connect_udp(config)
+                connected = self._connect_udp(config)
             elif config.comm_type == CommType.UDP_MULTICAST:
-                return self._connect_udp_multicast(config)
+                connected = self._connect_udp_multicast(config)
+            elif config.comm_type in SINK_TYPES:
+                connected = self._connect_sink(config)
             else:
                 print(f"不支持的通讯类型: {config.comm_type}")
                 return False
+            if connected and config.write_coalescing:
+                self._start_coalescing(config)
+            if connected and config.send_queue_size > 0:
+                self.send_queue = SendQueue(lambda data: self._send_now(data, config),
+                                            capacity=config.send_queue_size, policy=config.backpressure)
+            return connected
         except Exception as e:
             print(f"连接失败: {e}")
             return False
     
+    def _start_coalescing(self, config: CommConfig):
+        """启用写合并，UDP 下每个数据报只包含完整帧且不超过数据报上限"""
+        datagram = config.comm_type in [CommType.UDP, CommType.UDP_MULTICAST]
+        self.writer = CoalescingWriter(
+            lambda data: self._write(data, config),
+            max_bytes=config.buffer_size,
+            max_latency=config.coalesce_latency,
+            datagram=datagram,
+            max_datagram=MAX_UDP_PAYLOAD
+        )
+    
+    @staticmethod
+    def open_serial(config: CommConfig) -> serial.Serial:
+        """按配置打开串口（不检查串口列表），失败时抛出 serial.SerialException"""
+        # 校验位映射
+        parity_map = {
+            'N': serial.PARITY_NONE, 
+            'E': serial.PARITY_EVEN, 
+            'O': serial.PARITY_ODD,
+            'M': serial.PARITY_MARK,
+            'S': serial.PARITY_SPACE
+        }
+        
+        # 停止位映射
+        stopbits_map = {
+            1: serial.STOPBITS_ONE,
+            1.5: serial.STOPBITS_ONE_POINT_FIVE,
+            2: serial.STOPBITS_TWO
+        }
+        
+        conn = serial.Serial(
+            port=config.port,
+            baudrate=config.baudrate,
+            bytesize=config.databits,
+            parity=parity_map.get(config.parity, serial.PARITY_NONE),
+            stopbits=stopbits_map.get(config.stopbits, serial.STOPBITS_ONE),
+            timeout=config.timeout,
+            write_timeout=config.timeout
+        )
+        return conn
+    
     def _connect_serial(self, config: CommConfig) -> bool:
         """连接串口"""
+        if config.virtual_serial:
+            return self._connect_virtual_serial(config)
         try:
-            # 验证串口是否存在
-            available_ports = [p.device for p in serial.tools.list_ports.comports()]
-            if config.port not in available_ports:
-                print(f"串口 {config.port} 不存在。可用串口: {available_ports}")
-                return False
-            
-            # 校验位映射
-            parity_map = {
-                'N': serial.PARITY_NONE, 
-                'E': serial.PARITY_EVEN, 
-                'O': serial.PARITY_ODD,
-                'M': serial.PARITY_MARK,
-                'S': serial.PARITY_SPACE
-            }
+            # 验证串口是否存在：先查缓存，缓存中没有时（设备刚插入、事件尚未处理）重新枚举一次
+            inventory = get_port_inventory()
+            if not inventory.contains(config.port):
+                inventory.refresh()
+                if not inventory.contains(config.port):
+                    available_ports = [p['device'] for p in inventory.ports()]
+                    print(f"串口 {config.port} 不存在。可用串口: {available_ports}")
+                    return False
             
-            # 停止位映射
-            stopbits_map = {
-                1: serial.STOPBITS_ONE,
-                1.5: serial.STOPBITS_ONE_POINT_FIVE,
-                2: serial.STOPBITS_TWO
-            }
-            
-            conn = serial.Serial(
-                port=config.port,
-                baudrate=config.baudrate,
-                bytesize=config.databits,
-                parity=parity_map.get(config.parity, serial.PARITY_NONE),
-                stopbits=stopbits_map.get(config.stopbits, serial.STOPBITS_ONE),
-                timeout=config.timeout,
-                write_timeout=config.timeout
-            )
+            conn = self.open_serial(config)
             
             # 测试连接
             if conn.is_open:
@@ -179,6 +210,22 @@ class CommunicationManager:
             print(f"串口连接异常: {e}")
             return False
     
+    def _connect_virtual_serial(self, config: CommConfig) -> bool:
+        """创建虚拟串口，从设备路径供 Serial Studio 打开"""
+        try:
+            # pty 依赖 POSIX 模块，只在使用时导入
+            from .virtual_serial import VirtualSerialPort
+            
+            conn = VirtualSerialPort.from_config(config)
+            self.active_connection = conn
+            self.is_connected = True
+            pacing = f"{conn.byte_rate:.0f} 字节/秒" if conn.pace else "不节流"
+            print(f"虚拟串口已创建: {conn.port} @ {config.baudrate}bps（{pacing}），请在 Serial Studio 中打开该端口")
+            return True
+        except Exception as e:
+            print(f"虚拟串口创建失败: {e}")
+            return False
+    
     def _connect_tcp_client(self, config: CommConfig) -> bool:
         """连接TCP客户端"""
         try:
@@ -195,6 +242,8 @@ class CommunicationManager:
     
     def _connect_tcp_server(self, config: CommConfig) -> bool:
         """启动TCP服务器"""
+        if config.tcp_multi_client:
+            return self._start_fanout_server(config)
         try:
             server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -219,6 +268,22 @@ class CommunicationManager:
             print(f"TCP服务器启动失败: {e}")
             return False
     
+    def _start_fanout_server(self, config: CommConfig) -> bool:
+        """启动多客户端广播服务器，不等待客户端，连接建立后即开始接收数据"""
+        try:
+            server = FanoutServer(config.host, config.tcp_port,
+                                  client_buffer_size=config.client_buffer_size,
+                                  slow_client_policy=config.slow_client_policy)
+            server.start()
+            print(f"TCP广播服务器在 {config.host}:{server.address[1]} 接受连接")
+            
+            self.active_connection = server
+            self.is_connected = True
+            return True
+        except Exception as e:
+            print(f"TCP广播服务器启动失败: {e}")
+            return False
+    
     def _connect_udp(self, config: CommConfig) -> bool:
         """设置UDP通讯"""
         try:
@@ -255,40 +320,169 @@ class CommunicationManager:
             print(f"UDP组播设置失败: {e}")
             return False
     
-    def send_data(self, data: str, config: CommConfig) -> bool:
-        """发送数据"""
+    def _connect_sink(self, config: CommConfig) -> bool:
+        """打开数据汇（丢弃/文件/标准输出）"""
+        try:
+            self.active_connection = create_sink(config)
+            self.is_connected = True
+            return True
+        except Exception as e:
+            print(f"数据汇打开失败: {e}")
+            return False
+    
+    def send_data(self, data: Union[str, bytes, bytearray, memoryview], config: CommConfig,
+                  key: Optional[str] = None) -> bool:
+        """发送数据
+        
+        Args:
+            data: 文本帧（按UTF-8编码）或已编码的字节数据（如二进制帧），字节数据原样发送
+            config: 通讯配置
+            key: 组件标识，启用发送队列的 coalesce 策略时同一组件只保留最新帧
+        
+        Returns:
+            直接发送时为是否写出成功；启用发送队列时为是否进入队列
+        """
         if not self.is_connected or not self.active_connection:
             return False
         
         try:
-            data_bytes = data.encode('utf-8')
+            data_bytes = data.encode('utf-8') if isinstance(data, str) else data
             
-            if config.comm_type == CommType.SERIAL:
-                self.active_connection.write(data_bytes)
-                return True
-                
-            elif config.comm_type in [CommType.TCP_CLIENT, CommType.TCP_SERVER]:
-                self.active_connection.send(data_bytes)
-                return True
-                
-            elif config.comm_type in [CommType.UDP, CommType.UDP_MULTICAST]:
-                self.active_connection.sendto(data_bytes, self.udp_remote)
-                return True
+            if self.send_queue:
+                # 发送队列：入队后立即返回，调用方可能复用缓冲区，非 bytes 数据先复制
+                return self.send_queue.put(data_bytes if isinstance(data_bytes, bytes) else bytes(data_bytes), key)
+            
+            return self._send_now(data_bytes, config)
                 
         except Exception as e:
             print(f"数据发送失败: {e}")
             return False
+    
+    def _send_now(self, data_bytes: Union[bytes, bytearray, memoryview], config: CommConfig) -> bool:
+        """在当前线程中写出（或交给写合并器），失败时抛出异常"""
+        if self.writer:
+            # 写合并：只复制进缓冲区，由合并器按阈值或延迟写出
+            self.writer.write(data_bytes)
+            return True
+        
+        return self._write(data_bytes, config)
+    
+    def _write(self, data_bytes: Union[bytes, bytearray, memoryview], config: CommConfig) -> bool:
+        """按通讯类型写出数据，失败时抛出异常"""
+        if config.comm_type == CommType.SERIAL:
+            self.active_connection.write(data_bytes)
+            return True
+            
+        elif isinstance(self.active_connection, Sink):
+            self.active_connection.write(data_bytes)
+            return True
+            
+        elif isinstance(self.active_connection, FanoutServer):
+            self.active_connection.broadcast(data_bytes)
+            return True
+            
+        elif config.comm_type in [CommType.TCP_CLIENT, CommType.TCP_SERVER]:
+            # send 可能只写出一部分，sendall 保证整段写出
+            self.active_connection.sendall(data_bytes)
+            return True
+            
+        elif config.comm_type in [CommType.UDP, CommType.UDP_MULTICAST]:
+            self.active_connection.sendto(data_bytes, self.udp_remote)
+            return True
         
         return False
     
+    def flush(self):
+        """等待发送队列清空，并立即写出写合并缓冲区中的数据，写合并的写出失败时抛出 RuntimeError"""
+        if self.send_queue:
+            self.send_queue.flush()
+        if self.writer:
+            self.writer.flush()
+    
+    def get_sink_stats(self) -> Optional[SinkStats]:
+        """获取数据汇吞吐统计（当前连接不是数据汇时返回 None）"""
+        if isinstance(self.active_connection, Sink):
+            return self.active_connection.stats
+        return None
+    
+    def get_write_stats(self) -> Optional[WriteStats]:
+        """获取写合并统计（未启用写合并时返回 None）"""
+        return self.writer.stats if self.writer else None
+    
+    def get_queue_stats(self) -> Optional[QueueStats]:
+        """获取发送队列统计（未启用发送队列时返回 None）"""
+        return self.send_queue.stats if self.send_queue else None
+    
+    def start_reader(self, config: CommConfig, capacity: int = 1024 * 1024) -> Optional[CircularBuffer]:
+        """启动后台读线程，接收的数据写入固定容量的环形缓冲区
+        
+        Returns:
+            接收缓冲区，连接不支持读取时返回 None
+        """
+        if not self.is_connected or not self.active_connection:
+            return None
+        if self.reader and self.reader.running:
+            return self.receive_buffer
+        
+        conn = self.active_connection
+        if isinstance(conn, FanoutServer):
+            print("多客户端广播模式不支持接收数据")
+            return None
+        
+        if config.comm_type == CommType.SERIAL:
+            # 只读已到达的字节，没有数据时阻塞到串口超时
+            read_into = lambda view: conn.readinto(view[:max(1, min(conn.in_waiting, len(view)))])
+            eof_on_empty = False
+        elif config.comm_type in [CommType.TCP_CLIENT, CommType.TCP_SERVER]:
+            read_into = conn.recv_into
+            eof_on_empty = True
+        elif config.comm_type in [CommType.UDP, CommType.UDP_MULTICAST]:
+            read_into = conn.recv_into
+            eof_on_empty = False
+        else:
+            return None
+        
+        self.receive_buffer = CircularBuffer(capacity)
+        self.reader = BackgroundReader(read_into, self.receive_buffer, eof_on_empty=eof_on_empty)
+        self.reader.start()
+        return self.receive_buffer
+    
+    def stop_reader(self):
+        """停止后台读线程"""
+        if self.reader:
+            self.reader.stop()
+            self.reader = None
+    
+    def get_receive_stats(self) -> Optional[ReceiveStats]:
+        """获取接收统计（未启动读线程时返回 None）"""
+        return self.reader.stats if self.reader else None
+    
     def disconnect(self):
         """断开连接"""
         try:
+            # 先写出排队的帧，再关闭写合并器
+            if self.send_queue:
+                self.send_queue.close()
+                self.send_queue = None
+            
+            if self.writer:
+                self.writer.close()
+                self.writer = None
+            
+            # 先发出停止信号，关闭连接使阻塞的读操作立即返回后再等待线程退出
+            reader = self.reader
+            if reader:
+                reader.stop(timeout=0)
+            
             if self.active_connection:
                 if hasattr(self.active_connection, 'close'):
                     self.active_connection.close()
                 self.active_connection = None
             
+            if reader:
+                reader.join()
+                self.reader = None
+            
             for conn in self.connections.values():
                 if hasattr(conn, 'close'):
                     conn.close()
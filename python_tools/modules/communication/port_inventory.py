@@ -0,0 +1,241 @@
+"""
+串口清单缓存
+
+comports() 需要遍历 sysfs/注册表，USB 串口较多时一次枚举耗时明显。SerialPortInventory
+缓存枚举结果，由后台线程在设备变化时刷新：Linux 上监听 /dev 的 inotify 事件，
+不可用时轮询 /sys/class/tty 的目录签名，其他平台定时重新枚举。刷新时与缓存比较，
+对新增和移除的串口发出通知。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import serial.tools.list_ports
+
+# 串口事件
+PORT_ADDED = 'added'
+PORT_REMOVED = 'removed'
+
+# inotify 常量（linux/inotify.h）
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct('iIII')
+
+# 可能是串口设备的 /dev 文件名前缀
+SERIAL_DEVICE_PREFIXES = ('tty', 'rfcomm', 'cu.')
+
+# 设备节点创建后 udev 还会补充 sysfs 信息，等待事件平静后再枚举
+SETTLE_DELAY = 0.2
+
+PortListener = Callable[[str, Dict[str, str]], None]
+
+def scan_serial_ports() -> List[Dict[str, str]]:
+    """枚举系统串口（不使用缓存）"""
+    ports = []
+    try:
+        for port in serial.tools.list_ports.comports():
+            ports.append({
+                'device': port.device,
+                'description': port.description or '未知设备',
+                'hwid': port.hwid or '',
+                'manufacturer': getattr(port, 'manufacturer', '') or '',
+                'product': getattr(port, 'product', '') or '',
+                'serial_number': getattr(port, 'serial_number', '') or ''
+            })
+    except Exception as e:
+        print(f"获取串口列表失败: {e}")
+    return ports
+
+class SerialPortInventory:
+    """串口清单缓存
+
+    Args:
+        scan: 枚举函数，返回串口信息字典列表（默认 scan_serial_ports）
+        poll_interval: 轮询模式下的检查间隔（秒）
+
+    Attributes:
+        watch_mode: 后台刷新方式，'inotify'、'sysfs' 或 'poll'，未启动时为 None
+    """
+
+    def __init__(self, scan: Callable[[], List[Dict[str, str]]] = scan_serial_ports,
+                 poll_interval: float = 1.0):
+        self._scan = scan
+        self.poll_interval = poll_interval
+        self._ports: Dict[str, Dict[str, str]] = {}
+        self._scanned = False
+        self._lock = threading.Lock()
+        self._listeners: List[PortListener] = []
+        self.watch_mode: Optional[str] = None
+        self._running = False
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup_r: Optional[int] = None
+        self._wakeup_w: Optional[int] = None
+
+    def ports(self) -> List[Dict[str, str]]:
+        """缓存的串口列表（首次调用时同步枚举一次）"""
+        if not self._scanned:
+            self.refresh()
+        with self._lock:
+            return list(self._ports.values())
+
+    def contains(self, device: str) -> bool:
+        """串口是否在缓存中"""
+        if not self._scanned:
+            self.refresh()
+        with self._lock:
+            return device in self._ports
+
+    def add_listener(self, listener: PortListener):
+        """注册串口增删通知 listener(event, port_info)，在刷新线程中调用"""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: PortListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def refresh(self) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+        """重新枚举并更新缓存，返回 (新增, 移除) 的串口"""
+        current = {port['device']: port for port in self._scan()}
+        with self._lock:
+            added = [port for device, port in current.items() if device not in self._ports]
+            removed = [port for device, port in self._ports.items() if device not in current]
+            self._ports = current
+            first_scan = not self._scanned
+            self._scanned = True
+        # 首次枚举只建立基线，不发通知
+        if not first_scan:
+            for event, ports in ((PORT_ADDED, added), (PORT_REMOVED, removed)):
+                for port in ports:
+                    for listener in list(self._listeners):
+                        try:
+                            listener(event, port)
+                        except Exception as e:
+                            print(f"串口变化通知处理失败: {e}")
+        return added, removed
+
+    def start(self):
+        """启动后台刷新线程"""
+        if self._running:
+            return
+        if not self._scanned:
+            self.refresh()
+        self._running = True
+        self._stopped.clear()
+        inotify_fd = self._open_inotify()
+        if inotify_fd is not None:
+            # select 等待 inotify 时用管道唤醒
+            self._wakeup_r, self._wakeup_w = os.pipe()
+            self.watch_mode = 'inotify'
+            target, args = self._inotify_loop, (inotify_fd,)
+        elif os.path.isdir('/sys/class/tty'):
+            self.watch_mode = 'sysfs'
+            target, args = self._sysfs_loop, ()
+        else:
+            self.watch_mode = 'poll'
+            target, args = self._poll_loop, ()
+        self._thread = threading.Thread(target=target, args=args, name="port-inventory", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止后台刷新线程"""
+        if not self._running:
+            return
+        self._running = False
+        self._stopped.set()
+        if self._wakeup_w is not None:
+            os.write(self._wakeup_w, b'\0')
+        self._thread.join(timeout=2.0)
+        if self._wakeup_r is not None:
+            os.close(self._wakeup_r)
+            os.close(self._wakeup_w)
+            self._wakeup_r = self._wakeup_w = None
+        self.watch_mode = None
+
+    def _wait(self, fd: int, timeout: Optional[float]) -> bool:
+        """等待 inotify 描述符可读，被 stop 唤醒或超时返回 False"""
+        ready, _, _ = select.select([fd, self._wakeup_r], [], [], timeout)
+        return fd in ready and self._running
+
+    @staticmethod
+    def _open_inotify() -> Optional[int]:
+        """在 /dev 上建立 inotify 监听，不支持时返回 None"""
+        if not os.path.isdir('/dev'):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return None
+            mask = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+            if libc.inotify_add_watch(fd, b'/dev', mask) < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError, TypeError):
+            return None
+
+    @staticmethod
+    def _has_serial_device(data: bytes) -> bool:
+        """inotify 事件中是否有串口相关的设备名"""
+        offset = 0
+        while offset + INOTIFY_EVENT.size <= len(data):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+            offset += INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(errors='replace')
+            offset += length
+            if name.startswith(SERIAL_DEVICE_PREFIXES):
+                return True
+        return False
+
+    def _inotify_loop(self, fd: int):
+        try:
+            while self._running:
+                if not self._wait(fd, None):
+                    continue
+                changed = False
+                # 读完一批事件，并在设备节点平静 SETTLE_DELAY 后再枚举
+                while self._running:
+                    try:
+                        changed |= self._has_serial_device(os.read(fd, 65536))
+                    except BlockingIOError:
+                        pass
+                    if not self._wait(fd, SETTLE_DELAY):
+                        break
+                if changed and self._running:
+                    self.refresh()
+        finally:
+            os.close(fd)
+
+    def _sysfs_loop(self):
+        signature = sorted(os.listdir('/sys/class/tty'))
+        while not self._stopped.wait(self.poll_interval):
+            current = sorted(os.listdir('/sys/class/tty'))
+            if current != signature:
+                signature = current
+                self.refresh()
+
+    def _poll_loop(self):
+        while not self._stopped.wait(self.poll_interval):
+            self.refresh()
+
+_inventory: Optional[SerialPortInventory] = None
+_inventory_lock = threading.Lock()
+
+def get_port_inventory() -> SerialPortInventory:
+    """进程内共享的串口清单（首次调用时枚举并启动后台刷新）"""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = SerialPortInventory()
+            _inventory.start()
+        return _inventory
@@ -0,0 +1,97 @@
+"""
+后台接收
+
+每个连接一个后台读线程，把收到的数据写入 CircularBuffer，消费方通过
+FrameScanner 或缓冲区的 memoryview 接口处理，不在发送线程中做任何读取。
+"""
+
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .ring_buffer import CircularBuffer
+
+@dataclass
+class ReceiveStats:
+    """接收统计
+
+    Attributes:
+        bytes_received: 累计接收字节数
+        reads: 读操作次数（不含超时）
+        overwritten: 缓冲区满被覆盖的字节数
+    """
+    bytes_received: int = 0
+    reads: int = 0
+    overwritten: int = 0
+
+class BackgroundReader:
+    """后台读线程
+
+    Args:
+        read_into: 读函数，把数据读入给定的 memoryview 并返回字节数；
+            超时抛出 socket.timeout/TimeoutError 或返回 0
+        buffer: 目标环形缓冲区
+        chunk_size: 单次读取的最大字节数
+        eof_on_empty: 读到 0 字节时是否视为对端关闭（TCP 流为 True，串口超时返回 0）
+    """
+
+    def __init__(self, read_into: Callable[[memoryview], int], buffer: CircularBuffer,
+                 chunk_size: int = 65536, eof_on_empty: bool = False):
+        self._read_into = read_into
+        self.buffer = buffer
+        self.eof_on_empty = eof_on_empty
+        self._scratch = bytearray(chunk_size)
+        self._stats = ReceiveStats()
+        self.error: Optional[Exception] = None
+        self.closed = False  # 对端已关闭或读出错
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def stats(self) -> ReceiveStats:
+        self._stats.overwritten = self.buffer.overwritten
+        return self._stats
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """启动读线程"""
+        self._running = True
+        self._thread = threading.Thread(target=self._read_loop, name="background-reader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 2.0):
+        """停止读线程；timeout 为 0 时只发出停止信号，关闭连接后再调用 join"""
+        self._running = False
+        if timeout:
+            self.join(timeout)
+
+    def join(self, timeout: float = 2.0):
+        """等待读线程退出（读函数的超时决定最长等待时间）"""
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def _read_loop(self):
+        view = memoryview(self._scratch)
+        stats = self._stats
+        while self._running:
+            try:
+                count = self._read_into(view)
+            except (socket.timeout, TimeoutError, BlockingIOError, InterruptedError):
+                continue
+            except Exception as e:
+                if self._running:
+                    self.error = e
+                break
+            if not count:
+                if self.eof_on_empty:
+                    break
+                continue
+            stats.reads += 1
+            stats.bytes_received += count
+            self.buffer.append(view[:count])
+        self.closed = True
+        self._running = False
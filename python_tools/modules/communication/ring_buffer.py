@@ -0,0 +1,259 @@
+"""
+环形缓冲区与帧扫描
+
+CircularBuffer 对应插件端 src/shared/CircularBuffer.ts：固定容量的 bytearray，
+空间不足时覆盖最旧的数据。连续区域的读取直接返回 memoryview（零拷贝），
+跨越缓冲区边界时才复制。FrameScanner 在缓冲区中按起止分隔符切分帧并复制出有效载荷，
+模式查找使用 bytes.find（C 实现），跨边界部分单独拼接检查。
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Union
+
+from ..config.data_types import ChecksumAlgorithm
+from ..protocol.checksum import checksum_length, get_checksum_function, parse_algorithm
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+class CircularBuffer:
+    """固定容量环形缓冲区（线程安全）
+
+    写入方（后台读线程）调用 append，消费方调用 read/peek/find。返回的 memoryview
+    直接引用内部存储，后续写入可能覆盖其内容，需要长期保存时应复制。
+
+    Attributes:
+        overwritten: 因空间不足被覆盖（丢弃）的累计字节数
+        total_written: 累计写入字节数
+    """
+
+    def __init__(self, capacity: int = 1024 * 1024):
+        if capacity <= 0:
+            raise ValueError(f"环形缓冲区容量必须大于0: {capacity}")
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._capacity = capacity
+        self._head = 0
+        self._tail = 0
+        self._size = 0
+        self.overwritten = 0
+        self.total_written = 0
+        self._condition = threading.Condition()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def free_space(self) -> int:
+        return self._capacity - self._size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """清空缓冲区"""
+        with self._condition:
+            self._head = self._tail = self._size = 0
+
+    def append(self, data: BytesLike):
+        """追加数据，空间不足时推进 head 覆盖最旧的数据"""
+        size = len(data)
+        if size == 0:
+            return
+        with self._condition:
+            self.total_written += size
+            if size > self._capacity:
+                # 只保留能容纳的最后部分
+                self.overwritten += self._size + size - self._capacity
+                data = memoryview(data)[size - self._capacity:]
+                size = self._capacity
+                self._head = self._tail = self._size = 0
+            elif size > self.free_space:
+                overwrite = size - self.free_space
+                self._head = (self._head + overwrite) % self._capacity
+                self._size -= overwrite
+                self.overwritten += overwrite
+
+            first = min(size, self._capacity - self._tail)
+            self._view[self._tail:self._tail + first] = data[:first]
+            if size > first:
+                self._view[:size - first] = data[first:]
+            self._tail = (self._tail + size) % self._capacity
+            self._size += size
+            self._condition.notify_all()
+
+    def wait_for_data(self, size: int = 1, timeout: Optional[float] = None) -> bool:
+        """等待缓冲区中至少有 size 字节，超时返回 False"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._size >= size, timeout)
+
+    def _segments(self, offset: int, size: int) -> List[memoryview]:
+        """逻辑区间 [offset, offset+size) 对应的一或两段内存视图"""
+        start = (self._head + offset) % self._capacity
+        first = min(size, self._capacity - start)
+        segments = [self._view[start:start + first]]
+        if size > first:
+            segments.append(self._view[:size - first])
+        return segments
+
+    def peek_views(self, size: Optional[int] = None, offset: int = 0) -> List[memoryview]:
+        """不移除数据，返回覆盖前 size 字节的一或两段 memoryview（完全零拷贝）"""
+        with self._condition:
+            available = self._size - offset
+            size = available if size is None else min(size, available)
+            if size <= 0:
+                return []
+            return self._segments(offset, size)
+
+    def peek(self, size: Optional[int] = None, offset: int = 0) -> Union[memoryview, bytes]:
+        """不移除数据地读取；数据连续时返回 memoryview，跨越边界时返回复制的 bytes"""
+        segments = self.peek_views(size, offset)
+        if not segments:
+            return b''
+        return segments[0] if len(segments) == 1 else b''.join(segments)
+
+    def copy(self, size: Optional[int] = None, offset: int = 0) -> bytes:
+        """不移除数据地复制前 size 字节；复制在锁内完成，不受并发写入影响"""
+        with self._condition:
+            available = self._size - offset
+            size = available if size is None else min(size, available)
+            if size <= 0:
+                return b''
+            return b''.join(self._segments(offset, size))
+
+    def read(self, size: int) -> Union[memoryview, bytes]:
+        """读取并移除 size 字节；数据连续时零拷贝返回 memoryview"""
+        with self._condition:
+            if size > self._size:
+                raise ValueError(f"缓冲区数据不足: 需要 {size} 字节，现有 {self._size} 字节")
+            segments = self._segments(0, size)
+            self._consume(size)
+        return segments[0] if len(segments) == 1 else b''.join(segments)
+
+    def skip(self, size: int):
+        """丢弃前 size 字节"""
+        with self._condition:
+            self._consume(min(size, self._size))
+
+    def _consume(self, size: int):
+        self._head = (self._head + size) % self._capacity
+        self._size -= size
+        if self._size == 0:
+            self._head = self._tail = 0
+
+    def find(self, pattern: bytes, offset: int = 0) -> int:
+        """从逻辑位置 offset 开始查找 pattern，返回逻辑位置，未找到返回 -1"""
+        length = len(pattern)
+        with self._condition:
+            if length == 0 or self._size - offset < length:
+                return -1
+            start = (self._head + offset) % self._capacity
+            segments = self._segments(offset, self._size - offset)
+            first = len(segments[0])
+            index = self._buffer.find(pattern, start, start + first)
+            if index >= 0:
+                return offset + index - start
+            if len(segments) == 1:
+                return -1
+
+            # 跨越边界的匹配：拼接边界两侧各 length-1 字节检查
+            second = len(segments[1])
+            left = min(first, length - 1)
+            boundary = self._buffer[self._capacity - left:] + self._buffer[:min(second, length - 1)]
+            index = boundary.find(pattern)
+            if index >= 0:
+                return offset + first - left + index
+            index = self._buffer.find(pattern, 0, second)
+            return offset + first + index if index >= 0 else -1
+
+@dataclass
+class ScanStats:
+    """帧扫描统计
+
+    Attributes:
+        frames: 提取出的有效帧数
+        discarded_bytes: 帧外被丢弃的字节数（换行、噪声、不完整帧头）
+        checksum_errors: 校验失败的帧数
+    """
+    frames: int = 0
+    discarded_bytes: int = 0
+    checksum_errors: int = 0
+
+class FrameScanner:
+    """按分隔符从环形缓冲区中提取帧
+
+    对应插件端 FrameReader 的分隔符模式：起始与结束分隔符之间为有效载荷，
+    起始分隔符为空时只按结束分隔符切分。启用校验和时校验和字节紧跟在结束分隔符之后，
+    校验失败的帧被丢弃并计数。
+
+    Args:
+        buffer: 数据来源
+        start: 起始分隔符（可为空）
+        end: 结束分隔符
+        checksum: 校验和算法
+    """
+
+    def __init__(self, buffer: CircularBuffer, start: bytes = b'$', end: bytes = b';',
+                 checksum: Union[ChecksumAlgorithm, str] = ChecksumAlgorithm.NONE):
+        if not end:
+            raise ValueError("结束分隔符不能为空")
+        self.buffer = buffer
+        self.start = bytes(start)
+        self.end = bytes(end)
+        self.checksum = parse_algorithm(checksum)
+        self.checksum_size = checksum_length(self.checksum)
+        self._checksum = get_checksum_function(self.checksum)
+        self.stats = ScanStats()
+
+    def next_frame(self) -> Optional[bytes]:
+        """提取下一帧有效载荷，没有完整帧时返回 None
+
+        有效载荷复制为 bytes 后才从缓冲区中移除：被移除的区域会被后续写入覆盖，
+        返回指向环内的 memoryview 会在调用方使用前失效。
+        """
+        buffer = self.buffer
+        while True:
+            begin = 0
+            if self.start:
+                begin = buffer.find(self.start)
+                if begin < 0:
+                    # 保留可能是分隔符前缀的尾部字节
+                    junk = max(0, len(buffer) - len(self.start) + 1)
+                    if junk:
+                        buffer.skip(junk)
+                        self.stats.discarded_bytes += junk
+                    return None
+                if begin:
+                    buffer.skip(begin)
+                    self.stats.discarded_bytes += begin
+                begin = len(self.start)
+
+            end = buffer.find(self.end, begin)
+            if end < 0 or len(buffer) < end + len(self.end) + self.checksum_size:
+                return None
+
+            payload = buffer.copy(end - begin, begin)
+            if self.checksum_size:
+                expected = buffer.copy(self.checksum_size, end + len(self.end))
+                if self._checksum(payload) != expected:
+                    # 校验失败：跳过起始分隔符后重新同步
+                    self.stats.checksum_errors += 1
+                    buffer.skip(len(self.start) or end + len(self.end))
+                    continue
+
+            buffer.skip(end + len(self.end) + self.checksum_size)
+            self.stats.frames += 1
+            return payload
+
+    def frames(self) -> Iterator[bytes]:
+        """依次提取缓冲区中所有完整帧"""
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                return
+            yield frame
@@ -0,0 +1,183 @@
+"""
+发送队列
+
+生成线程把编码好的帧放入有界队列后立即返回，由每个连接独立的写线程按顺序写出。
+串口写阻塞（最长 write_timeout）或网络对端接收慢时只有写线程等待，生成线程的调度不受影响。
+队列满时的处理策略：
+- block: 生成线程等待队列腾出空间（不丢帧，调度会被拖慢）
+- drop_oldest: 丢弃队列中最早的帧，保留最新数据
+- drop_newest: 丢弃新放入的帧，保留已排队的数据
+- coalesce: 每个组件最多排队一帧，同一组件的新帧替换尚未发送的旧帧（只保留最新值）；
+  队列已满且是新组件时丢弃最早的帧
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Hashable, List, Optional
+
+# 队列满时的处理策略
+BACKPRESSURE_BLOCK = 'block'
+BACKPRESSURE_DROP_OLDEST = 'drop_oldest'
+BACKPRESSURE_DROP_NEWEST = 'drop_newest'
+BACKPRESSURE_COALESCE = 'coalesce'
+BACKPRESSURE_POLICIES = (BACKPRESSURE_BLOCK, BACKPRESSURE_DROP_OLDEST,
+                         BACKPRESSURE_DROP_NEWEST, BACKPRESSURE_COALESCE)
+
+@dataclass
+class QueueStats:
+    """发送队列统计
+
+    Attributes:
+        enqueued: 放入队列的帧数
+        sent: 写出成功的帧数
+        failed: 写出失败的帧数
+        dropped_oldest: 队列满时被丢弃的最早帧数
+        dropped_newest: 队列满时被拒绝的新帧数
+        coalesced: 被同一组件新帧替换的帧数
+        depth: 当前排队帧数
+        max_depth: 最大排队帧数
+        blocked_time: 生成线程因队列满累计等待的时间（秒）
+    """
+    enqueued: int = 0
+    sent: int = 0
+    failed: int = 0
+    dropped_oldest: int = 0
+    dropped_newest: int = 0
+    coalesced: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    blocked_time: float = 0.0
+
+    @property
+    def dropped(self) -> int:
+        """未发送即被丢弃或替换的帧数"""
+        return self.dropped_oldest + self.dropped_newest + self.coalesced
+
+class SendQueue:
+    """有界发送队列及其写线程
+
+    Args:
+        write: 写函数，接收 bytes，失败时抛出异常或返回 False
+        capacity: 队列容量（帧数）
+        policy: 队列满时的处理策略，见 BACKPRESSURE_POLICIES
+    """
+
+    def __init__(self, write: Callable[[bytes], Optional[bool]], capacity: int = 256,
+                 policy: str = BACKPRESSURE_BLOCK):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"不支持的队列策略: {policy}，可选: {list(BACKPRESSURE_POLICIES)}")
+        if capacity <= 0:
+            raise ValueError(f"发送队列容量必须大于0: {capacity}")
+
+        self._write = write
+        self.capacity = capacity
+        self.policy = policy
+        self._stats = QueueStats()
+        self.last_error: Optional[Exception] = None
+
+        # 队列元素为 [key, data]，coalesce 策略下原位替换 data，保持排队位置
+        self._queue: Deque[List] = deque()
+        self._pending: Dict[Hashable, List] = {}
+        self._condition = threading.Condition()
+        self._writing = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._send_loop, name="send-queue", daemon=True)
+        self._thread.start()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def stats(self) -> QueueStats:
+        self._stats.depth = len(self._queue)
+        return self._stats
+
+    def put(self, data: bytes, key: Optional[Hashable] = None) -> bool:
+        """放入一帧，返回是否进入队列（drop_newest 策略下队列满或队列已关闭时返回 False）
+
+        Args:
+            data: 帧数据（队列保存引用，调用方之后不能修改）
+            key: 组件标识，coalesce 策略按此替换同一组件尚未发送的帧
+        """
+        stats = self._stats
+        with self._condition:
+            if self._closed:
+                return False
+            if self.policy == BACKPRESSURE_COALESCE and key is not None:
+                entry = self._pending.get(key)
+                if entry is not None:
+                    entry[1] = data
+                    stats.coalesced += 1
+                    stats.enqueued += 1
+                    return True
+
+            if len(self._queue) >= self.capacity:
+                if self.policy == BACKPRESSURE_BLOCK:
+                    blocked = time.monotonic()
+                    self._condition.wait_for(lambda: len(self._queue) < self.capacity or self._closed)
+                    stats.blocked_time += time.monotonic() - blocked
+                    if self._closed:
+                        return False
+                elif self.policy == BACKPRESSURE_DROP_NEWEST:
+                    stats.dropped_newest += 1
+                    return False
+                else:
+                    self._pop()
+                    stats.dropped_oldest += 1
+
+            entry = [key, data]
+            self._queue.append(entry)
+            if self.policy == BACKPRESSURE_COALESCE and key is not None:
+                self._pending[key] = entry
+            stats.enqueued += 1
+            stats.max_depth = max(stats.max_depth, len(self._queue))
+            self._condition.notify_all()
+            return True
+
+    def _pop(self) -> bytes:
+        entry = self._queue.popleft()
+        if self._pending.get(entry[0]) is entry:
+            del self._pending[entry[0]]
+        return entry[1]
+
+    def _send_loop(self):
+        while True:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                data = self._pop()
+                self._writing = True
+                self._condition.notify_all()
+
+            try:
+                ok = self._write(data) is not False
+            except Exception as e:
+                self.last_error = e
+                ok = False
+            if ok:
+                self._stats.sent += 1
+            else:
+                self._stats.failed += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待队列清空且当前帧写完，返回是否在超时前完成"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._writing, timeout)
+
+    def close(self, timeout: Optional[float] = 1.0):
+        """写出已排队的帧后停止写线程，超时后剩余的帧被丢弃"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        with self._condition:
+            self._queue.clear()
+            self._pending.clear()
@@ -0,0 +1,158 @@
+"""
+数据汇（Sink）传输
+
+不经过串口或网络的输出端，用于单独测量数据生成与格式化的吞吐上限，
+或把数据流以全速管道给其他工具：
+- NullSink: 丢弃数据，只统计（相当于 /dev/null，且没有系统调用开销）
+- FileSink: 写入文件，使用大块缓冲写
+- PipeSink: 写入标准输出，使用大块缓冲写，便于 `python ... | other_tool`
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, List, Optional, Union
+
+from ..config.data_types import CommConfig, CommType, ComponentConfig
+
+# 文件和管道的写缓冲区大小
+SINK_BUFFER_SIZE = 1024 * 1024
+
+@dataclass
+class SinkStats:
+    """数据汇统计
+
+    Attributes:
+        bytes: 写入的字节数
+        frames: 写入的帧数
+        writes: 写操作次数
+        start_time: 第一次写入的时刻（time.perf_counter）
+        last_time: 最近一次写入的时刻
+    """
+    bytes: int = 0
+    frames: int = 0
+    writes: int = 0
+    start_time: Optional[float] = None
+    last_time: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        return self.last_time - self.start_time
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+class Sink:
+    """数据汇基类：统计写入量，子类实现 _write"""
+
+    def __init__(self):
+        self.stats = SinkStats()
+
+    def write(self, data: Union[bytes, bytearray, memoryview], frames: int = 1) -> int:
+        """写入数据，frames 为 data 中包含的帧数（批量写入时大于1）"""
+        now = time.perf_counter()
+        stats = self.stats
+        if stats.start_time is None:
+            stats.start_time = now
+        self._write(data)
+        size = len(data)
+        stats.bytes += size
+        stats.frames += frames
+        stats.writes += 1
+        stats.last_time = time.perf_counter()
+        return size
+
+    def _write(self, data: Union[bytes, bytearray, memoryview]):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+class NullSink(Sink):
+    """丢弃所有数据"""
+
+class FileSink(Sink):
+    """写入文件"""
+
+    def __init__(self, path: str, buffer_size: int = SINK_BUFFER_SIZE):
+        super().__init__()
+        self.path = path
+        self._file: BinaryIO = open(path, 'wb', buffering=buffer_size)
+
+    def _write(self, data):
+        self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+class PipeSink(Sink):
+    """写入标准输出（不关闭进程的标准输出）"""
+
+    def __init__(self, stream: Optional[BinaryIO] = None, buffer_size: int = SINK_BUFFER_SIZE):
+        super().__init__()
+        stream = stream or sys.stdout.buffer
+        self._file: BinaryIO = open(stream.fileno(), 'wb', buffering=buffer_size, closefd=False)
+
+    def _write(self, data):
+        self._file.write(data)
+
+    def flush(self):
+        try:
+            self._file.flush()
+        except BrokenPipeError:
+            pass
+
+    def close(self):
+        self.flush()
+        try:
+            self._file.close()
+        except BrokenPipeError:
+            pass
+
+SINK_TYPES = (CommType.NULL, CommType.FILE, CommType.PIPE)
+
+def create_sink(config: CommConfig) -> Sink:
+    """根据通讯类型创建数据汇"""
+    if config.comm_type == CommType.NULL:
+        return NullSink()
+    if config.comm_type == CommType.FILE:
+        return FileSink(config.file_path, max(config.buffer_size, SINK_BUFFER_SIZE))
+    if config.comm_type == CommType.PIPE:
+        return PipeSink(buffer_size=max(config.buffer_size, SINK_BUFFER_SIZE))
+    raise ValueError(f"不是数据汇类型: {config.comm_type}")
+
+def measure_generation_throughput(factory, configs: List[ComponentConfig], sink: Sink,
+                                  duration: float = 1.0, block_rows: int = 256) -> SinkStats:
+    """以最快速度批量生成并格式化各组件数据写入 sink，测量生成吞吐上限
+
+    Args:
+        factory: ComponentGeneratorFactory
+        configs: 参与生成的组件配置
+        sink: 输出数据汇
+        duration: 测量时长（秒）
+        block_rows: 每个组件每批生成的帧数
+    """
+    buffer = bytearray(max(factory.get_formatter(config).estimate_size(block_rows) for config in configs))
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for config in configs:
+            size = factory.render_component_block(config, block_rows, buffer)
+            # 视图用完即释放，预估不足时格式化器需要扩展 buffer
+            with memoryview(buffer) as view, view[:size] as chunk:
+                sink.write(chunk, frames=block_rows)
+    sink.flush()
+    return sink.stats
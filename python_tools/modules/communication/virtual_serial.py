@@ -0,0 +1,244 @@
+"""
+虚拟串口
+
+基于伪终端（pty）创建一对串口设备：本工具写主设备，从设备路径（如 /dev/pts/3）
+交给插件或 Serial Studio 作为普通串口打开，无需硬件即可测试串口模式。
+
+可选按波特率节流：每个字符占 起始位 + 数据位 + 校验位 + 停止位，线路速率为
+baudrate / 每字符位数 字节/秒。写入的数据先进入有界发送缓冲区（模拟 UART 发送 FIFO），
+由后台线程按绝对时间节拍送出；缓冲区满时 write 阻塞，超过 write_timeout 抛出
+SerialTimeoutException（与 pyserial 一致），并计为一次溢出。
+"""
+
+import errno
+import fcntl
+import os
+import select
+import struct
+import termios
+import threading
+import time
+import tty
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from serial import SerialTimeoutException
+
+from ..config.data_types import CommConfig
+
+# 每次送出的最短时间片（秒），决定节流的粒度
+PACING_TICK = 0.001
+
+@dataclass
+class VirtualSerialStats:
+    """虚拟串口统计
+
+    Attributes:
+        bytes_written: 调用方写入的字节数
+        bytes_delivered: 已送到从设备的字节数
+        overruns: 发送缓冲区（不节流时为 pty 缓冲区）满且超过写超时的次数
+        dropped_bytes: 因溢出被丢弃的字节数
+        blocked_time: write 因缓冲区满累计阻塞的时间（秒）
+        receiver_stalls: 对端未及时读取导致 pty 缓冲区满的次数
+    """
+    bytes_written: int = 0
+    bytes_delivered: int = 0
+    overruns: int = 0
+    dropped_bytes: int = 0
+    blocked_time: float = 0.0
+    receiver_stalls: int = 0
+
+def bits_per_character(databits: int = 8, parity: str = 'N', stopbits: float = 1) -> float:
+    """每个字符在线路上占用的位数"""
+    return 1 + databits + (0 if parity.upper() == 'N' else 1) + stopbits
+
+class VirtualSerialPort:
+    """pty 虚拟串口，接口与 serial.Serial 的常用部分一致（write/read/readinto/in_waiting/close）
+
+    Args:
+        baudrate/databits/parity/stopbits: 线路参数，用于计算节流速率
+        pace: 是否按波特率节流
+        tx_buffer_size: 发送缓冲区大小（字节）
+        timeout: 读超时（秒）
+        write_timeout: 写超时（秒），None 表示一直阻塞
+    """
+
+    def __init__(self, baudrate: int = 9600, databits: int = 8, parity: str = 'N',
+                 stopbits: float = 1, pace: bool = True, tx_buffer_size: int = 4096,
+                 timeout: Optional[float] = 1.0, write_timeout: Optional[float] = None):
+        if baudrate <= 0:
+            raise ValueError(f"波特率必须大于0: {baudrate}")
+        if not hasattr(os, 'openpty'):
+            raise ValueError("当前平台不支持伪终端，虚拟串口仅支持 Linux/macOS")
+
+        self.baudrate = baudrate
+        self.bits_per_char = bits_per_character(databits, parity, stopbits)
+        self.byte_rate = baudrate / self.bits_per_char
+        self.pace = pace
+        self.tx_buffer_size = tx_buffer_size
+        self.timeout = timeout
+        self.write_timeout = write_timeout
+        self.stats = VirtualSerialStats()
+
+        self._master, self._slave = os.openpty()
+        self.port = os.ttyname(self._slave)
+        tty.setraw(self._slave)  # 原始模式：不做换行转换和回显
+        flags = fcntl.fcntl(self._master, fcntl.F_GETFL)
+        fcntl.fcntl(self._master, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+
+        self._queue = bytearray()
+        self._condition = threading.Condition()
+        self.is_open = True
+        self._thread: Optional[threading.Thread] = None
+        if pace:
+            self._thread = threading.Thread(target=self._pace_loop, name="virtual-serial", daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def from_config(cls, config: CommConfig) -> 'VirtualSerialPort':
+        """按通讯配置创建"""
+        return cls(baudrate=config.baudrate, databits=config.databits, parity=config.parity,
+                   stopbits=config.stopbits, pace=config.emulate_baudrate,
+                   timeout=config.timeout, write_timeout=config.timeout)
+
+    @property
+    def char_time(self) -> float:
+        """单个字符的线路时间（秒）"""
+        return 1.0 / self.byte_rate
+
+    @property
+    def out_waiting(self) -> int:
+        """发送缓冲区中尚未送出的字节数"""
+        return len(self._queue)
+
+    def write(self, data: Union[bytes, bytearray, memoryview]) -> int:
+        """写入数据；节流时缓冲区满、不节流时对端未读取导致 pty 缓冲区满则阻塞，
+        超过写超时抛出 SerialTimeoutException"""
+        if not self.is_open:
+            raise OSError("虚拟串口已关闭")
+        data = memoryview(data).cast('B')
+        size = len(data)
+        self.stats.bytes_written += size
+        deadline = None if self.write_timeout is None else time.monotonic() + self.write_timeout
+        if not self.pace:
+            self._deliver(data, deadline)
+            return size
+
+        position = 0
+        with self._condition:
+            while position < size:
+                free = self.tx_buffer_size - len(self._queue)
+                if free > 0:
+                    chunk = data[position:position + free]
+                    self._queue += chunk
+                    position += len(chunk)
+                    self._condition.notify_all()
+                    continue
+
+                blocked = time.monotonic()
+                remaining = None if deadline is None else deadline - blocked
+                if remaining is not None and remaining <= 0:
+                    self.stats.overruns += 1
+                    self.stats.dropped_bytes += size - position
+                    raise SerialTimeoutException("Write timeout")
+                self._condition.wait(remaining)
+                self.stats.blocked_time += time.monotonic() - blocked
+                if not self.is_open:
+                    raise OSError("虚拟串口已关闭")
+        return size
+
+    def flush(self):
+        """等待发送缓冲区送空"""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._queue or not self.is_open)
+
+    def _pace_loop(self):
+        """按绝对时间节拍送出数据：截至当前应送出的字节数 = 经过时间 * 字节速率"""
+        min_chunk = max(1, int(self.byte_rate * PACING_TICK))
+        while self.is_open:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or not self.is_open)
+                if not self.is_open:
+                    return
+            # 线路从空闲开始发送，空闲时间不累积发送额度
+            origin = time.monotonic()
+            sent = 0
+            while self.is_open:
+                due = int((time.monotonic() - origin) * self.byte_rate) - sent
+                if due <= 0:
+                    time.sleep(max(0.0, origin + (sent + min_chunk) / self.byte_rate - time.monotonic()))
+                    continue
+                with self._condition:
+                    chunk = bytes(self._queue[:due])
+                    del self._queue[:len(chunk)]
+                    self._condition.notify_all()
+                if not chunk:
+                    break
+                self._deliver(chunk)
+                sent += len(chunk)
+
+    def _deliver(self, data: Union[bytes, memoryview], deadline: Optional[float] = None):
+        """写入 pty 主设备，对端未读取导致缓冲区满时等待，超过 deadline（time.monotonic）
+        仍未写完则计为一次溢出并抛出 SerialTimeoutException"""
+        view = memoryview(data)
+        while view and self.is_open:
+            try:
+                written = os.write(self._master, view)
+            except BlockingIOError:
+                self.stats.receiver_stalls += 1
+                wait = 0.1
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats.overruns += 1
+                        self.stats.dropped_bytes += len(view)
+                        raise SerialTimeoutException("Write timeout")
+                    wait = min(wait, remaining)
+                select.select([], [self._master], [], wait)
+                continue
+            except OSError as e:
+                if e.errno == errno.EIO:  # 从设备侧全部关闭
+                    return
+                raise
+            self.stats.bytes_delivered += written
+            view = view[written:]
+
+    @property
+    def in_waiting(self) -> int:
+        """对端写入、尚未读取的字节数"""
+        result = fcntl.ioctl(self._master, termios.FIONREAD, struct.pack('i', 0))
+        return struct.unpack('i', result)[0]
+
+    def readinto(self, buffer) -> int:
+        """读取对端写入的数据，没有数据时最多等待 timeout 秒"""
+        view = memoryview(buffer).cast('B')
+        if not self.is_open or not len(view):
+            return 0
+        ready, _, _ = select.select([self._master], [], [], self.timeout)
+        if not ready:
+            return 0
+        try:
+            return os.readv(self._master, [view])
+        except (BlockingIOError, InterruptedError):
+            return 0
+        except OSError as e:
+            if e.errno == errno.EIO:
+                return 0
+            raise
+
+    def read(self, size: int = 1) -> bytes:
+        buffer = bytearray(size)
+        count = self.readinto(buffer)
+        return bytes(buffer[:count])
+
+    def close(self):
+        """关闭主从设备"""
+        if not self.is_open:
+            return
+        with self._condition:
+            self.is_open = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1.0)
+        os.close(self._master)
+        os.close(self._slave)
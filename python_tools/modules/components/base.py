@@ -8,115 +8,192 @@ import time
 import random
 import math
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
 
 from ..config.data_types import DataGenConfig, DataGenRule, ComponentConfig
+from ..config.expressions import compile_expression
+from .samplers import SCALAR_NAMESPACE, VECTOR_NAMESPACE, get_sampler
+from .clock import SampleClock, WallClock
+from .oscillators import PERIODIC_RULES
+from .ode import ODEIntegrator, ODEAxisSampler
+from .rng import RNGHierarchy, ChannelStream, VectorRandom, COMPONENT_CHANNEL
+
+# 未指定组件通道时使用的默认随机流名称
+DEFAULT_STREAM = '__default__'
+
+# 通道标识: (组件名, 通道序号)
+Channel = Tuple[str, int]
 
 class DataGenerator:
     """通用数据生成器"""
     
-    def __init__(self):
+    def __init__(self, clock: Optional[SampleClock] = None, seed: Optional[int] = None):
         self.time_counter = 0
         self.start_time = time.time()
+        self.clock = clock or WallClock()
+        self.frame_time: Optional[float] = None
+        self.rng = RNGHierarchy(seed)
+        # 通道键 -> (配置级采样器, 本通道采样器, 随机流)
+        self._channels: Dict[Hashable, Tuple[Any, Any, ChannelStream]] = {}
+        # (组件名, 积分器参数) -> ODE积分器
+        self._ode_integrators: Dict[Tuple, ODEIntegrator] = {}
+    
+    def stream(self, component: str, channel: int = COMPONENT_CHANNEL) -> ChannelStream:
+        """获取指定组件和通道的随机流"""
+        return self.rng.stream(component, channel)
+    
+    def channel_sampler(self, config: DataGenConfig,
+                        channel: Optional[Channel] = None) -> Tuple[Any, ChannelStream]:
+        """获取通道的采样器和随机流
         
-    def generate_value(self, config: DataGenConfig) -> float:
-        """根据配置生成单个数值"""
-        current_time = time.time() - self.start_time
+        有状态的采样器（相位累加振荡器、ODE积分器）在每个生成器、每个通道上独立实例化，
+        配置被修改后（配置级采样器变化）自动重建。未指定通道时按配置对象区分。
+        """
+        key = channel if channel is not None else id(config)
+        shared = get_sampler(config)
+        entry = self._channels.get(key)
+        if entry is None or entry[0] is not shared:
+            sampler = shared.fork(self, channel) if hasattr(shared, 'fork') else shared
+            if channel is not None:
+                stream = self.rng.stream(*channel)
+            else:
+                stream = self.rng.stream(DEFAULT_STREAM)
+            entry = (shared, sampler, stream)
+            self._channels[key] = entry
+        return entry[1], entry[2]
         
-        if config.rule == DataGenRule.CONSTANT:
-            return config.min_value
-            
-        elif config.rule == DataGenRule.RANDOM:
-            return random.uniform(config.min_value, config.max_value)
-            
-        elif config.rule == DataGenRule.SINE_WAVE:
-            base = config.amplitude * math.sin(
-                2 * math.pi * config.frequency * current_time + config.phase
-            )
-            return base + config.min_value + (config.max_value - config.min_value) / 2
+    def current_time(self) -> float:
+        """获取相对于启动时刻的当前时间（秒），帧内返回帧时间戳"""
+        if self.frame_time is not None:
+            return self.frame_time
+        return self.clock.now()
+    
+    def begin_frame(self, t: Optional[float] = None):
+        """开始一帧：冻结时间戳（默认为当前时刻），使同一帧内所有通道使用同一时刻"""
+        self.frame_time = self.clock.now() if t is None else t
+    
+    def end_frame(self):
+        """结束一帧，恢复实时读取时钟"""
+        self.frame_time = None
+    
+    def block_times(self, count: int, rate: float) -> np.ndarray:
+        """从当前时刻起，按采样率生成 count 个采样时间点"""
+        return self.current_time() + np.arange(count, dtype=np.float64) / rate
+    
+    def ode_integrator(self, component: Optional[str], prototype: ODEAxisSampler) -> ODEIntegrator:
+        """获取组件共享的ODE积分器，同一组件中参数相同的各维度通道共用一条轨迹"""
+        key = (component or DEFAULT_STREAM, prototype.key)
+        integrator = self._ode_integrators.get(key)
+        if integrator is None:
+            integrator = prototype.fork().integrator
+            self._ode_integrators[key] = integrator
+        return integrator
+    
+    def generate_value(self, config: DataGenConfig, channel: Optional[Channel] = None) -> float:
+        """根据配置生成单个数值（使用预编译采样器）"""
+        sampler, stream = self.channel_sampler(config, channel)
+        return sampler(self.current_time(), stream.py)
+    
+    def generate_block(self, config: DataGenConfig, t: np.ndarray,
+                       channel: Optional[Channel] = None) -> np.ndarray:
+        """根据配置为时间数组 t 批量生成数值
+        
+        Args:
+            config: 数据生成配置
+            t: 采样时间数组（秒，相对于启动时刻）
+            channel: 通道标识 (组件名, 通道序号)，决定随机流和振荡器状态
             
-        elif config.rule == DataGenRule.COSINE_WAVE:
-            base = config.amplitude * math.cos(
-                2 * math.pi * config.frequency * current_time + config.phase
-            )
-            return base + config.min_value + (config.max_value - config.min_value) / 2
+        Returns:
+            与 t 形状相同的 float64 数组
+        """
+        t = np.asarray(t, dtype=np.float64)
+        sampler, stream = self.channel_sampler(config, channel)
+        rule = config.rule
+        
+        if rule == DataGenRule.CONSTANT:
+            return np.full(t.shape, config.min_value, dtype=np.float64)
             
-        elif config.rule == DataGenRule.SQUARE_WAVE:
-            sin_val = math.sin(2 * math.pi * config.frequency * current_time + config.phase)
-            base = config.amplitude if sin_val > 0 else -config.amplitude
-            return base + config.min_value + (config.max_value - config.min_value) / 2
+        elif rule == DataGenRule.RANDOM:
+            return stream.np.uniform(config.min_value, config.max_value, t.shape)
             
-        elif config.rule == DataGenRule.SAWTOOTH_WAVE:
-            t = (config.frequency * current_time + config.phase / (2 * math.pi)) % 1
-            base = config.amplitude * (2 * t - 1)
-            return base + config.min_value + (config.max_value - config.min_value) / 2
+        elif rule in PERIODIC_RULES or rule == DataGenRule.ODE_SYSTEM:
+            # 周期规则和ODE系统与逐点采样共享同一个有状态采样器
+            return sampler.block(t)
             
-        elif config.rule == DataGenRule.TRIANGLE_WAVE:
-            t = (config.frequency * current_time + config.phase / (2 * math.pi)) % 1
-            if t < 0.5:
-                base = config.amplitude * (4 * t - 1)
-            else:
-                base = config.amplitude * (3 - 4 * t)
-            return base + config.min_value + (config.max_value - config.min_value) / 2
+        elif rule == DataGenRule.LINEAR_INCREASE:
+            return np.minimum(config.max_value, config.min_value + config.step_size * t)
             
-        elif config.rule == DataGenRule.LINEAR_INCREASE:
-            base = config.step_size * current_time
-            return min(config.max_value, config.min_value + base)
+        elif rule == DataGenRule.LINEAR_DECREASE:
+            return np.maximum(config.min_value, config.max_value - config.step_size * t)
             
-        elif config.rule == DataGenRule.LINEAR_DECREASE:
-            base = config.step_size * current_time
-            return max(config.min_value, config.max_value - base)
+        elif rule == DataGenRule.EXPONENTIAL:
+            # exp(x)/(1+exp(x)) 等价于 1/(1+exp(-x))，后者在大 x 时不会溢出
+            with np.errstate(over='ignore'):
+                normalized = 1.0 / (1.0 + np.exp(-config.frequency * t))
+            return config.min_value + normalized * (config.max_value - config.min_value)
             
-        elif config.rule == DataGenRule.EXPONENTIAL:
-            try:
-                base = math.exp(config.frequency * current_time)
-                normalized = base / (1 + base)  # 归一化到[0,1]
-                return config.min_value + normalized * (config.max_value - config.min_value)
-            except OverflowError:
-                return config.max_value
-                
-        elif config.rule == DataGenRule.LOGARITHMIC:
-            base = math.log(1 + config.frequency * current_time)
+        elif rule == DataGenRule.LOGARITHMIC:
             max_log = math.log(1 + config.frequency * 100)  # 假设100秒的最大值
-            normalized = min(1.0, base / max_log)
+            normalized = np.minimum(1.0, np.log1p(config.frequency * t) / max_log)
             return config.min_value + normalized * (config.max_value - config.min_value)
             
-        elif config.rule == DataGenRule.NOISE:
-            return random.gauss(
-                (config.min_value + config.max_value) / 2,
-                config.noise_level * (config.max_value - config.min_value) / 6
-            )
+        elif rule == DataGenRule.NOISE:
+            # 高斯分布关于均值对称，取绝对值的标准差与 random.gauss 行为一致
+            sigma = abs(config.noise_level * (config.max_value - config.min_value) / 6)
+            return stream.np.normal((config.min_value + config.max_value) / 2, sigma, t.shape)
             
-        elif config.rule == DataGenRule.CUSTOM_FUNCTION:
-            if config.custom_function:
-                try:
-                    # 安全执行自定义函数
-                    safe_globals = {
-                        'math': math,
-                        'random': random,
-                        'time': current_time,
-                        't': current_time,
-                        'sin': math.sin,
-                        'cos': math.cos,
-                        'tan': math.tan,
-                        'exp': math.exp,
-                        'log': math.log,
-                        'sqrt': math.sqrt,
-                        'pi': math.pi,
-                        'e': math.e
-                    }
-                    result = eval(config.custom_function, safe_globals, {})
-                    return float(result)
-                except:
-                    return config.min_value
-            return config.min_value
+        elif rule == DataGenRule.CUSTOM_FUNCTION:
+            return self._eval_custom_block(config, t, stream)
             
         else:
-            return config.min_value
+            return np.full(t.shape, config.min_value, dtype=np.float64)
+    
+    def generate_component_block(self, config: ComponentConfig, t: np.ndarray) -> np.ndarray:
+        """为组件的所有通道批量生成数值
+        
+        Returns:
+            形状为 (len(t), 通道数) 的数组，每列对应一个 DataGenConfig
+        """
+        t = np.asarray(t, dtype=np.float64)
+        block = np.empty((t.size, len(config.data_generation)), dtype=np.float64)
+        for column, gen_config in enumerate(config.data_generation):
+            block[:, column] = self.generate_block(gen_config, t, (config.name, column))
+        return block
+    
+    def _eval_custom_block(self, config: DataGenConfig, t: np.ndarray, stream: ChannelStream) -> np.ndarray:
+        """批量执行自定义函数，优先整体向量化求值，失败时逐点回退"""
+        if not config.custom_function:
+            return np.full(t.shape, config.min_value, dtype=np.float64)
+        
+        # 表达式已在配置阶段校验，这里只命中编译缓存
+        code = compile_expression(config.custom_function)
+        try:
+            # random.* 按块形状返回独立采样，标量结果只可能来自与 t 无关的确定性表达式
+            with np.errstate(all='ignore'):
+                result = eval(code, VECTOR_NAMESPACE, {
+                    't': t, 'time': t, 'random': VectorRandom(stream.np, t.shape)
+                })
+            return np.broadcast_to(np.asarray(result, dtype=np.float64), t.shape).copy()
+        except Exception:
+            pass
+        
+        # 表达式不支持数组运算（如 math.sin(t)），逐点求值
+        values = np.empty(t.shape, dtype=np.float64)
+        for i, current_time in enumerate(t.tolist()):
+            try:
+                values.flat[i] = float(eval(code, SCALAR_NAMESPACE, {
+                    't': current_time, 'time': current_time, 'random': stream.py
+                }))
+            except Exception:
+                values.flat[i] = config.min_value
+        return values
     
     def step(self):
-        """时间步进"""
+        """时间步进（虚拟时钟前进 1/rate 秒）"""
         self.time_counter += 1
+        self.clock.advance()
 
 class BaseComponentGenerator(ABC):
     """基础组件数据生成器抽象类"""
@@ -136,6 +213,26 @@ class BaseComponentGenerator(ABC):
         """生成组件数据"""
         pass
     
+    def _sample(self, config: ComponentConfig, index: int) -> float:
+        """调用第 index 个通道的预编译采样器生成数值（使用该通道独立的随机流）"""
+        sampler, stream = self.data_generator.channel_sampler(config.data_generation[index], (config.name, index))
+        return sampler(self.data_generator.current_time(), stream.py)
+    
+    def channel_precisions(self, config: ComponentConfig) -> List[int]:
+        """获取各通道的输出小数位数（与 generate_data 的格式一致）
+        
+        通道数可变的组件只声明一个精度，所有通道共用；不输出数值的组件返回空列表。
+        """
+        precisions = self.component_state.get('precisions')
+        if not precisions:
+            return []
+        count = len(config.data_generation)
+        return [precisions[min(i, len(precisions) - 1)] for i in range(count)]
+    
+    def _random(self, config: ComponentConfig) -> random.Random:
+        """获取组件级随机流，用于未配置生成规则时的默认数据"""
+        return self.data_generator.rng.stream(config.name).py
+    
     def step(self):
-        """时间步进"""
-        self.data_generator.step()
\ No newline at end of file
+        """组件状态步进（共享的数据生成器由工厂统一步进）"""
+        pass
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+采样时钟
+
+为数据生成器提供可替换的时间源：墙上时钟、单调时钟，以及按采样序号推进的虚拟时钟。
+虚拟时钟不依赖真实时间，可以快于实时地生成可复现、按采样点精确对齐的数据。
+"""
+
+import time
+from abc import ABC, abstractmethod
+
+from ..config.data_types import ClockMode
+
+class SampleClock(ABC):
+    """采样时钟抽象类，now() 返回相对于启动时刻的秒数"""
+
+    @abstractmethod
+    def now(self) -> float:
+        """获取当前时间（秒）"""
+        pass
+
+    def advance(self):
+        """推进一个时间步（仅虚拟时钟有效）"""
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """将时间归零"""
+        pass
+
+class WallClock(SampleClock):
+    """墙上时钟（time.time）"""
+
+    def __init__(self):
+        self.start_time = time.time()
+
+    def now(self) -> float:
+        return time.time() - self.start_time
+
+    def reset(self):
+        self.start_time = time.time()
+
+class MonotonicClock(SampleClock):
+    """单调时钟（time.monotonic），不受系统时间调整影响"""
+
+    def __init__(self):
+        self.start_time = time.monotonic()
+
+    def now(self) -> float:
+        return time.monotonic() - self.start_time
+
+    def reset(self):
+        self.start_time = time.monotonic()
+
+class VirtualClock(SampleClock):
+    """虚拟时钟，时间 = 采样序号 / 采样率，每次 advance() 恰好前进 1/rate 秒"""
+
+    def __init__(self, rate: float = 1000.0):
+        if rate <= 0:
+            raise ValueError(f"虚拟时钟采样率必须大于0: {rate}")
+        self.rate = rate
+        self.sample_index = 0
+
+    def now(self) -> float:
+        # 用序号相除而非累加 1/rate，长时间运行也不会累积舍入误差
+        return self.sample_index / self.rate
+
+    def advance(self):
+        self.sample_index += 1
+
+    def reset(self):
+        self.sample_index = 0
+
+def create_clock(mode: ClockMode, rate: float = 1000.0) -> SampleClock:
+    """根据模式创建时钟"""
+    if mode == ClockMode.WALL:
+        return WallClock()
+    elif mode == ClockMode.MONOTONIC:
+        return MonotonicClock()
+    elif mode == ClockMode.VIRTUAL:
+        return VirtualClock(rate)
+    else:
+        raise ValueError(f"不支持的时钟模式: {mode}")
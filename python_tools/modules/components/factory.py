@@ -4,9 +4,15 @@
 提供统一的组件生成器创建和管理接口。
 """
 
-from typing import Dict, Type
-from ..config.data_types import ComponentType, ComponentConfig
+from typing import Dict, Hashable, Iterator, Optional, Sequence, Type, Union
+
+import numpy as np
+
+from ..config.data_types import ComponentType, ComponentConfig, FrameFormat
+from ..protocol.formatter import FrameFormatter
+from ..protocol.binary import BinaryFrameLayout, compile_layout, layout_key
 from .base import BaseComponentGenerator, DataGenerator
+from .clock import SampleClock
 from .motion_sensors import AccelerometerGenerator, GyroscopeGenerator, CompassGenerator, MPU6050Generator
 from .measurement_displays import GaugeGenerator, BarGenerator, LEDPanelGenerator
 from .plot_charts import PlotGenerator, MultiPlotGenerator, FFTPlotGenerator, Plot3DGenerator
@@ -15,9 +21,11 @@ from .geo_data import GPSGenerator, DataGridGenerator, TerminalGenerator
 class ComponentGeneratorFactory:
     """组件数据生成器工厂"""
     
-    def __init__(self):
-        self.data_generator = DataGenerator()
+    def __init__(self, clock: Optional[SampleClock] = None, seed: Optional[int] = None):
+        self.data_generator = DataGenerator(clock, seed)
         self.generators: Dict[ComponentType, BaseComponentGenerator] = {}
+        self._formatters: Dict[Hashable, Union[FrameFormatter, BinaryFrameLayout]] = {}
+        self._framers: Dict[Hashable, FrameFormatter] = {}
         self._generator_classes: Dict[ComponentType, Type[BaseComponentGenerator]] = {
             ComponentType.ACCELEROMETER: AccelerometerGenerator,
             ComponentType.GYROSCOPE: GyroscopeGenerator,
@@ -48,13 +56,90 @@ class ComponentGeneratorFactory:
             raise ValueError(f"不支持的组件类型: {component_type}")
         return self.generators[component_type]
     
-    def generate_component_data(self, config: ComponentConfig) -> str:
-        """生成指定组件的数据"""
+    def generate_component_data(self, config: ComponentConfig, t: Optional[float] = None) -> str:
+        """生成指定组件的数据（t 为帧时间戳，默认为当前时刻）"""
         generator = self.get_generator(config.component_type)
-        return generator.generate_data(config)
+        self.data_generator.begin_frame(t)
+        try:
+            return generator.generate_data(config)
+        finally:
+            self.data_generator.end_frame()
+    
+    def generate_frames(self, config: ComponentConfig, count: int) -> Iterator[str]:
+        """连续生成 count 帧数据，每帧后步进一次
+        
+        配合 VirtualClock 使用时不受真实时间限制，可快于实时地离线生成可复现数据。
+        """
+        for _ in range(count):
+            yield self.generate_component_data(config)
+            self.step()
+    
+    def generate_component_block(self, config: ComponentConfig, count: int) -> np.ndarray:
+        """按组件频率从当前时刻起批量生成 count 个采样点
+        
+        Returns:
+            形状为 (count, 通道数) 的数组
+        """
+        rate = config.frequency if config.frequency > 0 else 1.0
+        t = self.data_generator.block_times(count, rate)
+        return self.data_generator.generate_component_block(config, t)
+    
+    def get_formatter(self, config: ComponentConfig) -> Union[FrameFormatter, BinaryFrameLayout]:
+        """获取组件的帧编码器：文本格式按通道精度、校验和与载荷编码缓存，二进制格式按帧布局缓存"""
+        if config.frame_format == FrameFormat.BINARY:
+            key = ('binary',) + layout_key(config.binary_frame, len(config.data_generation),
+                                              config.checksum, config.decoder)
+            formatter = self._formatters.get(key)
+            if formatter is None:
+                formatter = compile_layout(config)
+                self._formatters[key] = formatter
+            return formatter
+        
+        generator = self.get_generator(config.component_type)
+        precisions = tuple(generator.channel_precisions(config))
+        if not precisions:
+            raise ValueError(f"组件类型 {config.component_type.value} 不支持数值帧格式化")
+        key = (precisions, config.checksum, config.decoder)
+        formatter = self._formatters.get(key)
+        if formatter is None:
+            formatter = FrameFormatter(precisions, checksum=config.checksum, decoder=config.decoder)
+            self._formatters[key] = formatter
+        return formatter
+    
+    def render_component_block(self, config: ComponentConfig, count: int,
+                               buffer: bytearray, offset: int = 0) -> int:
+        """批量生成 count 帧并按组件帧格式（文本 `$a,b,c;` 每帧一行 / 二进制定长帧）写入 buffer[offset:]
+        
+        Returns:
+            写入的字节数
+        """
+        formatter = self.get_formatter(config)
+        block = self.generate_component_block(config, count)
+        return formatter.render_into(block, buffer, offset)
+    
+    def render_component_frames(self, config: ComponentConfig, times: Sequence[float]) -> bytes:
+        """按组件帧格式生成 times 各时刻的帧（实时发送路径），返回线路字节
+        
+        二进制格式按各通道的生成配置批量采样后用帧布局打包；文本格式沿用组件生成器的输出
+        （保留 GPS 随机游走、指南针取模等组件自身的逻辑），再按组件的载荷编码和校验和成帧。
+        """
+        if config.frame_format == FrameFormat.BINARY and config.data_generation:
+            block = self.data_generator.generate_component_block(config, np.asarray(times, dtype=np.float64))
+            return self.get_formatter(config).render(block)
+        
+        key = (config.checksum, config.decoder)
+        framer = self._framers.get(key)
+        if framer is None:
+            framer = FrameFormatter((), checksum=config.checksum, decoder=config.decoder)
+            self._framers[key] = framer
+        return framer.frame([self.generate_component_data(config, t).encode('utf-8') for t in times])
+    
+    def set_clock(self, clock: SampleClock):
+        """替换数据生成时钟"""
+        self.data_generator.clock = clock
     
     def step(self):
-        """全局时间步进"""
+        """全局时间步进（每次调用时钟恰好前进一步）"""
         self.data_generator.step()
         for generator in self.generators.values():
             generator.step()
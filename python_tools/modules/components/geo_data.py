@@ -5,7 +5,6 @@
 """
 
 import time
-import random
 from datetime import datetime
 from ..config.data_types import ComponentConfig
 from .base import BaseComponentGenerator
@@ -21,24 +20,26 @@ class GPSGenerator(BaseComponentGenerator):
             'lat': 39.9042,  # 北京天安门
             'lon': 116.4074,
             'alt': 50.0,
-            'default_ranges': [(39.85, 40.05), (116.2, 116.6), (30, 100)]
+            'default_ranges': [(39.85, 40.05), (116.2, 116.6), (30, 100)],
+            'precisions': [6, 6, 1]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
         """生成GPS数据 (Latitude, Longitude, Altitude)"""
         if len(config.data_generation) >= 3:
-            lat_delta = self.data_generator.generate_value(config.data_generation[0]) - 50  # 中心化
-            lon_delta = self.data_generator.generate_value(config.data_generation[1]) - 50
-            alt_delta = self.data_generator.generate_value(config.data_generation[2]) - 50
+            lat_delta = self._sample(config, 0) - 50  # 中心化
+            lon_delta = self._sample(config, 1) - 50
+            alt_delta = self._sample(config, 2) - 50
             
             self.component_state['lat'] += lat_delta * 0.0001  # 小幅度移动
             self.component_state['lon'] += lon_delta * 0.0001
             self.component_state['alt'] += alt_delta * 0.1
         else:
             # 默认小幅度漂移
-            self.component_state['lat'] += random.uniform(-0.0001, 0.0001)
-            self.component_state['lon'] += random.uniform(-0.0001, 0.0001)
-            self.component_state['alt'] += random.uniform(-0.5, 0.5)
+            rng = self._random(config)
+            self.component_state['lat'] += rng.uniform(-0.0001, 0.0001)
+            self.component_state['lon'] += rng.uniform(-0.0001, 0.0001)
+            self.component_state['alt'] += rng.uniform(-0.5, 0.5)
         
         # 限制范围
         self.component_state['lat'] = max(-90, min(90, self.component_state['lat']))
@@ -56,30 +57,32 @@ class DataGridGenerator(BaseComponentGenerator):
             'name': 'data_grid',
             'data_count': 'variable',
             'row_counter': 0,
-            'default_ranges': [(0, 100)]
+            'default_ranges': [(0, 100)],
+            'precisions': [2]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
         """生成数据网格数据"""
         # 数据网格通常显示多个数值
         field_count = len(config.data_generation) if config.data_generation else 5
+        rng = self._random(config)
         values = []
         
         for i in range(field_count):
             if i < len(config.data_generation):
-                value = self.data_generator.generate_value(config.data_generation[i])
+                value = self._sample(config, i)
             else:
                 # 默认模拟不同类型的传感器数据
                 if i == 0:  # 温度
-                    value = random.uniform(20, 35)
+                    value = rng.uniform(20, 35)
                 elif i == 1:  # 湿度
-                    value = random.uniform(40, 80)
+                    value = rng.uniform(40, 80)
                 elif i == 2:  # 压力
-                    value = random.uniform(990, 1020)
+                    value = rng.uniform(990, 1020)
                 elif i == 3:  # 电压
-                    value = random.uniform(3.0, 5.0)
+                    value = rng.uniform(3.0, 5.0)
                 else:  # 通用数值
-                    value = random.uniform(0, 100)
+                    value = rng.uniform(0, 100)
             
             values.append(f"{value:.2f}")
         
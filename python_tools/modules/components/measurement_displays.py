@@ -4,7 +4,6 @@
 包含仪表盘、条形图和LED面板的数据生成器。
 """
 
-import random
 from ..config.data_types import ComponentConfig
 from .base import BaseComponentGenerator
 
@@ -16,15 +15,17 @@ class GaugeGenerator(BaseComponentGenerator):
         self.component_state = {
             'name': 'gauge',
             'data_count': 1,
-            'default_ranges': [(0, 100)]
+            'default_ranges': [(0, 100)],
+            'precisions': [2]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
         """生成仪表盘数据"""
         if len(config.data_generation) >= 1:
-            value = self.data_generator.generate_value(config.data_generation[0])
+            value = self._sample(config, 0)
         else:
-            value = random.uniform(0, 100)
+            rng = self._random(config)
+            value = rng.uniform(0, 100)
         
         return f"{value:.2f}"
 
@@ -36,15 +37,17 @@ class BarGenerator(BaseComponentGenerator):
         self.component_state = {
             'name': 'bar',
             'data_count': 1,
-            'default_ranges': [(0, 100)]
+            'default_ranges': [(0, 100)],
+            'precisions': [2]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
         """生成条形图数据"""
         if len(config.data_generation) >= 1:
-            value = self.data_generator.generate_value(config.data_generation[0])
+            value = self._sample(config, 0)
         else:
-            value = random.uniform(0, 100)
+            rng = self._random(config)
+            value = rng.uniform(0, 100)
         
         return f"{value:.2f}"
 
@@ -57,7 +60,8 @@ class LEDPanelGenerator(BaseComponentGenerator):
             'name': 'led_panel',
             'data_count': 'variable',
             'led_states': [False] * 16,  # 支持最多16个LED
-            'default_ranges': [(0, 1)]
+            'default_ranges': [(0, 1)],
+            'precisions': [0]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
@@ -69,17 +73,18 @@ class LEDPanelGenerator(BaseComponentGenerator):
             self.component_state['led_states'].append(False)
         
         # 根据配置更新LED状态
+        rng = self._random(config)
         values = []
         for i in range(led_count):
             if i < len(config.data_generation):
                 # 使用配置的生成规则
-                raw_value = self.data_generator.generate_value(config.data_generation[i])
+                raw_value = self._sample(config, i)
                 # LED通常用阈值判断开关
                 threshold = config.data_generation[i].parameters.get('threshold', 0.5)
                 led_on = raw_value > threshold
             else:
                 # 随机变化
-                led_on = random.random() > 0.7  # 30%概率点亮
+                led_on = rng.random() > 0.7  # 30%概率点亮
             
             self.component_state['led_states'][i] = led_on
             values.append('1' if led_on else '0')
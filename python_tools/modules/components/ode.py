@@ -0,0 +1,231 @@
+"""
+常微分方程系统数据生成
+
+用定步长四阶龙格-库塔法（RK4）积分洛伦兹吸引子等混沌系统。轨迹按块预先计算，
+逐点采样只需查表，同一组件的 X/Y/Z 通道共享一个积分器，得到真实的三维点云。
+输出按各通道的 min_value/max_value 裁剪，与其他生成规则一样落在配置的量程内。
+"""
+
+import copy
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config.data_types import DataGenConfig
+
+# 导数函数签名: derivative(state, out, **params) -> out，结果写入预分配的 out（与 state 同形状）
+
+def lorenz(state: np.ndarray, out: Optional[np.ndarray] = None, sigma: float = 10.0,
+           rho: float = 28.0, beta: float = 8.0 / 3.0) -> np.ndarray:
+    """洛伦兹系统"""
+    if out is None:
+        out = np.empty_like(state)
+    x, y, z = state[..., 0], state[..., 1], state[..., 2]
+    out[..., 0] = sigma * (y - x)
+    out[..., 1] = x * (rho - z) - y
+    out[..., 2] = x * y - beta * z
+    return out
+
+def rossler(state: np.ndarray, out: Optional[np.ndarray] = None, a: float = 0.2,
+            b: float = 0.2, c: float = 5.7) -> np.ndarray:
+    """Rössler 系统"""
+    if out is None:
+        out = np.empty_like(state)
+    x, y, z = state[..., 0], state[..., 1], state[..., 2]
+    out[..., 0] = -y - z
+    out[..., 1] = x + a * y
+    out[..., 2] = b + z * (x - c)
+    return out
+
+def chen(state: np.ndarray, out: Optional[np.ndarray] = None, a: float = 35.0,
+         b: float = 3.0, c: float = 28.0) -> np.ndarray:
+    """Chen 系统"""
+    if out is None:
+        out = np.empty_like(state)
+    x, y, z = state[..., 0], state[..., 1], state[..., 2]
+    out[..., 0] = a * (y - x)
+    out[..., 1] = (c - a) * x - x * z + c * y
+    out[..., 2] = x * y - b * z
+    return out
+
+# 系统名称 -> (导数函数, 默认初始状态)
+ODE_SYSTEMS: Dict[str, Tuple[Callable[..., np.ndarray], Tuple[float, ...]]] = {
+    'lorenz': (lorenz, (1.0, 1.0, 1.0)),
+    'rossler': (rossler, (1.0, 1.0, 1.0)),
+    'chen': (chen, (-10.0, 0.0, 37.0))
+}
+
+# 每次预计算的积分步数
+ODE_BLOCK_SIZE = 1024
+
+def rk4_block(derivative: Callable[..., np.ndarray], state: np.ndarray, dt: float,
+              steps: int, params: Dict[str, float]) -> np.ndarray:
+    """从 state 出发积分 steps 步，返回形状为 (steps, *state.shape) 的轨迹
+
+    state 的最后一维为系统维度，前面的维度可用于同时积分多条轨迹。
+    RK4 每一步依赖上一步的结果，只能逐步循环；循环内各阶导数和中间状态写入预分配的数组，
+    新状态直接写入轨迹的对应行，每步不再分配临时数组。
+    """
+    trajectory = np.empty((steps,) + state.shape, dtype=np.float64)
+    k1, k2, k3, k4, probe = (np.empty(state.shape, dtype=np.float64) for _ in range(5))
+    half = dt / 2
+    sixth = dt / 6
+    current = np.asarray(state, dtype=np.float64)
+    for i in range(steps):
+        derivative(current, k1, **params)
+        np.multiply(k1, half, out=probe)
+        probe += current
+        derivative(probe, k2, **params)
+        np.multiply(k2, half, out=probe)
+        probe += current
+        derivative(probe, k3, **params)
+        np.multiply(k3, dt, out=probe)
+        probe += current
+        derivative(probe, k4, **params)
+        # k1 + 2*(k2 + k3) + k4
+        k2 += k3
+        k2 *= 2
+        k1 += k2
+        k1 += k4
+        k1 *= sixth
+        np.add(current, k1, out=trajectory[i])
+        current = trajectory[i]
+    return trajectory
+
+class ODEIntegrator:
+    """定步长积分器，维护一段已计算的轨迹窗口并按需向前扩展
+
+    时刻 t（秒）对应积分步位置 t * speed / dt，步与步之间线性插值。
+    轨迹从第一次请求的步开始（以初始状态为起点），而不是从时刻 0 积分到当前时钟；
+    时钟回退或向前跳过超过一个块的步数时同样从新的位置重新开始，每次只按块向前积分。
+    """
+
+    def __init__(self, system: str, params: Optional[Dict[str, float]] = None,
+                 initial: Optional[Sequence[float]] = None, dt: float = 0.005,
+                 speed: float = 1.0, block_size: int = ODE_BLOCK_SIZE):
+        if system not in ODE_SYSTEMS:
+            raise ValueError(f"不支持的ODE系统: {system}，可选: {list(ODE_SYSTEMS)}")
+        if dt <= 0:
+            raise ValueError(f"积分步长必须大于0: {dt}")
+        if block_size <= 0:
+            raise ValueError(f"积分块大小必须大于0: {block_size}")
+
+        self.derivative, default_initial = ODE_SYSTEMS[system]
+        self.params = dict(params or {})
+        self.initial = np.asarray(initial if initial is not None else default_initial, dtype=np.float64)
+        self.dt = dt
+        self.steps_per_second = speed / dt
+        self.block_size = block_size
+        self.reset()
+
+    def reset(self, base: int = 0):
+        """回到初始状态，轨迹从第 base 步开始"""
+        self.base = base  # 轨迹窗口第一行对应的步序号
+        self.trajectory = self.initial[np.newaxis].copy()
+
+    def _ensure(self, first: int, last: int):
+        """保证窗口覆盖 [first, last] 步"""
+        end = self.base + len(self.trajectory) - 1
+        if first < self.base or first > end + self.block_size:
+            # 时间回退到窗口之前或向前跳跃：从初始状态在 first 处重新开始，不积分跳过的区间
+            self.reset(first)
+            end = first
+        if end >= last:
+            return
+        # 丢弃 first 之前已不再需要的历史（至少保留最后一步作为衔接）
+        keep_from = min(first, end) - self.base
+        blocks = [self.trajectory[keep_from:]]
+        state = self.trajectory[-1]
+        while end < last:
+            block = rk4_block(self.derivative, state, self.dt, self.block_size, self.params)
+            blocks.append(block)
+            state = block[-1]
+            end += self.block_size
+        self.trajectory = np.concatenate(blocks)
+        self.base += keep_from
+
+    def state_at(self, t: float) -> np.ndarray:
+        """时刻 t 的系统状态（相邻积分步之间线性插值）"""
+        position = max(t, 0.0) * self.steps_per_second
+        index = int(position)
+        offset = index - self.base
+        if offset < 0 or offset + 1 >= len(self.trajectory):
+            self._ensure(index, index + 1)
+            offset = index - self.base
+        low = self.trajectory[offset]
+        return low + (self.trajectory[offset + 1] - low) * (position - index)
+
+    def states_at(self, t: np.ndarray) -> np.ndarray:
+        """批量获取时刻数组 t 的系统状态，返回形状为 (len(t), 维度)"""
+        positions = np.maximum(np.asarray(t, dtype=np.float64), 0.0) * self.steps_per_second
+        if positions.size == 0:
+            return np.empty((0, self.initial.size))
+        indices = positions.astype(np.int64)
+        self._ensure(int(indices.min()), int(indices.max()) + 1)
+        offsets = indices - self.base
+        low = self.trajectory[offsets]
+        high = self.trajectory[offsets + 1]
+        return low + (high - low) * (positions - indices)[:, np.newaxis]
+
+def integrator_key(config: DataGenConfig) -> Tuple:
+    """积分器共享键：同一组件内系统和参数相同的通道共享一个积分器"""
+    parameters = config.parameters
+    return (
+        parameters.get('system', 'lorenz'),
+        tuple(sorted(parameters.get('params', {}).items())),
+        tuple(parameters.get('initial') or ()),
+        parameters.get('dt', 0.005),
+        parameters.get('speed', 1.0)
+    )
+
+def create_integrator(config: DataGenConfig) -> ODEIntegrator:
+    """根据 ODE_SYSTEM 规则的 parameters 创建积分器
+
+    parameters:
+        system: 系统名称（lorenz/rossler/chen）
+        params: 系统参数，如 {'sigma': 10, 'rho': 28, 'beta': 8/3}
+        initial: 初始状态
+        dt: 积分步长（模型时间）
+        speed: 每秒推进的模型时间
+    """
+    parameters = config.parameters
+    return ODEIntegrator(
+        system=parameters.get('system', 'lorenz'),
+        params=parameters.get('params'),
+        initial=parameters.get('initial'),
+        dt=parameters.get('dt', 0.005),
+        speed=parameters.get('speed', 1.0)
+    )
+
+class ODEAxisSampler:
+    """ODE 系统某一维度的采样器（parameters['axis'] 指定维度）
+
+    未绑定时自带积分器；通过 fork() 绑定到数据生成器后，与同组件的其他维度共享积分器。
+    """
+
+    def __init__(self, config: DataGenConfig):
+        self.axis = int(config.parameters.get('axis', 0))
+        self.lo = min(config.min_value, config.max_value)
+        self.hi = max(config.min_value, config.max_value)
+        self.key = integrator_key(config)
+        self.integrator = create_integrator(config)
+        if not 0 <= self.axis < self.integrator.initial.size:
+            raise ValueError(f"ODE系统维度超出范围: axis={self.axis}")
+
+    def fork(self, owner=None, channel=None) -> 'ODEAxisSampler':
+        """绑定到数据生成器的共享积分器"""
+        sampler = copy.copy(self)
+        if owner is not None:
+            component = channel[0] if channel is not None else None
+            sampler.integrator = owner.ode_integrator(component, self)
+        else:
+            sampler.integrator = copy.deepcopy(self.integrator)
+            sampler.integrator.reset()
+        return sampler
+
+    def __call__(self, t: float, rng=None) -> float:
+        value = float(self.integrator.state_at(t)[self.axis])
+        return self.hi if value > self.hi else self.lo if value < self.lo else value
+
+    def block(self, t: np.ndarray) -> np.ndarray:
+        return np.clip(self.integrator.states_at(t)[:, self.axis], self.lo, self.hi)
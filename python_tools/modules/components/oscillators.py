@@ -0,0 +1,155 @@
+"""
+相位累加波表振荡器
+
+周期规则（正弦/余弦/方波/锯齿波/三角波）不再由绝对时间直接计算三角函数和取模，
+而是为每个通道维护一个相位累加器（单位：周期，始终保持在 [0, 1) 区间），
+每次只按时间增量推进相位。长时间运行时相位精度不会随绝对时间增大而下降，
+正弦类波形通过预计算波表线性插值得到，方波和锯齿波可选带限波表。
+"""
+
+import copy
+import math
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+from ..config.data_types import DataGenConfig, DataGenRule
+
+# 波表长度（2的幂），线性插值误差约为 (2π/N)²/8
+TABLE_SIZE = 4096
+
+# 波表插值横坐标
+TABLE_INDEX = np.arange(TABLE_SIZE + 1, dtype=np.float64)
+
+# 使用相位累加器的周期规则
+PERIODIC_RULES = (
+    DataGenRule.SINE_WAVE,
+    DataGenRule.COSINE_WAVE,
+    DataGenRule.SQUARE_WAVE,
+    DataGenRule.SAWTOOTH_WAVE,
+    DataGenRule.TRIANGLE_WAVE
+)
+
+@lru_cache(maxsize=None)
+def sine_table() -> np.ndarray:
+    """单周期正弦波表，末尾多存一个点便于插值时回绕"""
+    return np.sin(2 * math.pi * np.arange(TABLE_SIZE + 1) / TABLE_SIZE)
+
+@lru_cache(maxsize=64)
+def band_limited_table(rule: DataGenRule, harmonics: int) -> np.ndarray:
+    """按傅里叶级数叠加至 harmonics 次谐波的带限方波/锯齿波表
+
+    方波: (4/π) Σ sin(2πkp)/k, k 为奇数
+    锯齿波 2p-1: -(2/π) Σ sin(2πkp)/k
+    """
+    phases = 2 * math.pi * np.arange(TABLE_SIZE + 1) / TABLE_SIZE
+    table = np.zeros(TABLE_SIZE + 1)
+    if rule == DataGenRule.SQUARE_WAVE:
+        for k in range(1, harmonics + 1, 2):
+            table += np.sin(k * phases) / k
+        table *= 4 / math.pi
+    else:
+        for k in range(1, harmonics + 1):
+            table += np.sin(k * phases) / k
+        table *= -2 / math.pi
+    return table
+
+class PhaseOscillator:
+    """单通道相位累加振荡器
+
+    可作为采样器直接调用: oscillator(t, rng) -> float；
+    也可通过 block(t) 批量生成。相位按 t 的增量推进，因此同一时刻重复调用结果不变。
+    """
+
+    def __init__(self, config: DataGenConfig):
+        self.rule = config.rule
+        self.cycles = config.frequency
+        self.amplitude = config.amplitude
+        self.mid = config.min_value + (config.max_value - config.min_value) / 2
+        self.initial_phase = config.phase / (2 * math.pi)
+        if self.rule == DataGenRule.COSINE_WAVE:
+            self.initial_phase += 0.25  # cos(x) = sin(x + π/2)
+
+        self.phase: Optional[float] = None  # 当前相位（周期）
+        self.last_t = 0.0
+
+        self.table: Optional[np.ndarray] = None
+        if self.rule in (DataGenRule.SINE_WAVE, DataGenRule.COSINE_WAVE):
+            self.table = sine_table()
+        elif self.rule in (DataGenRule.SQUARE_WAVE, DataGenRule.SAWTOOTH_WAVE):
+            harmonics = self._band_limit_harmonics(config)
+            if harmonics:
+                self.table = band_limited_table(self.rule, harmonics)
+        self._table_list: List[float] = self.table.tolist() if self.table is not None else []
+
+    def fork(self, owner=None, channel=None) -> 'PhaseOscillator':
+        """复制出参数相同、相位未初始化的新振荡器（用于按通道独立维护相位）"""
+        oscillator = copy.copy(self)
+        oscillator.phase = None
+        oscillator.last_t = 0.0
+        return oscillator
+
+    def _band_limit_harmonics(self, config: DataGenConfig) -> int:
+        """计算带限波表的谐波数，未启用带限时返回0
+
+        需要在 parameters 中设置 band_limited=True 和 sample_rate（Hz）。
+        谐波数不超过波表能表示的最高次数 TABLE_SIZE // 2，低频时也不会混叠或无限增大建表开销。
+        """
+        if not config.parameters.get('band_limited'):
+            return 0
+        sample_rate = config.parameters.get('sample_rate', 0)
+        if sample_rate <= 0 or self.cycles <= 0:
+            return 0
+        return min(max(1, int(sample_rate / 2 / self.cycles)), TABLE_SIZE // 2)
+
+    def _advance(self, t: float) -> float:
+        """将相位推进到时刻 t 并返回相位"""
+        if self.phase is None:
+            self.phase = (self.cycles * t + self.initial_phase) % 1.0
+        else:
+            self.phase = (self.phase + self.cycles * (t - self.last_t)) % 1.0
+        if self.phase >= 1.0:
+            # 极小负数取模会得到 1.0
+            self.phase = 0.0
+        self.last_t = t
+        return self.phase
+
+    def _shape(self, phase: float) -> float:
+        """将相位映射为归一化波形值 [-1, 1]"""
+        table = self._table_list
+        if table:
+            position = phase * TABLE_SIZE
+            index = int(position)
+            low = table[index]
+            return low + (table[index + 1] - low) * (position - index)
+        if self.rule == DataGenRule.SQUARE_WAVE:
+            return 1.0 if 0.0 < phase < 0.5 else -1.0
+        if self.rule == DataGenRule.SAWTOOTH_WAVE:
+            return 2 * phase - 1
+        # 三角波
+        return 4 * phase - 1 if phase < 0.5 else 3 - 4 * phase
+
+    def __call__(self, t: float, rng=None) -> float:
+        return self.amplitude * self._shape(self._advance(t)) + self.mid
+
+    def block(self, t: np.ndarray) -> np.ndarray:
+        """批量生成，相位状态推进到 t 的最后一个时刻"""
+        t = np.asarray(t, dtype=np.float64)
+        if t.size == 0:
+            return np.empty(t.shape)
+        if self.phase is None:
+            self._advance(float(t.flat[0]))
+        phases = np.mod(self.phase + self.cycles * (t - self.last_t), 1.0)
+        self.phase = float(phases.flat[-1])
+        self.last_t = float(t.flat[-1])
+
+        if self.table is not None:
+            shaped = np.interp(phases * TABLE_SIZE, TABLE_INDEX, self.table)
+        elif self.rule == DataGenRule.SQUARE_WAVE:
+            shaped = np.where((phases > 0.0) & (phases < 0.5), 1.0, -1.0)
+        elif self.rule == DataGenRule.SAWTOOTH_WAVE:
+            shaped = 2 * phases - 1
+        else:
+            shaped = np.where(phases < 0.5, 4 * phases - 1, 3 - 4 * phases)
+        return self.amplitude * shaped + self.mid
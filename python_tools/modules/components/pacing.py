@@ -0,0 +1,255 @@
+"""
+高精度发送节拍
+
+time.sleep(interval) 不扣除生成和发送本身的耗时，实际速率总是低于目标。这里按绝对到期
+时刻（time.monotonic_ns）休眠：第 n 次发送的时刻为 起点 + n * 间隔，偶尔的延迟会在之后追回。
+
+休眠方式：
+- clock_nanosleep: Linux 上以 TIMER_ABSTIME 睡到 CLOCK_MONOTONIC 绝对时刻，被信号打断后不漂移
+- timerfd: Linux 上设置绝对时刻的一次性 timerfd 并阻塞读取
+- sleep: 其他平台使用 time.sleep(剩余时间)
+可选混合模式：先休眠到到期前 spin 秒，再忙等到到期，用于亚毫秒级间隔。
+
+PacingStats 记录每次唤醒相对到期时刻的延迟，以及相邻两次唤醒间隔相对计划间隔的抖动，
+报告实际达到的速率而不只是请求的速率。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import time
+from array import array
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+import numpy as np
+
+NS_PER_SECOND = 1_000_000_000
+
+# 休眠方式
+PACING_AUTO = 'auto'
+PACING_SLEEP = 'sleep'
+PACING_NANOSLEEP = 'clock_nanosleep'
+PACING_TIMERFD = 'timerfd'
+PACING_BACKENDS = (PACING_AUTO, PACING_NANOSLEEP, PACING_TIMERFD, PACING_SLEEP)
+
+# linux/time.h、linux/timerfd.h
+TIMER_ABSTIME = 1
+TFD_CLOEXEC = 0o2000000
+TFD_TIMER_ABSTIME = 1
+EINTR = 4
+
+class _Timespec(ctypes.Structure):
+    _fields_ = [('tv_sec', ctypes.c_long), ('tv_nsec', ctypes.c_long)]
+
+class _Itimerspec(ctypes.Structure):
+    _fields_ = [('it_interval', _Timespec), ('it_value', _Timespec)]
+
+def _timespec(ns: int) -> _Timespec:
+    return _Timespec(ns // NS_PER_SECOND, ns % NS_PER_SECOND)
+
+def _monotonic_libc() -> Optional[ctypes.CDLL]:
+    """time.monotonic_ns 基于 CLOCK_MONOTONIC 时返回 libc，否则无法与系统定时器对齐，返回 None"""
+    if not hasattr(time, 'CLOCK_MONOTONIC'):
+        return None
+    if time.get_clock_info('monotonic').implementation != 'clock_gettime(CLOCK_MONOTONIC)':
+        return None
+    try:
+        return ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+    except OSError:
+        return None
+
+class DeadlineSleeper:
+    """休眠到 time.monotonic_ns 绝对时刻
+
+    Args:
+        backend: 休眠方式，'auto' 依次尝试 clock_nanosleep、timerfd、sleep
+        spin: 混合模式的忙等时长（秒），0 表示不忙等
+
+    Attributes:
+        backend: 实际使用的休眠方式
+    """
+
+    def __init__(self, backend: str = PACING_AUTO, spin: float = 0.0):
+        if backend not in PACING_BACKENDS:
+            raise ValueError(f"不支持的休眠方式: {backend}，可选: {', '.join(PACING_BACKENDS)}")
+        if spin < 0:
+            raise ValueError(f"忙等时长不能为负数: {spin}")
+        self.spin_ns = int(spin * NS_PER_SECOND)
+        self._libc: Optional[ctypes.CDLL] = None
+        self._timerfd: Optional[int] = None
+
+        libc = _monotonic_libc() if backend != PACING_SLEEP else None
+        if backend in (PACING_AUTO, PACING_NANOSLEEP) and libc is not None and hasattr(libc, 'clock_nanosleep'):
+            self._libc = libc
+            self.backend = PACING_NANOSLEEP
+        elif backend in (PACING_AUTO, PACING_TIMERFD) and libc is not None and self._open_timerfd(libc):
+            self._libc = libc
+            self.backend = PACING_TIMERFD
+        elif backend in (PACING_AUTO, PACING_SLEEP):
+            self.backend = PACING_SLEEP
+        else:
+            raise ValueError(f"当前平台不支持休眠方式: {backend}")
+
+    def _open_timerfd(self, libc: ctypes.CDLL) -> bool:
+        try:
+            fd = libc.timerfd_create(time.CLOCK_MONOTONIC, TFD_CLOEXEC)
+        except AttributeError:
+            return False
+        if fd < 0:
+            return False
+        self._timerfd = fd
+        return True
+
+    def sleep_until(self, deadline_ns: int) -> int:
+        """休眠到 deadline_ns（已过期则立即返回），返回醒来时的 time.monotonic_ns"""
+        target = deadline_ns - self.spin_ns
+        if target > time.monotonic_ns():
+            if self.backend == PACING_NANOSLEEP:
+                self._nanosleep(target)
+            elif self.backend == PACING_TIMERFD:
+                self._timerfd_sleep(target)
+            else:
+                self._sleep(target)
+        now = time.monotonic_ns()
+        while now < deadline_ns:
+            now = time.monotonic_ns()
+        return now
+
+    def _nanosleep(self, deadline_ns: int):
+        request = _timespec(deadline_ns)
+        # 绝对时刻休眠被信号打断时以同一时刻重试，不会累积误差
+        while self._libc.clock_nanosleep(time.CLOCK_MONOTONIC, TIMER_ABSTIME,
+                                         ctypes.byref(request), None) == EINTR:
+            pass
+
+    def _timerfd_sleep(self, deadline_ns: int):
+        spec = _Itimerspec(_Timespec(0, 0), _timespec(deadline_ns))
+        if self._libc.timerfd_settime(self._timerfd, TFD_TIMER_ABSTIME, ctypes.byref(spec), None) < 0:
+            self._sleep(deadline_ns)
+            return
+        while True:
+            try:
+                os.read(self._timerfd, 8)
+                return
+            except InterruptedError:
+                continue
+
+    @staticmethod
+    def _sleep(deadline_ns: int):
+        remaining = deadline_ns - time.monotonic_ns()
+        if remaining > 0:
+            time.sleep(remaining / NS_PER_SECOND)
+
+    def close(self):
+        if self._timerfd is not None:
+            os.close(self._timerfd)
+            self._timerfd = None
+
+@dataclass
+class PacingReport:
+    """节拍统计报告（时间单位：微秒）
+
+    Attributes:
+        ticks: 唤醒次数
+        target_rate: 计划速率（次/秒，按到期时刻计算）
+        achieved_rate: 实际速率（次/秒，按唤醒时刻计算）
+        lateness_p50/lateness_p99/lateness_max: 唤醒时刻晚于到期时刻的时长
+        jitter_p50/jitter_p90/jitter_p99/jitter_max: 相邻唤醒间隔与计划间隔之差的绝对值
+    """
+    ticks: int = 0
+    target_rate: float = 0.0
+    achieved_rate: float = 0.0
+    lateness_p50: float = 0.0
+    lateness_p99: float = 0.0
+    lateness_max: float = 0.0
+    jitter_p50: float = 0.0
+    jitter_p90: float = 0.0
+    jitter_p99: float = 0.0
+    jitter_max: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class PacingStats:
+    """记录每次唤醒的到期时刻和实际时刻"""
+
+    def __init__(self):
+        self._deadlines = array('q')
+        self._actuals = array('q')
+
+    def __len__(self) -> int:
+        return len(self._actuals)
+
+    def record(self, deadline_ns: int, actual_ns: int):
+        self._deadlines.append(deadline_ns)
+        self._actuals.append(actual_ns)
+
+    def report(self) -> PacingReport:
+        report = PacingReport(ticks=len(self._actuals))
+        if not self._actuals:
+            return report
+        deadlines = np.frombuffer(self._deadlines, dtype=np.int64)
+        actuals = np.frombuffer(self._actuals, dtype=np.int64)
+        lateness = np.maximum(actuals - deadlines, 0) / 1e3
+        report.lateness_p50, report.lateness_p99 = (float(v) for v in np.percentile(lateness, [50, 99]))
+        report.lateness_max = float(lateness.max())
+        if len(actuals) > 1:
+            planned = deadlines[-1] - deadlines[0]
+            achieved = actuals[-1] - actuals[0]
+            ticks = len(actuals) - 1
+            report.target_rate = ticks * NS_PER_SECOND / planned if planned > 0 else 0.0
+            report.achieved_rate = ticks * NS_PER_SECOND / achieved if achieved > 0 else 0.0
+            jitter = np.abs(np.diff(actuals) - np.diff(deadlines)) / 1e3
+            report.jitter_p50, report.jitter_p90, report.jitter_p99 = (
+                float(v) for v in np.percentile(jitter, [50, 90, 99]))
+            report.jitter_max = float(jitter.max())
+        return report
+
+    def reset(self):
+        self._deadlines = array('q')
+        self._actuals = array('q')
+
+class Pacer:
+    """固定间隔节拍：第 n 次 wait() 在 起点 + n * interval 返回（第一次立即返回）
+
+    Args:
+        interval: 间隔（秒）
+        backend: 休眠方式，见 DeadlineSleeper
+        spin: 混合模式的忙等时长（秒）
+    """
+
+    def __init__(self, interval: float, backend: str = PACING_AUTO, spin: float = 0.0):
+        if interval <= 0:
+            raise ValueError(f"发送间隔必须大于0: {interval}")
+        self.interval_ns = round(interval * NS_PER_SECOND)
+        self.sleeper = DeadlineSleeper(backend, spin)
+        self.stats = PacingStats()
+        self.origin_ns: Optional[int] = None
+        self.index = 0
+
+    def start(self, now_ns: Optional[int] = None):
+        """以 now_ns 为起点重新计时"""
+        self.origin_ns = time.monotonic_ns() if now_ns is None else now_ns
+        self.index = 0
+
+    @property
+    def next_deadline(self) -> int:
+        """下一次 wait() 的到期时刻"""
+        if self.origin_ns is None:
+            self.start()
+        return self.origin_ns + self.index * self.interval_ns
+
+    def wait(self) -> int:
+        """休眠到下一个到期时刻，返回醒来时的 time.monotonic_ns"""
+        deadline = self.next_deadline
+        self.index += 1
+        actual = self.sleeper.sleep_until(deadline)
+        self.stats.record(deadline, actual)
+        return actual
+
+    def report(self) -> PacingReport:
+        return self.stats.report()
+
+    def close(self):
+        self.sleeper.close()
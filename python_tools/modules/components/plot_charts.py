@@ -4,9 +4,7 @@
 包含单线图、多线图、FFT频谱图和3D图表的数据生成器。
 """
 
-import time
 import math
-import random
 from ..config.data_types import ComponentConfig
 from .base import BaseComponentGenerator
 
@@ -18,16 +16,17 @@ class PlotGenerator(BaseComponentGenerator):
         self.component_state = {
             'name': 'plot',
             'data_count': 1,
-            'default_ranges': [(-2, 2)]
+            'default_ranges': [(-2, 2)],
+            'precisions': [4]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
         """生成单线图数据"""
         if len(config.data_generation) >= 1:
-            value = self.data_generator.generate_value(config.data_generation[0])
+            value = self._sample(config, 0)
         else:
             # 默认正弦波
-            t = time.time() - self.data_generator.start_time
+            t = self.data_generator.current_time()
             value = math.sin(2 * math.pi * 0.5 * t)
         
         return f"{value:.4f}"
@@ -40,7 +39,8 @@ class MultiPlotGenerator(BaseComponentGenerator):
         self.component_state = {
             'name': 'multiplot',
             'data_count': 'variable',
-            'default_ranges': [(-2, 2)]
+            'default_ranges': [(-2, 2)],
+            'precisions': [4]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
@@ -50,10 +50,10 @@ class MultiPlotGenerator(BaseComponentGenerator):
         
         for i in range(channel_count):
             if i < len(config.data_generation):
-                value = self.data_generator.generate_value(config.data_generation[i])
+                value = self._sample(config, i)
             else:
                 # 默认不同频率的正弦波
-                t = time.time() - self.data_generator.start_time
+                t = self.data_generator.current_time()
                 freq = 0.5 + i * 0.3
                 phase = i * math.pi / 4
                 value = math.sin(2 * math.pi * freq * t + phase)
@@ -70,16 +70,18 @@ class FFTPlotGenerator(BaseComponentGenerator):
         self.component_state = {
             'name': 'fft_plot',
             'data_count': 1,
-            'default_ranges': [(-2, 2)]
+            'default_ranges': [(-2, 2)],
+            'precisions': [4]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
         """生成FFT图数据（时域信号）"""
         if len(config.data_generation) >= 1:
-            value = self.data_generator.generate_value(config.data_generation[0])
+            value = self._sample(config, 0)
         else:
             # 默认多频率混合信号
-            t = time.time() - self.data_generator.start_time
+            rng = self._random(config)
+            t = self.data_generator.current_time()
             freqs = [1, 5, 10]  # Hz
             amps = [1, 0.5, 0.3]
             signal = 0
@@ -87,7 +89,7 @@ class FFTPlotGenerator(BaseComponentGenerator):
                 signal += amp * math.sin(2 * math.pi * freq * t)
             
             # 添加噪声
-            signal += random.gauss(0, 0.1)
+            signal += rng.gauss(0, 0.1)
             value = signal
         
         return f"{value:.4f}"
@@ -100,18 +102,19 @@ class Plot3DGenerator(BaseComponentGenerator):
         self.component_state = {
             'name': 'plot_3d',
             'data_count': 3,
-            'default_ranges': [(-5, 5), (-5, 5), (-5, 5)]
+            'default_ranges': [(-5, 5), (-5, 5), (-5, 5)],
+            'precisions': [3, 3, 3]
         }
     
     def generate_data(self, config: ComponentConfig) -> str:
         """生成3D图数据 (X, Y, Z)"""
         if len(config.data_generation) >= 3:
-            x = self.data_generator.generate_value(config.data_generation[0])
-            y = self.data_generator.generate_value(config.data_generation[1])
-            z = self.data_generator.generate_value(config.data_generation[2])
+            x = self._sample(config, 0)
+            y = self._sample(config, 1)
+            z = self._sample(config, 2)
         else:
             # 默认3D螺旋
-            t = time.time() - self.data_generator.start_time
+            t = self.data_generator.current_time()
             x = math.cos(t) * (1 + 0.1 * t)
             y = math.sin(t) * (1 + 0.1 * t)
             z = 0.1 * t
@@ -0,0 +1,104 @@
+"""
+随机数流管理
+
+由一个根种子派生出按（组件, 通道）划分的独立随机流。每个流的派生只取决于
+根种子和组件名/通道号，与创建顺序无关，因此按组件拆分到多个进程生成时，
+与单进程运行得到逐位相同的结果。
+"""
+
+import random
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# 组件级随机流使用的通道号（用于组件生成器的默认/回退数据）
+COMPONENT_CHANNEL = -1
+
+class ChannelStream:
+    """单个通道的随机流
+
+    Attributes:
+        py: random.Random 实例，用于逐点采样
+        np: numpy.random.Generator 实例，用于批量采样
+    """
+
+    def __init__(self, seed_sequence: np.random.SeedSequence):
+        self.seed_sequence = seed_sequence
+        self.np = np.random.default_rng(seed_sequence)
+        self.py = random.Random(int.from_bytes(seed_sequence.generate_state(4).tobytes(), 'little'))
+
+class RNGHierarchy:
+    """根种子 -> (组件, 通道) 随机流"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.root = np.random.SeedSequence(seed)
+        self._streams: Dict[Tuple[str, int], ChannelStream] = {}
+
+    @property
+    def seed(self) -> int:
+        """根种子（未指定时为系统熵，可用于复现本次运行）"""
+        return self.root.entropy
+
+    def stream(self, component: str, channel: int = COMPONENT_CHANNEL) -> ChannelStream:
+        """获取指定组件和通道的随机流，首次访问时派生"""
+        key = (component, channel)
+        stream = self._streams.get(key)
+        if stream is None:
+            stream = ChannelStream(self._derive(component, channel))
+            self._streams[key] = stream
+        return stream
+
+    def _derive(self, component: str, channel: int) -> np.random.SeedSequence:
+        """由组件名和通道号确定性地派生子种子"""
+        # 组件名用 crc32 映射为稳定整数（内置 hash() 在不同进程间不稳定）
+        component_key = zlib.crc32(component.encode('utf-8'))
+        return np.random.SeedSequence(
+            entropy=self.root.entropy,
+            spawn_key=(component_key, channel + 1)
+        )
+
+    def reset(self):
+        """丢弃所有已派生的流，下次访问时从头开始"""
+        self._streams.clear()
+
+class VectorRandom:
+    """random 模块的向量化替身，用于自定义函数的批量求值
+
+    每次调用按采样块形状返回一组独立采样（来自通道的 numpy Generator），
+    而不是一个被广播到整块的标量。参数可以是与采样块形状兼容的数组。
+
+    Args:
+        generator: 通道的 numpy.random.Generator
+        shape: 采样块形状
+    """
+
+    def __init__(self, generator: np.random.Generator, shape: Tuple[int, ...]):
+        self._generator = generator
+        self._shape = shape
+
+    def random(self) -> np.ndarray:
+        return self._generator.random(self._shape)
+
+    def uniform(self, a, b) -> np.ndarray:
+        return self._generator.uniform(a, b, self._shape)
+
+    def gauss(self, mu=0.0, sigma=1.0) -> np.ndarray:
+        # 与 random.gauss 一致，sigma 为负数时不报错
+        return mu + sigma * self._generator.standard_normal(self._shape)
+
+    normalvariate = gauss
+
+    def lognormvariate(self, mu, sigma) -> np.ndarray:
+        return np.exp(self.gauss(mu, sigma))
+
+    def expovariate(self, lambd=1.0) -> np.ndarray:
+        return self._generator.standard_exponential(self._shape) / lambd
+
+    def triangular(self, low=0.0, high=1.0, mode=None) -> np.ndarray:
+        if mode is None:
+            mode = (low + high) / 2
+        return self._generator.triangular(low, mode, high, self._shape)
+
+    def randint(self, a, b) -> np.ndarray:
+        return self._generator.integers(a, b, self._shape, endpoint=True)
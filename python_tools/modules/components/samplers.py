@@ -0,0 +1,129 @@
+"""
+预编译采样器
+
+将 DataGenConfig 编译为专用的采样闭包，常量（中点、量程等）在编译时折叠，
+避免每个采样点都遍历规则分支并重复读取配置属性。周期规则编译为相位累加振荡器。
+"""
+
+import copy
+import math
+import random
+from typing import Any, Callable
+
+import numpy as np
+
+from ..config.data_types import DataGenConfig, DataGenRule
+from ..config.expressions import compile_expression
+from .oscillators import PERIODIC_RULES, PhaseOscillator
+from .ode import ODEAxisSampler
+
+# 采样器签名: sampler(t, rng) -> float，rng 为 random.Random（或 random 模块）
+Sampler = Callable[[float, Any], float]
+
+# 自定义函数的求值命名空间（t/time 作为局部变量传入）
+SCALAR_NAMESPACE = {
+    '__builtins__': {},
+    'math': math, 'random': random,
+    'sin': math.sin, 'cos': math.cos, 'tan': math.tan,
+    'exp': math.exp, 'log': math.log, 'sqrt': math.sqrt,
+    'abs': abs, 'min': min, 'max': max, 'pow': pow, 'round': round,
+    'pi': math.pi, 'e': math.e
+}
+
+VECTOR_NAMESPACE = {
+    '__builtins__': {},
+    'math': math, 'random': random,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'exp': np.exp, 'log': np.log, 'sqrt': np.sqrt,
+    'abs': np.abs, 'min': np.minimum, 'max': np.maximum, 'pow': np.power, 'round': np.round,
+    'pi': math.pi, 'e': math.e
+}
+
+def get_sampler(config: DataGenConfig) -> Sampler:
+    """获取配置的采样器，首次调用或配置修改后重新编译
+
+    字段重新赋值时 DataGenConfig 会丢弃缓存；parameters 字典可能被原地修改
+    （如 config.parameters['axis'] = 1），因此缓存同时按编译时的 parameters 内容校验。
+    """
+    state = config.__dict__
+    sampler = state.get('_sampler')
+    if sampler is None or state.get('_sampler_parameters') != config.parameters:
+        sampler = compile_sampler(config)
+        object.__setattr__(config, '_sampler', sampler)
+        object.__setattr__(config, '_sampler_parameters', copy.deepcopy(config.parameters))
+    return sampler
+
+def compile_sampler(config: DataGenConfig) -> Sampler:
+    """将配置编译为采样闭包"""
+    rule = config.rule
+    lo = config.min_value
+    hi = config.max_value
+    cycles = config.frequency
+    step_size = config.step_size
+
+    if rule in PERIODIC_RULES:
+        # 周期规则使用相位累加振荡器，本身即为可调用的采样器
+        return PhaseOscillator(config)
+
+    if rule == DataGenRule.ODE_SYSTEM:
+        return ODEAxisSampler(config)
+
+    if rule == DataGenRule.CONSTANT:
+        def sample(t, rng=random):
+            return lo
+
+    elif rule == DataGenRule.RANDOM:
+        def sample(t, rng=random):
+            return rng.uniform(lo, hi)
+
+    elif rule == DataGenRule.LINEAR_INCREASE:
+        def sample(t, rng=random):
+            value = lo + step_size * t
+            return hi if value > hi else value
+
+    elif rule == DataGenRule.LINEAR_DECREASE:
+        def sample(t, rng=random):
+            value = hi - step_size * t
+            return lo if value < lo else value
+
+    elif rule == DataGenRule.EXPONENTIAL:
+        span = hi - lo
+        exp = math.exp
+
+        def sample(t, rng=random):
+            try:
+                base = exp(cycles * t)
+                return lo + base / (1 + base) * span
+            except OverflowError:
+                return hi
+
+    elif rule == DataGenRule.LOGARITHMIC:
+        span = hi - lo
+        inv_max_log = 1.0 / math.log(1 + cycles * 100)  # 假设100秒的最大值
+        log = math.log
+
+        def sample(t, rng=random):
+            return lo + min(1.0, log(1 + cycles * t) * inv_max_log) * span
+
+    elif rule == DataGenRule.NOISE:
+        center = (lo + hi) / 2
+        sigma = config.noise_level * (hi - lo) / 6
+
+        def sample(t, rng=random):
+            return rng.gauss(center, sigma)
+
+    elif rule == DataGenRule.CUSTOM_FUNCTION and config.custom_function:
+        code = compile_expression(config.custom_function)
+        namespace = SCALAR_NAMESPACE
+
+        def sample(t, rng=random):
+            try:
+                return float(eval(code, namespace, {'t': t, 'time': t, 'random': rng}))
+            except Exception:
+                return lo
+
+    else:
+        def sample(t, rng=random):
+            return lo
+
+    return sample
@@ -0,0 +1,164 @@
+"""
+组件发送调度器
+
+按组件频率维护各自的下一个到期时刻（time.monotonic_ns），用最小堆取出最早到期的组件。
+第 n 个采样的到期时刻为 起点 + n / 频率，按序号计算而非累加周期，长时间运行不漂移。
+发送循环每次唤醒时一次取出全部逾期采样（追赶批量），休眠到下一个到期时刻，
+组件频率不再受全局发送间隔限制。
+"""
+
+import heapq
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+NS_PER_SECOND = 1_000_000_000
+
+@dataclass
+class SchedulerStats:
+    """调度统计
+
+    Attributes:
+        passes: 取出到期采样的次数（有到期采样的唤醒）
+        samples: 到期的采样总数
+        catchup_passes: 一次取出多于一个采样的组件批次数
+        skipped: 超过 max_catchup 被跳过的采样数
+        max_lag_ns: 到期采样被取出时的最大延迟（纳秒）
+    """
+    passes: int = 0
+    samples: int = 0
+    catchup_passes: int = 0
+    skipped: int = 0
+    max_lag_ns: int = 0
+
+class _Entry:
+    """单个组件的调度状态"""
+    __slots__ = ('frequency', 'origin_ns', 'index', 'deadline_ns')
+
+    def __init__(self, frequency: float, origin_ns: int):
+        self.frequency = frequency
+        self.origin_ns = origin_ns
+        self.index = 0  # 下一个待发送采样的序号
+        self.deadline_ns = origin_ns
+
+    def deadline(self, index: int) -> int:
+        return self.origin_ns + int(index * NS_PER_SECOND / self.frequency)
+
+    def last_due(self, now_ns: int) -> int:
+        """截至 now_ns 已到期的最大采样序号"""
+        return int((now_ns - self.origin_ns) * self.frequency / NS_PER_SECOND)
+
+class ComponentScheduler:
+    """基于最小堆的多频率调度器
+
+    Args:
+        clock_ns: 纳秒时钟（默认 time.monotonic_ns）
+        max_catchup: 单个组件一次最多追赶的采样数，超出部分跳过并计入 stats.skipped；
+            None 表示全部补发
+    """
+
+    def __init__(self, clock_ns: Callable[[], int] = time.monotonic_ns,
+                 max_catchup: Optional[int] = None):
+        if max_catchup is not None and max_catchup < 1:
+            raise ValueError(f"最大追赶采样数必须大于0: {max_catchup}")
+        self.clock_ns = clock_ns
+        self.max_catchup = max_catchup
+        self.stats = SchedulerStats()
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._sequence = 0  # 到期时刻相同时按加入顺序出堆，且避免比较 key
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def add(self, key: Hashable, frequency: float, start_ns: Optional[int] = None):
+        """加入组件（已存在则按新频率从 start_ns 重新计时），第一个采样在 start_ns 立即到期"""
+        if frequency <= 0:
+            raise ValueError(f"组件频率必须大于0: {frequency}")
+        entry = _Entry(frequency, self.clock_ns() if start_ns is None else start_ns)
+        self._entries[key] = entry
+        self._push(key, entry)
+
+    def remove(self, key: Hashable):
+        """移除组件（堆中的旧条目在出堆时丢弃）"""
+        self._entries.pop(key, None)
+
+    def sync(self, frequencies: Dict[Hashable, float], start_ns: Optional[int] = None):
+        """与 {key: 频率} 同步：加入新组件、移除不在其中的组件、频率变化的组件重新计时，
+        频率不大于0的组件视为不发送"""
+        for key in [key for key in self._entries if frequencies.get(key, 0) <= 0]:
+            self.remove(key)
+        for key, frequency in frequencies.items():
+            if frequency <= 0:
+                continue
+            entry = self._entries.get(key)
+            if entry is None or entry.frequency != frequency:
+                self.add(key, frequency, start_ns)
+
+    def clear(self):
+        self._entries.clear()
+        self._heap.clear()
+
+    def _push(self, key: Hashable, entry: _Entry):
+        self._sequence += 1
+        heapq.heappush(self._heap, (entry.deadline_ns, self._sequence, key))
+
+    def _is_current(self, deadline_ns: int, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry.deadline_ns == deadline_ns
+
+    def next_deadline(self) -> Optional[int]:
+        """最早的到期时刻（纳秒），没有组件时返回 None"""
+        heap = self._heap
+        while heap and not self._is_current(heap[0][0], heap[0][2]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def time_until_next(self, now_ns: Optional[int] = None) -> Optional[float]:
+        """距最早到期时刻的秒数（已逾期为0），没有组件时返回 None"""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return None
+        if now_ns is None:
+            now_ns = self.clock_ns()
+        return max(0, deadline - now_ns) / NS_PER_SECOND
+
+    def recent_deadlines(self, key: Hashable, count: int) -> List[int]:
+        """组件最近取出的 count 个采样各自的到期时刻（纳秒），用于按到期时刻生成补发的采样"""
+        entry = self._entries[key]
+        return [entry.deadline(index) for index in range(entry.index - count, entry.index)]
+
+    def due(self, now_ns: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """取出截至 now_ns 的全部逾期采样
+
+        Returns:
+            [(key, 采样数)]，按最早逾期时刻排序；同一组件的多个逾期采样合并为一项
+        """
+        if now_ns is None:
+            now_ns = self.clock_ns()
+        heap = self._heap
+        result = []
+        while heap and heap[0][0] <= now_ns:
+            deadline, _, key = heapq.heappop(heap)
+            if not self._is_current(deadline, key):
+                continue
+            entry = self._entries[key]
+            last = max(entry.index, entry.last_due(now_ns))
+            count = last - entry.index + 1
+            self.stats.max_lag_ns = max(self.stats.max_lag_ns, now_ns - deadline)
+            if self.max_catchup is not None and count > self.max_catchup:
+                self.stats.skipped += count - self.max_catchup
+                count = self.max_catchup
+            if count > 1:
+                self.stats.catchup_passes += 1
+            self.stats.samples += count
+            entry.index = last + 1
+            entry.deadline_ns = entry.deadline(entry.index)
+            self._push(key, entry)
+            result.append((key, count))
+        if result:
+            self.stats.passes += 1
+        return result
@@ -8,6 +8,8 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Any
 from enum import Enum
 
+from .expressions import validate_expression
+
 class ComponentType(Enum):
     """支持的可视化组件类型"""
     ACCELEROMETER = "accelerometer"
@@ -32,6 +34,9 @@ class CommType(Enum):
     TCP_SERVER = "tcp_server"
     UDP = "udp"
     UDP_MULTICAST = "udp_multicast"
+    NULL = "null"  # 丢弃数据，测量生成吞吐上限
+    FILE = "file"  # 写入文件
+    PIPE = "pipe"  # 写入标准输出
     BLUETOOTH_LE = "bluetooth_le"  # 预留
     AUDIO = "audio"  # 预留
     MODBUS = "modbus"  # 预留
@@ -52,6 +57,37 @@ class DataGenRule(Enum):
     LOGARITHMIC = "logarithmic"
     NOISE = "noise"
     CUSTOM_FUNCTION = "custom_function"
+    ODE_SYSTEM = "ode_system"  # 常微分方程系统（洛伦兹吸引子等），由 parameters 指定系统和维度
+
+class ClockMode(Enum):
+    """数据生成时钟模式"""
+    WALL = "wall"            # 墙上时钟 time.time()
+    MONOTONIC = "monotonic"  # 单调时钟 time.monotonic()
+    VIRTUAL = "virtual"      # 虚拟时钟，按采样序号推进，可快于实时
+
+class FrameFormat(Enum):
+    """数据帧编码格式"""
+    TEXT = "text"      # 文本 CSV 帧 $a,b,c;
+    BINARY = "binary"  # struct 打包的二进制帧
+
+class DecoderMethod(Enum):
+    """帧有效载荷编码方式（与插件端 ProjectTypes.ts 的 DecoderMethod 取值一致）"""
+    PLAIN_TEXT = 0
+    HEXADECIMAL = 1
+    BASE64 = 2
+
+class ChecksumAlgorithm(Enum):
+    """帧校验和算法（与插件端 Checksum.ts 的算法名称一致）"""
+    NONE = ""
+    CRC8 = "CRC-8"
+    CRC16 = "CRC-16"
+    CRC32 = "CRC-32"
+    MD5 = "MD5"
+    SHA1 = "SHA-1"
+    SHA256 = "SHA-256"
+    XOR = "XOR"
+    FLETCHER16 = "Fletcher-16"
+    FLETCHER32 = "Fletcher-32"
 
 @dataclass
 class DataGenConfig:
@@ -67,6 +103,42 @@ class DataGenConfig:
     custom_function: str = ""
     duration: float = 0.0  # 0表示无限
     parameters: Dict[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        """在配置阶段校验自定义函数表达式"""
+        if self.rule == DataGenRule.CUSTOM_FUNCTION and self.custom_function:
+            validate_expression(self.custom_function)
+    
+    def __setattr__(self, name, value):
+        """修改配置字段时重新校验表达式，并使已编译的采样器失效"""
+        if name in ('rule', 'custom_function') and 'custom_function' in self.__dict__:
+            rule = value if name == 'rule' else self.rule
+            expression = value if name == 'custom_function' else self.custom_function
+            if rule == DataGenRule.CUSTOM_FUNCTION and expression:
+                validate_expression(expression)
+        object.__setattr__(self, name, value)
+        if not name.startswith('_'):
+            self.__dict__.pop('_sampler', None)
+    
+    def __getstate__(self):
+        """复制/序列化时不携带采样器闭包"""
+        state = self.__dict__.copy()
+        state.pop('_sampler', None)
+        state.pop('_sampler_parameters', None)
+        return state
+
+@dataclass
+class BinaryFrameConfig:
+    """二进制帧配置
+    
+    value_types 按数据集顺序指定数值类型（int8/uint8/int16/uint16/int32/uint32/float32/float64），
+    数量不足时沿用最后一个类型，为空时全部为 float32。整数类型按 scales 缩放后取整并饱和。
+    """
+    value_types: List[str] = field(default_factory=list)
+    scales: List[float] = field(default_factory=list)  # 缺省为1.0
+    start_delimiter: bytes = b"$"
+    end_delimiter: bytes = b";"
+    byte_order: str = "<"  # '<' 小端，'>' 大端
 
 @dataclass
 class ComponentConfig:
@@ -78,6 +150,10 @@ class ComponentConfig:
     datasets: List[Dict[str, Any]] = field(default_factory=list)
     widget_config: Dict[str, Any] = field(default_factory=dict)
     data_generation: List[DataGenConfig] = field(default_factory=list)
+    frame_format: FrameFormat = FrameFormat.TEXT
+    binary_frame: BinaryFrameConfig = field(default_factory=BinaryFrameConfig)
+    checksum: ChecksumAlgorithm = ChecksumAlgorithm.NONE  # 校验和紧跟在帧结束分隔符之后
+    decoder: DecoderMethod = DecoderMethod.PLAIN_TEXT  # 有效载荷在线路上的编码，分隔符保持原样
 
 @dataclass
 class CommConfig:
@@ -89,12 +165,27 @@ class CommConfig:
     databits: int = 8
     parity: str = "N"
     stopbits: int = 1
+    # 虚拟串口：创建 pty 设备对代替硬件串口（仅 Linux/macOS），可按线路参数模拟波特率
+    virtual_serial: bool = False
+    emulate_baudrate: bool = True
     # Network配置
     host: str = "127.0.0.1"
     tcp_port: int = 8080
     udp_local_port: int = 12345
     udp_remote_port: int = 12346
+    # 文件输出配置
+    file_path: str = "serial_studio_output.dat"
+    # TCP服务器多客户端广播：持续接受连接，每个客户端独立的有界发送缓冲区
+    tcp_multi_client: bool = False
+    client_buffer_size: int = 65536
+    slow_client_policy: str = "drop"  # 缓冲区溢出时: drop-断开客户端, skip-跳过该帧
     # 通用配置
     auto_reconnect: bool = True
     timeout: float = 1.0
-    buffer_size: int = 4096
\ No newline at end of file
+    buffer_size: int = 4096
+    # 写合并：帧先进入缓冲区，累计达到 buffer_size 字节或等待超过 coalesce_latency 秒时一次写出
+    write_coalescing: bool = False
+    coalesce_latency: float = 0.005
+    # 发送队列：send_data 只入队，由写线程发送，send_queue_size 为队列容量（帧数，0 表示在调用线程中直接发送）
+    send_queue_size: int = 0
+    backpressure: str = "block"  # 队列满时: block-等待, drop_oldest/drop_newest-丢弃, coalesce-每个组件只保留最新帧
\ No newline at end of file
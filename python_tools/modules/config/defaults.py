@@ -153,10 +153,10 @@ class DefaultConfigs:
                 enabled=False,
                 frequency=50.0,
                 data_generation=[
-                    # 洛伦兹吸引子的X,Y,Z坐标
-                    DataGenConfig(DataGenRule.SINE_WAVE, -20, 20, frequency=0.1, amplitude=15),    # X
-                    DataGenConfig(DataGenRule.COSINE_WAVE, -30, 30, frequency=0.12, amplitude=20), # Y
-                    DataGenConfig(DataGenRule.SINE_WAVE, 0, 50, frequency=0.08, amplitude=25)      # Z
+                    # 洛伦兹吸引子的X,Y,Z坐标（RK4积分，三个通道共享同一条轨迹）
+                    DataGenConfig(DataGenRule.ODE_SYSTEM, -20, 20, parameters={'system': 'lorenz', 'axis': 0}),  # X
+                    DataGenConfig(DataGenRule.ODE_SYSTEM, -30, 30, parameters={'system': 'lorenz', 'axis': 1}),  # Y
+                    DataGenConfig(DataGenRule.ODE_SYSTEM, 0, 50, parameters={'system': 'lorenz', 'axis': 2})     # Z
                 ]
             ),
             ComponentConfig(
@@ -0,0 +1,90 @@
+"""
+自定义函数表达式模块
+
+对 CUSTOM_FUNCTION 表达式进行一次性解析、AST白名单校验和编译，
+编译结果按表达式文本进行LRU缓存。
+"""
+
+import ast
+import math
+from functools import lru_cache
+from types import CodeType
+
+# 表达式中允许引用的名称
+ALLOWED_NAMES = frozenset({
+    'math', 'random', 'time', 't',
+    'sin', 'cos', 'tan', 'exp', 'log', 'sqrt', 'pi', 'e',
+    'abs', 'min', 'max', 'pow', 'round'
+})
+
+# 允许通过 random. 调用的抽样函数（不含 seed/setstate/getstate 等会改变随机流状态的函数）
+RANDOM_ATTRIBUTES = frozenset({
+    'random', 'uniform', 'gauss', 'normalvariate', 'lognormvariate',
+    'expovariate', 'triangular', 'randint'
+})
+
+# 允许通过属性访问的模块及其属性（如 math.sin、random.random）
+ALLOWED_ATTRIBUTES = {
+    'math': frozenset(name for name in dir(math) if not name.startswith('_')),
+    'random': RANDOM_ATTRIBUTES
+}
+
+# 允许出现的AST节点类型
+ALLOWED_NODES = (
+    ast.Expression, ast.Load,
+    ast.Constant, ast.Name, ast.Attribute, ast.Call,
+    ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub, ast.Not, ast.And, ast.Or,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE
+)
+
+# 编译缓存容量
+EXPRESSION_CACHE_SIZE = 256
+
+class ExpressionError(ValueError):
+    """自定义函数表达式不合法"""
+
+def _check_node(node: ast.AST, source: str):
+    """校验单个AST节点是否在白名单内"""
+    if not isinstance(node, ALLOWED_NODES):
+        raise ExpressionError(f"表达式包含不允许的语法 {type(node).__name__}: {source}")
+
+    if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+        raise ExpressionError(f"表达式只允许数值常量: {source}")
+
+    if isinstance(node, ast.Name) and node.id not in ALLOWED_NAMES:
+        raise ExpressionError(f"表达式引用了未知名称 '{node.id}': {source}")
+
+    if isinstance(node, ast.Attribute):
+        if not isinstance(node.value, ast.Name) or node.value.id not in ALLOWED_ATTRIBUTES:
+            raise ExpressionError(f"只允许访问 math/random 模块的属性: {source}")
+        if node.attr not in ALLOWED_ATTRIBUTES[node.value.id]:
+            raise ExpressionError(f"不允许的属性 '{node.value.id}.{node.attr}': {source}")
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(source: str) -> CodeType:
+    """解析、校验并编译表达式
+
+    Args:
+        source: 表达式源码，如 "sin(2*pi*5*t)"
+
+    Returns:
+        可直接传给 eval() 的代码对象
+
+    Raises:
+        ExpressionError: 语法错误或包含白名单以外的名称/节点
+    """
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ExpressionError(f"表达式语法错误: {source} ({e.msg})") from None
+
+    for node in ast.walk(tree):
+        _check_node(node, source)
+
+    return compile(tree, '<custom_function>', 'eval')
+
+def validate_expression(source: str):
+    """校验表达式，不合法时抛出 ExpressionError"""
+    compile_expression(source)
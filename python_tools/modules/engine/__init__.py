@@ -0,0 +1,6 @@
+"""
+发送引擎模块
+
+数据生成与发送循环，在独立进程中运行发送循环的引擎（共享内存帧环和统计块），
+以及界面按定时器批量显示的预览缓冲。
+"""
@@ -0,0 +1,67 @@
+"""
+预览缓冲
+
+发送线程每发一帧都调度一次界面更新会淹没 Tk 事件队列。这里发送方只把采样后的帧放入
+固定长度的环（deque(maxlen)，追加和淘汰都是 O(1)），界面用自己的定时器批量取出后一次
+插入文本框。环满时最早的记录被新记录覆盖，发送方永远不会等待界面。
+"""
+
+import time
+from collections import deque
+from typing import Deque, List, Tuple
+
+class PreviewBuffer:
+    """采样预览环（单生产者/单消费者）
+
+    Args:
+        capacity: 环容量（条），界面取出前最多保留的记录数
+        sample_every: 采样间隔，每 N 次 push 保留 1 条，1 表示全部保留
+
+    Attributes:
+        offered: push 的总次数
+        kept: 采样后放入环的记录数
+    """
+
+    def __init__(self, capacity: int = 500, sample_every: int = 1):
+        if capacity <= 0:
+            raise ValueError(f"预览缓冲容量必须大于0: {capacity}")
+        self._entries: Deque[Tuple[float, str]] = deque(maxlen=capacity)
+        self.capacity = capacity
+        self.sample_every = 1
+        self.set_sample_every(sample_every)
+        self.offered = 0
+        self.kept = 0
+        self._drained = 0
+
+    def set_sample_every(self, sample_every: int):
+        if sample_every < 1:
+            raise ValueError(f"采样间隔必须大于等于1: {sample_every}")
+        self.sample_every = sample_every
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def overwritten(self) -> int:
+        """界面取出前被新记录覆盖的记录数"""
+        return self.kept - self._drained - len(self._entries)
+
+    def push(self, text: str) -> bool:
+        """放入一条记录（生产者调用），返回是否被采样保留"""
+        self.offered += 1
+        if self.offered % self.sample_every:
+            return False
+        self._entries.append((time.time(), text))
+        self.kept += 1
+        return True
+
+    def drain(self) -> List[Tuple[float, str]]:
+        """取出全部记录（消费者调用），每条为 (放入时刻 time.time(), 文本)"""
+        entries = self._entries
+        # 只取调用时已有的记录，生产者同时追加的留到下一次
+        drained = [entries.popleft() for _ in range(len(entries))]
+        self._drained += len(drained)
+        return drained
+
+    def clear(self):
+        self.drain()
@@ -0,0 +1,336 @@
+"""
+独立进程发送引擎
+
+发送循环与通讯连接运行在子进程中，有独立的 GIL 和 CPU 核心，界面主循环的重绘、
+预览和日志不再与发送线程争抢解释器。父子进程之间：
+- 控制管道（multiprocessing.Pipe）：父进程发送命令，子进程回送连接状态和日志事件
+- 帧环（SharedFrameRing）：子进程按预览采样间隔写入已发送帧的预览文本，父进程按需读取，读得慢时丢弃
+- 统计块（SharedStats）：子进程周期性发布发送计数、队列深度等固定字段
+
+子进程使用 spawn 方式启动，不继承父进程的 Tk 和后台线程。
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple, Union
+
+from ..communication.manager import CommunicationManager
+from ..components.factory import ComponentGeneratorFactory
+from ..config.data_types import CommConfig, ComponentConfig
+from .send_loop import SendLoop, frame_preview
+from .shared import SharedFrameRing, SharedStats
+
+# 引擎状态
+ENGINE_STARTING = 0
+ENGINE_IDLE = 1
+ENGINE_CONNECTED = 2
+ENGINE_SENDING = 3
+
+# 统计块布局
+ENGINE_STATS_FIELDS = ('pid', 'state', 'sent', 'errors', 'queue_depth', 'queue_dropped',
+                       'started_ns', 'updated_ns')
+
+# 子进程发布统计的周期（秒）和汇总发送失败日志的周期（秒）
+STATS_PERIOD = 0.05
+FAILURE_LOG_PERIOD = 1.0
+
+# 控制命令
+CMD_CONNECT = 'connect'
+CMD_DISCONNECT = 'disconnect'
+CMD_START = 'start'
+CMD_STOP = 'stop'
+CMD_COMPONENTS = 'components'
+CMD_RESET_STATS = 'reset_stats'
+CMD_PREVIEW_SAMPLE = 'preview_sample'
+CMD_SHUTDOWN = 'shutdown'
+
+# 子进程事件
+EVENT_CONNECTED = 'connected'        # (事件, 是否成功, 说明)
+EVENT_DISCONNECTED = 'disconnected'  # (事件,)
+EVENT_SENDING = 'sending'            # (事件, 是否在发送, 错误信息或 None)
+EVENT_LOG = 'log'                    # (事件, 消息, 级别)
+
+@dataclass
+class EngineStats:
+    """引擎统计快照
+
+    Attributes:
+        pid: 子进程 PID
+        state: 引擎状态（ENGINE_*）
+        sent: 发送成功的帧数
+        errors: 发送失败的次数
+        queue_depth: 发送队列中排队的帧数（未启用发送队列时为0）
+        queue_dropped: 发送队列丢弃的帧数
+        preview_dropped: 帧环已满被丢弃的预览记录数
+        elapsed: 本次发送已持续的时间（秒）
+    """
+    pid: int = 0
+    state: int = ENGINE_STARTING
+    sent: int = 0
+    errors: int = 0
+    queue_depth: int = 0
+    queue_dropped: int = 0
+    preview_dropped: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """平均发送速率（帧/秒）"""
+        return self.sent / self.elapsed if self.elapsed > 0 else 0.0
+
+class _Engine:
+    """子进程中的引擎：主线程处理控制命令并发布统计，发送循环在单独的线程中运行"""
+
+    def __init__(self, conn, ring: SharedFrameRing, stats: SharedStats):
+        self.conn = conn
+        self.ring = ring
+        self.stats = stats
+        self.manager = CommunicationManager()
+        self.factory = ComponentGeneratorFactory()
+        self.comm_config: Optional[CommConfig] = None
+        self.loop: Optional[SendLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.state = ENGINE_IDLE
+        self._send_lock = threading.Lock()
+        self._failures = 0
+        self._last_failure = ''
+        self._updated_ns = 0
+        self.preview_every = 1  # 每 N 个发送成功的帧写入 1 条预览
+        self._preview_offered = 0
+        self._finished: Optional[Tuple[Optional[str]]] = None  # 发送线程结束时的 (错误信息,)
+
+    def emit(self, *event: Any):
+        # 发送线程的日志和主线程的事件共用一个管道
+        with self._send_lock:
+            try:
+                self.conn.send(event)
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+
+    def serve(self):
+        last_failure_log = time.monotonic()
+        while True:
+            try:
+                if self.conn.poll(STATS_PERIOD):
+                    command, *args = self.conn.recv()
+                    if command == CMD_SHUTDOWN:
+                        break
+                    self.handle(command, *args)
+            except (EOFError, OSError):
+                break  # 父进程已退出
+            self.publish()
+            finished, self._finished = self._finished, None
+            if finished:
+                # 发送结束事件在最终统计发布之后送出，父进程收到事件时统计已是最终值
+                self.emit(EVENT_SENDING, False, *finished)
+            if self._failures and time.monotonic() - last_failure_log >= FAILURE_LOG_PERIOD:
+                # 发送失败汇总后再上报，避免高速率下日志淹没控制管道
+                self.emit(EVENT_LOG, f"发送失败 {self._failures} 次，最近一帧: {self._last_failure}", "WARNING")
+                self._failures = 0
+                last_failure_log = time.monotonic()
+        self.stop_sending()
+        self.manager.disconnect()
+
+    def handle(self, command: str, *args):
+        if command == CMD_CONNECT:
+            self.comm_config = args[0]
+            ok = self.manager.connect(self.comm_config)
+            detail = getattr(self.manager.active_connection, 'port', '') if ok else ''
+            self.state = ENGINE_CONNECTED if ok else ENGINE_IDLE
+            self.emit(EVENT_CONNECTED, ok, detail)
+        elif command == CMD_DISCONNECT:
+            self.stop_sending()
+            sink_stats = self.manager.get_sink_stats()
+            self.manager.disconnect()
+            if sink_stats:
+                self.emit(EVENT_LOG, f"输出吞吐: {sink_stats.bytes_per_second / 1024:.1f} KB/s, "
+                                     f"{sink_stats.frames_per_second:.0f} 帧/秒（共 {sink_stats.frames} 帧）", "INFO")
+            self.state = ENGINE_IDLE
+            self.emit(EVENT_DISCONNECTED)
+        elif command == CMD_START:
+            self.start_sending(*args)
+        elif command == CMD_STOP:
+            self.stop_sending()
+        elif command == CMD_COMPONENTS:
+            if self.loop:
+                self.loop.set_components(args[0])
+        elif command == CMD_RESET_STATS:
+            if self.loop:
+                self.loop.reset_stats()
+        elif command == CMD_PREVIEW_SAMPLE:
+            self.preview_every = args[0]
+
+    def start_sending(self, components: List[ComponentConfig], interval: float, duration: float,
+                      merged: bool, spin: float):
+        if self.thread and self.thread.is_alive():
+            return
+        if not self.manager.is_connected:
+            self.emit(EVENT_SENDING, False, "未连接")
+            return
+        self.loop = SendLoop(self.factory, self.manager, self.comm_config, components,
+                             interval=interval, duration=duration, merged=merged, spin=spin,
+                             on_frame=self._on_frame, on_log=lambda message, level: self.emit(EVENT_LOG, message, level))
+        self._finished = None  # 上一次发送尚未上报的结束事件已过时
+        self.thread = threading.Thread(target=self._run_loop, name="engine-send-loop", daemon=True)
+        self.state = ENGINE_SENDING
+        self.thread.start()
+        self.emit(EVENT_SENDING, True, None)
+
+    def _run_loop(self):
+        error = None
+        try:
+            self.loop.run()
+        except Exception as e:
+            error = str(e)
+        if self.manager.is_connected:
+            self.state = ENGINE_CONNECTED
+        self._finished = (error,)
+
+    def stop_sending(self):
+        if self.loop:
+            self.loop.stop()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def _on_frame(self, label: str, frame_data: Union[str, bytes], ok: bool):
+        if ok:
+            # 只有被采样的帧才生成预览文本并写入帧环
+            self._preview_offered += 1
+            if self._preview_offered % self.preview_every == 0:
+                self.ring.write(f"[{label}] {frame_preview(frame_data)}".encode('utf-8'))
+        else:
+            self._failures += 1
+            self._last_failure = frame_preview(frame_data)
+
+    def publish(self):
+        loop = self.loop
+        # 停止发送后统计时刻不再前进，速率保持为本次发送的平均值
+        if self.state == ENGINE_SENDING:
+            self._updated_ns = time.monotonic_ns()
+        queue_stats = self.manager.get_queue_stats()
+        self.stats.publish(
+            state=self.state,
+            sent=loop.sent_count if loop else 0,
+            errors=loop.error_count if loop else 0,
+            queue_depth=queue_stats.depth if queue_stats else 0,
+            queue_dropped=queue_stats.dropped if queue_stats else 0,
+            started_ns=int(loop.start_time * 1e9) if loop else 0,
+            updated_ns=self._updated_ns
+        )
+
+def _engine_main(conn, ring_name: str, stats_name: str):
+    """子进程入口"""
+    ring = SharedFrameRing(name=ring_name)
+    stats = SharedStats(ENGINE_STATS_FIELDS, name=stats_name)
+    stats.publish(pid=os.getpid(), state=ENGINE_IDLE)
+    try:
+        _Engine(conn, ring, stats).serve()
+    finally:
+        stats.close()
+        ring.close()
+        conn.close()
+
+class EngineProcess:
+    """独立进程发送引擎（父进程侧句柄）
+
+    命令都是异步的：方法只把命令写入控制管道，结果通过 poll_events() 返回的事件得知。
+
+    Args:
+        ring_capacity: 预览帧环大小（字节）
+    """
+
+    def __init__(self, ring_capacity: int = 4 * 1024 * 1024):
+        self.ring = SharedFrameRing(ring_capacity)
+        self.stats_block = SharedStats(ENGINE_STATS_FIELDS)
+        context = multiprocessing.get_context('spawn')
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_engine_main, args=(child_conn, self.ring.name, self.stats_block.name),
+                                        name="serial-studio-engine", daemon=True)
+        self._child_conn = child_conn
+
+    @property
+    def alive(self) -> bool:
+        return self._process.is_alive()
+
+    def start(self):
+        """启动子进程"""
+        self._process.start()
+        self._child_conn.close()  # 子进程持有自己的一端
+
+    def _command(self, *command: Any) -> bool:
+        try:
+            self._conn.send(command)
+            return True
+        except (BrokenPipeError, EOFError, OSError):
+            return False
+
+    def connect(self, config: CommConfig) -> bool:
+        return self._command(CMD_CONNECT, config)
+
+    def disconnect(self) -> bool:
+        return self._command(CMD_DISCONNECT)
+
+    def start_sending(self, components: List[ComponentConfig], interval: float = 0.1,
+                      duration: float = 0.0, merged: bool = False, spin: float = 0.0) -> bool:
+        return self._command(CMD_START, components, interval, duration, merged, spin)
+
+    def stop_sending(self) -> bool:
+        return self._command(CMD_STOP)
+
+    def set_components(self, components: List[ComponentConfig]) -> bool:
+        """更新子进程中的组件列表（组件配置被复制到子进程）"""
+        return self._command(CMD_COMPONENTS, components)
+
+    def reset_stats(self) -> bool:
+        return self._command(CMD_RESET_STATS)
+
+    def set_preview_sample(self, sample_every: int) -> bool:
+        """设置预览采样间隔：子进程每 N 个发送成功的帧只向帧环写入 1 条"""
+        if sample_every < 1:
+            raise ValueError(f"采样间隔必须大于等于1: {sample_every}")
+        return self._command(CMD_PREVIEW_SAMPLE, sample_every)
+
+    def poll_events(self) -> List[Tuple]:
+        """取出子进程回送的全部事件（不阻塞）"""
+        events = []
+        try:
+            while self._conn.poll():
+                events.append(self._conn.recv())
+        except (EOFError, OSError):
+            pass
+        return events
+
+    def read_frames(self, max_records: Optional[int] = None) -> List[str]:
+        """读取帧环中已发送帧的预览文本"""
+        return [record.decode('utf-8', errors='replace') for record in self.ring.read(max_records)]
+
+    def stats(self) -> EngineStats:
+        values = self.stats_block.snapshot()
+        started = values['started_ns']
+        elapsed = (values['updated_ns'] - started) / 1e9 if started else 0.0
+        return EngineStats(pid=values['pid'], state=values['state'], sent=values['sent'],
+                           errors=values['errors'], queue_depth=values['queue_depth'],
+                           queue_dropped=values['queue_dropped'], preview_dropped=self.ring.dropped,
+                           elapsed=max(0.0, elapsed))
+
+    def close(self, timeout: float = 2.0) -> List[Tuple]:
+        """停止发送、断开连接并结束子进程，返回子进程退出前回送的事件"""
+        events = []
+        if self._process.is_alive():
+            self._command(CMD_SHUTDOWN)
+            deadline = time.monotonic() + timeout
+            while self._process.is_alive() and time.monotonic() < deadline:
+                events += self.poll_events()
+                self._process.join(0.05)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join()
+        events += self.poll_events()
+        self._conn.close()
+        self.stats_block.close()
+        self.ring.close()
+        return events
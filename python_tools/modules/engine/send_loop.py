@@ -0,0 +1,230 @@
+"""
+数据发送循环
+
+按组件频率调度生成数据并通过通讯管理器发送：各组件的到期时刻由 ComponentScheduler
+管理，逾期的采样在一轮中一次补发（各采样按自身的到期时刻生成，时钟每个采样时隙前进一步），
+休眠使用 DeadlineSleeper 按绝对时刻唤醒。
+各组件的帧按其帧格式（文本/二进制）、载荷编码和校验和成帧；合并帧为文本格式。
+界面的发送线程和独立进程引擎共用这一实现，通过回调输出预览和日志。
+"""
+
+import time
+from dataclasses import fields
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from ..communication.manager import CommunicationManager
+from ..components.factory import ComponentGeneratorFactory
+from ..components.pacing import DeadlineSleeper, PacingReport, PacingStats
+from ..components.scheduler import ComponentScheduler
+from ..config.data_types import CommConfig, ComponentConfig
+from ..protocol.merged import MergedFrameBuilder
+
+# 合并帧的预览标签
+MERGED_FRAME_LABEL = "合并帧"
+
+FrameCallback = Callable[[str, Union[str, bytes], bool], None]
+LogCallback = Callable[[str, str], None]
+
+def frame_preview(data: Union[str, bytes]) -> str:
+    """帧的单行预览文本：文本帧去掉帧间换行，二进制帧显示为十六进制"""
+    if isinstance(data, str):
+        return data
+    try:
+        text = data.decode('utf-8').rstrip('\n').replace('\n', ' ')
+    except UnicodeDecodeError:
+        return data.hex(' ')
+    return text if text.isprintable() else data.hex(' ')
+
+def _update_component(target: ComponentConfig, source: ComponentConfig):
+    """把 source 的配置就地写入 target，相同的通道生成配置保留 target 中的原对象"""
+    channels = target.data_generation
+    data_generation = [channels[i] if i < len(channels) and channels[i] == config else config
+                       for i, config in enumerate(source.data_generation)]
+    for item in fields(source):
+        setattr(target, item.name, getattr(source, item.name))
+    target.data_generation = data_generation
+
+class SendLoop:
+    """按组件频率生成并发送数据
+
+    Args:
+        factory: 组件数据生成器工厂
+        manager: 已连接的通讯管理器
+        comm_config: 通讯配置
+        components: 组件配置列表（只发送启用的组件）
+        interval: 最长休眠时间（秒），没有组件到期时也按此间隔检查停止和持续时间
+        duration: 持续时间（秒），0 表示一直发送到 stop()
+        merged: 是否把同一轮到期的组件拼成合并帧
+        spin: 到期前忙等的时长（秒），0 表示不忙等
+        on_frame: 每次发送后回调 on_frame(标签, 帧数据, 是否成功)，在发送线程中调用；
+            帧数据为线路字节（合并帧为文本），可用 frame_preview() 转为预览文本
+        on_log: 日志回调 on_log(消息, 级别)
+
+    Attributes:
+        sent_count: 发送成功的帧数
+        error_count: 发送失败的次数
+        start_time: 开始发送的时刻（time.monotonic）
+    """
+
+    def __init__(self, factory: ComponentGeneratorFactory, manager: CommunicationManager,
+                 comm_config: CommConfig, components: List[ComponentConfig],
+                 interval: float = 0.1, duration: float = 0.0, merged: bool = False,
+                 spin: float = 0.0, on_frame: Optional[FrameCallback] = None,
+                 on_log: Optional[LogCallback] = None):
+        if interval <= 0:
+            raise ValueError(f"发送间隔必须大于0: {interval}")
+        self.factory = factory
+        self.manager = manager
+        self.comm_config = comm_config
+        self.interval_ns = round(interval * 1e9)
+        self.duration = duration
+        self.merged = merged
+        self.spin = spin
+        self.on_frame = on_frame
+        self.on_log = on_log
+        self.sent_count = 0
+        self.error_count = 0
+        self.start_time = time.monotonic()
+        self.running = False
+        self._components = list(components)
+        self._components_changed = True
+
+    @property
+    def rate(self) -> float:
+        """平均发送速率（帧/秒）"""
+        elapsed = time.monotonic() - self.start_time
+        return self.sent_count / elapsed if elapsed > 0 else 0.0
+
+    def set_components(self, components: List[ComponentConfig]):
+        """更新组件列表（或通知列表中的组件已修改），下一轮重新同步调度
+
+        与当前组件同名的配置就地合并到原对象中，生成配置未变的通道保留原 DataGenConfig，
+        振荡器相位和 ODE 积分状态不会因编辑其他字段而重置；调度按组件名进行，
+        只有频率变化的组件重新计时。
+        """
+        current = {config.name: config for config in self._components}
+        updated = []
+        for config in components:
+            existing = current.get(config.name)
+            if existing is not None and existing is not config:
+                _update_component(existing, config)
+                config = existing
+            updated.append(config)
+        self._components = updated
+        self._components_changed = True
+
+    def reset_stats(self):
+        self.sent_count = 0
+        self.error_count = 0
+        self.start_time = time.monotonic()
+
+    def stop(self):
+        self.running = False
+
+    def _log(self, message: str, level: str = "INFO"):
+        if self.on_log:
+            self.on_log(message, level)
+
+    def run(self) -> PacingReport:
+        """运行到 stop() 或持续时间结束，返回唤醒节拍统计"""
+        self.running = True
+        self.reset_stats()
+        # 按绝对到期时刻休眠（Linux 上使用 clock_nanosleep），记录唤醒延迟和间隔抖动
+        sleeper = DeadlineSleeper(spin=self.spin)
+        pacing = PacingStats()
+
+        # 合并帧模式：按启用组件分配合并帧中的数据集位置
+        merged_builder = None
+        if self.merged:
+            merged_builder = MergedFrameBuilder()
+            for config in self._components:
+                if config.enabled:
+                    self._add_merged_component(merged_builder, config)
+
+        # 各组件按自身频率调度，组件列表变化时才重新同步
+        scheduler = ComponentScheduler()
+        components: Dict[str, ComponentConfig] = {}
+
+        try:
+            while self.running:
+                if self._components_changed:
+                    self._components_changed = False
+                    components = {c.name: c for c in self._components if c.enabled}
+                    scheduler.sync({key: c.frequency for key, c in components.items()})
+
+                # 取出全部逾期采样，落后的组件在本轮一次补发，每个采样使用自己的到期时刻
+                now_ns = scheduler.clock_ns()
+                now = self.factory.data_generator.clock.now()
+                due = []
+                for key, count in scheduler.due(now_ns):
+                    if key in components:
+                        deadlines = np.asarray(scheduler.recent_deadlines(key, count), dtype=np.float64)
+                        due.append((components[key], now - (now_ns - deadlines) / 1e9))
+                slots = max((len(times) for _, times in due), default=0)
+
+                if merged_builder is not None:
+                    # 合并帧：到期组件更新各自位置后整帧写出，补发的多帧拼接后一次写出
+                    if due:
+                        frames = []
+                        for i in range(slots):
+                            for config, times in due:
+                                if i >= len(times):
+                                    continue
+                                if config.name not in merged_builder.index_map:
+                                    self._add_merged_component(merged_builder, config)
+                                else:
+                                    data = self.factory.generate_component_data(config, times[i])
+                                    merged_builder.update(config.name, data)
+                            frames.append(merged_builder.render())
+                            self.factory.step()
+                        self._send_frame("".join(frames), MERGED_FRAME_LABEL, [c for c, _ in due], len(frames))
+                else:
+                    for config, times in due:
+                        frame_data = self.factory.render_component_frames(config, times)
+                        self._send_frame(frame_data, config.name, [config], len(times))
+                    # 全局时间步进：每个发出的采样时隙前进一步
+                    for _ in range(slots):
+                        self.factory.step()
+
+                # 检查持续时间
+                if self.duration > 0 and time.monotonic() - self.start_time >= self.duration:
+                    break
+
+                # 休眠到下一个到期时刻
+                deadline = scheduler.next_deadline()
+                limit = time.monotonic_ns() + self.interval_ns
+                if deadline is None or deadline > limit:
+                    sleeper.sleep_until(limit)
+                else:
+                    pacing.record(deadline, sleeper.sleep_until(deadline))
+        finally:
+            self.running = False
+            sleeper.close()
+
+        report = pacing.report()
+        if report.ticks > 1:
+            self._log(f"发送定时: 唤醒 {report.achieved_rate:.1f} 次/秒, 间隔抖动 P50 {report.jitter_p50:.0f}µs / "
+                      f"P99 {report.jitter_p99:.0f}µs, 唤醒延迟 P99 {report.lateness_p99:.0f}µs")
+        return report
+
+    def _add_merged_component(self, builder: MergedFrameBuilder, config: ComponentConfig):
+        """将组件加入合并帧，首次生成的数据作为其初始值"""
+        data = self.factory.generate_component_data(config)
+        positions = builder.add_component(config, data)
+        self._log(f"合并帧: {config.name} -> 数据集位置 {positions[0]}-{positions[-1]}"
+                  if positions else f"合并帧: {config.name}")
+
+    def _send_frame(self, frame_data: Union[str, bytes], label: str, components: List[ComponentConfig],
+                    frames: int = 1):
+        """发送一帧（或 frames 帧拼接的数据）并更新统计"""
+        ok = self.manager.send_data(frame_data, self.comm_config, key=label)
+        if ok:
+            self.sent_count += frames
+            for config in components:
+                config._send_count = getattr(config, '_send_count', 0) + frames
+        else:
+            self.error_count += 1
+        if self.on_frame:
+            self.on_frame(label, frame_data, ok)
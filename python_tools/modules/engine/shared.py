@@ -0,0 +1,171 @@
+"""
+进程间共享内存结构
+
+SharedFrameRing: 单生产者/单消费者的变长记录环（multiprocessing.shared_memory）。
+引擎进程写入预览帧，界面进程按自己的节奏读取；空间不足时丢弃新记录并计数，
+写入方永远不会因为界面读得慢而阻塞。读写位置是单调递增的 int64 计数器，
+各自只由一方写入，记录内容先写入、位置后更新，不需要跨进程锁。
+
+SharedStats: 固定布局的 int64 统计块，写入方用序号锁（seqlock）发布，
+读取方在序号为偶数且前后一致时得到一致的快照。
+"""
+
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 帧环头部：写位置、读位置、丢弃记录数、容量（各 int64），之后对齐到 64 字节
+RING_HEADER_SIZE = 64
+RING_WRITE, RING_READ, RING_DROPPED, RING_CAPACITY = range(4)
+RECORD_LENGTH = struct.Struct('<I')
+
+# 统计快照的最大重试次数
+SNAPSHOT_RETRIES = 1000
+
+class SharedFrameRing:
+    """共享内存变长记录环
+
+    Args:
+        capacity: 数据区大小（字节），创建时有效
+        name: 已有共享内存的名称，给出时打开而不创建
+    """
+
+    def __init__(self, capacity: int = 1024 * 1024, name: Optional[str] = None):
+        if name is None:
+            if capacity <= RECORD_LENGTH.size:
+                raise ValueError(f"帧环容量过小: {capacity}")
+            self._shm = shared_memory.SharedMemory(create=True, size=RING_HEADER_SIZE + capacity)
+            self._owner = True
+            self._header = np.ndarray((4,), dtype=np.int64, buffer=self._shm.buf)
+            self._header[:] = 0
+            self._header[RING_CAPACITY] = capacity
+        else:
+            # 引擎子进程与创建方共用资源跟踪器，由创建方 unlink 时注销
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+            self._header = np.ndarray((4,), dtype=np.int64, buffer=self._shm.buf)
+        self.capacity = int(self._header[RING_CAPACITY])
+        self._data = self._shm.buf[RING_HEADER_SIZE:RING_HEADER_SIZE + self.capacity]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def dropped(self) -> int:
+        """因空间不足被丢弃的记录数"""
+        return int(self._header[RING_DROPPED])
+
+    def __len__(self) -> int:
+        """尚未读取的字节数（含记录长度前缀）"""
+        return int(self._header[RING_WRITE] - self._header[RING_READ])
+
+    def _copy_in(self, position: int, data) -> int:
+        offset = position % self.capacity
+        first = min(len(data), self.capacity - offset)
+        self._data[offset:offset + first] = data[:first]
+        if first < len(data):
+            self._data[:len(data) - first] = data[first:]
+        return position + len(data)
+
+    def _copy_out(self, position: int, size: int) -> bytes:
+        offset = position % self.capacity
+        first = min(size, self.capacity - offset)
+        if first == size:
+            return bytes(self._data[offset:offset + size])
+        return bytes(self._data[offset:]) + bytes(self._data[:size - first])
+
+    def write(self, record: bytes) -> bool:
+        """写入一条记录（写入方调用），空间不足时丢弃并返回 False"""
+        header = self._header
+        position = int(header[RING_WRITE])
+        needed = RECORD_LENGTH.size + len(record)
+        if needed > self.capacity - (position - int(header[RING_READ])):
+            header[RING_DROPPED] += 1
+            return False
+        position = self._copy_in(position, RECORD_LENGTH.pack(len(record)))
+        position = self._copy_in(position, memoryview(record))
+        # 内容写完后再发布写位置
+        header[RING_WRITE] = position
+        return True
+
+    def read(self, max_records: Optional[int] = None) -> List[bytes]:
+        """读取已写入的记录（读取方调用）"""
+        header = self._header
+        position = int(header[RING_READ])
+        end = int(header[RING_WRITE])
+        records = []
+        while position < end and (max_records is None or len(records) < max_records):
+            size, = RECORD_LENGTH.unpack(self._copy_out(position, RECORD_LENGTH.size))
+            position += RECORD_LENGTH.size
+            records.append(self._copy_out(position, size))
+            position += size
+        header[RING_READ] = position
+        return records
+
+    def close(self):
+        """释放映射，创建方同时删除共享内存"""
+        if self._shm is None:
+            return
+        self._data.release()
+        self._header = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
+
+class SharedStats:
+    """固定布局的共享统计块
+
+    Args:
+        fields: 字段名列表，每个字段一个 int64
+        name: 已有共享内存的名称，给出时打开而不创建
+    """
+
+    def __init__(self, fields: Sequence[str], name: Optional[str] = None):
+        self.fields = tuple(fields)
+        self._index = {field: i + 1 for i, field in enumerate(self.fields)}  # 0 号为序号
+        size = (len(self.fields) + 1) * 8
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._values = np.ndarray((len(self.fields) + 1,), dtype=np.int64, buffer=self._shm.buf)
+        if self._owner:
+            self._values[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def publish(self, **values: int):
+        """更新字段（写入方调用，只允许一个写入方）"""
+        sequence = self._values
+        sequence[0] += 1  # 奇数：写入中
+        for field, value in values.items():
+            self._values[self._index[field]] = value
+        sequence[0] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        """读取一致的快照"""
+        values = self._values
+        # 写入方在发布中途退出时序号停在奇数，重试有限次后返回当前值
+        for _ in range(SNAPSHOT_RETRIES):
+            before = int(values[0])
+            copy = values.copy()
+            if before % 2 == 0 and int(values[0]) == before:
+                break
+        return {field: int(copy[i]) for field, i in self._index.items()}
+
+    def close(self):
+        if self._shm is None:
+            return
+        self._values = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+        self._shm = None
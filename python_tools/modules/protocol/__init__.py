@@ -0,0 +1,5 @@
+"""
+数据帧协议模块
+
+包含数据帧的格式化编码实现。
+"""
@@ -0,0 +1,214 @@
+"""
+二进制数据帧编码
+
+按组件的 BinaryFrameConfig 编译出固定布局的帧结构：起始分隔符 + 各数据集数值 + 结束分隔符
+（+ 可选校验和），有效载荷可按十六进制/Base64 编码。单帧使用预编译的 struct.Struct 打包，
+整块数据使用 NumPy 结构化数组一次转换。与文本 CSV 相比每个数值只占 1~8 字节，
+同样波特率下可以传输更多采样点。
+"""
+
+import struct
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..config.data_types import BinaryFrameConfig, ChecksumAlgorithm, ComponentConfig, DecoderMethod
+from .checksum import calculate_block, checksum_length, get_checksum_function, parse_algorithm
+from .encoders import WireStats, create_encoder
+
+# 数值类型 -> struct 格式字符
+VALUE_TYPES: Dict[str, str] = {
+    'int8': 'b',
+    'uint8': 'B',
+    'int16': 'h',
+    'uint16': 'H',
+    'int32': 'i',
+    'uint32': 'I',
+    'float32': 'f',
+    'float64': 'd'
+}
+
+# 未指定类型时使用的数值类型
+DEFAULT_VALUE_TYPE = 'float32'
+
+class BinaryFrameLayout:
+    """编译后的二进制帧布局
+
+    Attributes:
+        value_types: 各通道数值类型
+        scales: 各通道缩放系数（打包前 value * scale）
+        frame_size: 单帧线路字节数
+        payload_size: 编码前的有效载荷（数值部分）字节数
+        struct: 有效载荷 struct.Struct
+        payload_dtype: 整块打包有效载荷使用的 NumPy 结构化类型
+        checksum: 校验和算法，启用时校验和紧跟在结束分隔符之后，覆盖（编码后的）有效载荷
+        encoder: 有效载荷线路编码器
+        stats: 线路字节统计
+    """
+
+    def __init__(self, value_types: Sequence[str], scales: Sequence[float] = (),
+                 start: bytes = b'$', end: bytes = b';', byte_order: str = '<',
+                 checksum: Union[ChecksumAlgorithm, str] = ChecksumAlgorithm.NONE,
+                 decoder: DecoderMethod = DecoderMethod.PLAIN_TEXT):
+        for value_type in value_types:
+            if value_type not in VALUE_TYPES:
+                raise ValueError(f"不支持的二进制数值类型: {value_type}，可选: {list(VALUE_TYPES)}")
+        if byte_order not in ('<', '>'):
+            raise ValueError(f"不支持的字节序: {byte_order}")
+
+        self.value_types: List[str] = list(value_types)
+        self.channels = len(self.value_types)
+        self.scales = np.array([scales[min(i, len(scales) - 1)] if scales else 1.0
+                                for i in range(self.channels)], dtype=np.float64)
+        self.start = bytes(start)
+        self.end = bytes(end)
+        self.byte_order = byte_order
+        self.checksum = parse_algorithm(checksum)
+        self.checksum_size = checksum_length(self.checksum)
+        self._checksum = get_checksum_function(self.checksum)
+        self.encoder = create_encoder(decoder)
+        self.stats = WireStats()
+
+        codes = ''.join(VALUE_TYPES[value_type] for value_type in self.value_types)
+        self.struct = struct.Struct(byte_order + codes)
+        self.payload_size = self.struct.size
+        self.payload_dtype = np.dtype([(f'v{i}', byte_order + VALUE_TYPES[value_type])
+                                       for i, value_type in enumerate(self.value_types)])
+
+        # 编码后的有效载荷在帧内的字节范围
+        self.payload_start = len(self.start)
+        self.payload_end = self.payload_start + self.encoder.encoded_size(self.payload_size)
+        self.frame_size = self.payload_end + len(self.end) + self.checksum_size
+
+        # 整数类型的饱和范围
+        self._limits = [
+            (np.iinfo(self.payload_dtype[i]).min, np.iinfo(self.payload_dtype[i]).max)
+            if np.issubdtype(self.payload_dtype[i], np.integer) else None
+            for i in range(self.channels)
+        ]
+
+    def estimate_size(self, rows: int) -> int:
+        """rows 帧所需的缓冲区字节数（二进制帧定长，结果精确）"""
+        return rows * self.frame_size
+
+    def _convert(self, values: np.ndarray) -> List[np.ndarray]:
+        """按通道缩放，整数类型四舍五入并饱和到类型范围"""
+        scaled = values * self.scales
+        columns = []
+        for i, limits in enumerate(self._limits):
+            column = scaled[:, i]
+            if limits is not None:
+                column = np.clip(np.rint(np.nan_to_num(column)), limits[0], limits[1])
+            columns.append(column)
+        return columns
+
+    def _assemble(self, payload: bytes) -> bytes:
+        """编码单帧有效载荷并加上分隔符和校验和"""
+        encoded = self.encoder.encode(payload)
+        return self.start + encoded + self.end + self._checksum(encoded)
+
+    def pack(self, values: Sequence[float]) -> bytes:
+        """打包单帧"""
+        buffer = bytearray(self.frame_size)
+        self.pack_into(values, buffer)
+        return bytes(buffer)
+
+    def pack_into(self, values: Sequence[float], buffer: bytearray, offset: int = 0) -> int:
+        """使用 struct 打包单帧有效载荷并写入 buffer[offset:]，返回写入的字节数"""
+        row = np.asarray(values, dtype=np.float64).reshape(1, -1)
+        if row.shape[1] != self.channels:
+            raise ValueError(f"数值个数 {row.shape[1]} 与通道数 {self.channels} 不匹配")
+        converted = [int(column[0]) if limits is not None else float(column[0])
+                     for column, limits in zip(self._convert(row), self._limits)]
+        frame = self._assemble(self.struct.pack(*converted))
+        buffer[offset:offset + self.frame_size] = frame
+        self._count(1)
+        return self.frame_size
+
+    def render(self, block: np.ndarray) -> bytes:
+        """整块打包并返回字节串"""
+        frames = self._frames(block)
+        self._count(frames.shape[0])
+        return frames.tobytes()
+
+    def render_into(self, block: np.ndarray, buffer: bytearray, offset: int = 0) -> int:
+        """整块打包写入 buffer[offset:]，返回写入的字节数（与 FrameFormatter 接口一致）"""
+        frames = self._frames(block)
+        size = frames.nbytes
+        if size:
+            buffer[offset:offset + size] = memoryview(frames).cast('B')
+        self._count(frames.shape[0])
+        return size
+
+    def _count(self, rows: int):
+        """更新线路字节统计"""
+        self.stats.frames += rows
+        self.stats.payload_bytes += rows * self.payload_size
+        self.stats.wire_bytes += rows * self.frame_size
+
+    def _frames(self, block: np.ndarray) -> np.ndarray:
+        """将 (行数, 通道数) 采样块转换为 (行数, 帧长) 的 uint8 线路帧数组"""
+        values = np.asarray(block, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.ndim != 2 or values.shape[1] != self.channels:
+            raise ValueError(f"采样块形状 {values.shape} 与通道数 {self.channels} 不匹配")
+
+        rows = values.shape[0]
+        payloads = np.empty(rows, dtype=self.payload_dtype)
+        for i, column in enumerate(self._convert(values)):
+            payloads[f'v{i}'] = column
+
+        frames = np.empty((rows, self.frame_size), dtype=np.uint8)
+        encoded = self.encoder.encode_block(payloads.view(np.uint8).reshape(rows, self.payload_size))
+        frames[:, self.payload_start:self.payload_end] = encoded
+        if self.start:
+            frames[:, :self.payload_start] = np.frombuffer(self.start, dtype=np.uint8)
+        if self.end:
+            frames[:, self.payload_end:self.payload_end + len(self.end)] = np.frombuffer(self.end, dtype=np.uint8)
+        if self.checksum_size:
+            frames[:, self.frame_size - self.checksum_size:] = calculate_block(self.checksum, encoded)
+        return frames
+
+    def unpack(self, data: bytes) -> np.ndarray:
+        """解析整块二进制帧，返回 (帧数, 通道数) 的缩放还原后数值（用于校验）"""
+        if len(data) % self.frame_size:
+            raise ValueError(f"数据长度 {len(data)} 不是帧长 {self.frame_size} 的整数倍")
+        frames = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.frame_size)
+        payloads = self.encoder.decode_block(frames[:, self.payload_start:self.payload_end], self.payload_size)
+        records = np.ascontiguousarray(payloads).view(self.payload_dtype).reshape(-1)
+        values = np.empty((records.size, self.channels), dtype=np.float64)
+        for i in range(self.channels):
+            values[:, i] = records[f'v{i}']
+        return values / self.scales
+
+def layout_key(binary_frame: BinaryFrameConfig, channels: int,
+               checksum: ChecksumAlgorithm = ChecksumAlgorithm.NONE,
+               decoder: DecoderMethod = DecoderMethod.PLAIN_TEXT) -> Tuple:
+    """布局缓存键"""
+    return (
+        tuple(binary_frame.value_types),
+        tuple(binary_frame.scales),
+        bytes(binary_frame.start_delimiter),
+        bytes(binary_frame.end_delimiter),
+        binary_frame.byte_order,
+        channels,
+        checksum,
+        decoder
+    )
+
+def compile_layout(config: ComponentConfig) -> BinaryFrameLayout:
+    """根据组件配置编译二进制帧布局，每个数据生成通道对应一个数值"""
+    binary_frame = config.binary_frame
+    channels = len(config.data_generation)
+    declared = binary_frame.value_types or [DEFAULT_VALUE_TYPE]
+    value_types = [declared[min(i, len(declared) - 1)] for i in range(channels)]
+    return BinaryFrameLayout(
+        value_types,
+        scales=binary_frame.scales,
+        start=binary_frame.start_delimiter,
+        end=binary_frame.end_delimiter,
+        byte_order=binary_frame.byte_order,
+        checksum=config.checksum,
+        decoder=config.decoder
+    )
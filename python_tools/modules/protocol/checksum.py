@@ -0,0 +1,247 @@
+"""
+帧校验和计算
+
+与插件端 src/extension/parsing/Checksum.ts 使用相同的算法、参数和字节布局：
+CRC-8（多项式 0x07）、CRC-16（CCITT 0x1021，初值0）、CRC-32（0xEDB88320）、
+XOR、Fletcher-16、Fletcher-32，以及 MD5/SHA-1/SHA-256。校验和以大端字节序
+紧跟在帧结束分隔符之后，覆盖起始与结束分隔符之间的有效载荷。
+
+单帧计算使用预计算查找表（CRC-16/32 直接使用 binascii/zlib 的 C 实现）；
+定长帧整块计算时按字节列向量化，一次查表处理所有帧。
+"""
+
+import binascii
+import hashlib
+import operator
+import struct
+import time
+import zlib
+from functools import lru_cache, reduce
+from itertools import accumulate
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from ..config.data_types import ChecksumAlgorithm
+
+@lru_cache(maxsize=None)
+def crc8_table() -> np.ndarray:
+    """CRC-8 查找表（多项式 0x07）"""
+    table = np.empty(256, dtype=np.uint8)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x07) if crc & 0x80 else (crc << 1)
+            crc &= 0xFF
+        table[i] = crc
+    return table
+
+@lru_cache(maxsize=None)
+def crc16_table() -> np.ndarray:
+    """CRC-16-CCITT 查找表（多项式 0x1021）"""
+    table = np.empty(256, dtype=np.uint16)
+    for i in range(256):
+        crc = i << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+            crc &= 0xFFFF
+        table[i] = crc
+    return table
+
+@lru_cache(maxsize=None)
+def crc32_table() -> np.ndarray:
+    """CRC-32 查找表（反射多项式 0xEDB88320）"""
+    table = np.empty(256, dtype=np.uint32)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xEDB88320 if crc & 1 else crc >> 1
+        table[i] = crc
+    return table
+
+@lru_cache(maxsize=None)
+def _crc8_list() -> tuple:
+    return tuple(crc8_table().tolist())
+
+def crc8(data: bytes) -> int:
+    """CRC-8"""
+    table = _crc8_list()
+    crc = 0
+    for byte in data:
+        crc = table[crc ^ byte]
+    return crc
+
+def crc16(data: bytes) -> int:
+    """CRC-16-CCITT（初值0，即 XMODEM 参数）"""
+    return binascii.crc_hqx(data, 0)
+
+def crc32(data: bytes) -> int:
+    """CRC-32"""
+    return zlib.crc32(data)
+
+def xor8(data: bytes) -> int:
+    """逐字节异或"""
+    return reduce(operator.xor, data, 0)
+
+def fletcher16(data: bytes) -> int:
+    """Fletcher-16，返回 (sum2 << 8) | sum1
+
+    逐步取模与最后取模等价，前缀和由 accumulate 在 C 层完成。
+    """
+    sum1 = sum(data) % 255
+    sum2 = sum(accumulate(data)) % 255
+    return (sum2 << 8) | sum1
+
+def fletcher32(data: bytes) -> int:
+    """Fletcher-32（按大端16位字，奇数长度补零），返回 (sum2 << 16) | sum1"""
+    if len(data) % 2:
+        data = bytes(data) + b'\x00'
+    words = struct.unpack(f'>{len(data) // 2}H', data)
+    sum1 = sum(words) % 65535
+    sum2 = sum(accumulate(words)) % 65535
+    return (sum2 << 16) | sum1
+
+# 算法 -> (校验和字节数, 整数校验函数)；哈希算法单独处理
+INTEGER_CHECKSUMS: Dict[ChecksumAlgorithm, tuple] = {
+    ChecksumAlgorithm.CRC8: (1, crc8),
+    ChecksumAlgorithm.CRC16: (2, crc16),
+    ChecksumAlgorithm.CRC32: (4, crc32),
+    ChecksumAlgorithm.XOR: (1, xor8),
+    ChecksumAlgorithm.FLETCHER16: (2, fletcher16),
+    ChecksumAlgorithm.FLETCHER32: (4, fletcher32)
+}
+
+HASH_CHECKSUMS: Dict[ChecksumAlgorithm, tuple] = {
+    ChecksumAlgorithm.MD5: (16, 'md5'),
+    ChecksumAlgorithm.SHA1: (20, 'sha1'),
+    ChecksumAlgorithm.SHA256: (32, 'sha256')
+}
+
+def parse_algorithm(algorithm) -> ChecksumAlgorithm:
+    """将算法名称解析为枚举，忽略大小写、连字符和下划线（与插件端一致）"""
+    if isinstance(algorithm, ChecksumAlgorithm):
+        return algorithm
+    normalized = (algorithm or '').upper().replace('-', '').replace('_', '')
+    for member in ChecksumAlgorithm:
+        if member.value.upper().replace('-', '') == normalized:
+            return member
+    raise ValueError(f"不支持的校验和算法: {algorithm}")
+
+def checksum_length(algorithm) -> int:
+    """校验和字节数"""
+    algorithm = parse_algorithm(algorithm)
+    if algorithm in INTEGER_CHECKSUMS:
+        return INTEGER_CHECKSUMS[algorithm][0]
+    if algorithm in HASH_CHECKSUMS:
+        return HASH_CHECKSUMS[algorithm][0]
+    return 0
+
+def get_checksum_function(algorithm) -> Callable[[bytes], bytes]:
+    """获取返回校验和字节（大端）的单帧计算函数"""
+    algorithm = parse_algorithm(algorithm)
+    if algorithm in INTEGER_CHECKSUMS:
+        length, function = INTEGER_CHECKSUMS[algorithm]
+        return lambda data: function(data).to_bytes(length, 'big')
+    if algorithm in HASH_CHECKSUMS:
+        name = HASH_CHECKSUMS[algorithm][1]
+        return lambda data: hashlib.new(name, data).digest()
+    return lambda data: b''
+
+def calculate(algorithm, data: bytes) -> bytes:
+    """计算单帧校验和"""
+    return get_checksum_function(algorithm)(data)
+
+def verify(algorithm, data: bytes, expected: bytes) -> bool:
+    """校验单帧"""
+    return calculate(algorithm, data) == bytes(expected)
+
+def calculate_block(algorithm, payloads: np.ndarray) -> np.ndarray:
+    """为定长帧整块计算校验和
+
+    Args:
+        payloads: 形状为 (帧数, 有效载荷字节数) 的 uint8 数组
+
+    Returns:
+        形状为 (帧数, 校验和字节数) 的 uint8 数组
+    """
+    algorithm = parse_algorithm(algorithm)
+    payloads = np.asarray(payloads, dtype=np.uint8)
+    rows, width = payloads.shape
+    length = checksum_length(algorithm)
+
+    if algorithm in HASH_CHECKSUMS:
+        name = HASH_CHECKSUMS[algorithm][1]
+        digests = b''.join(hashlib.new(name, row.tobytes()).digest() for row in payloads)
+        return np.frombuffer(digests, dtype=np.uint8).reshape(rows, length)
+
+    if algorithm == ChecksumAlgorithm.CRC8:
+        table = crc8_table()
+        crc = np.zeros(rows, dtype=np.uint8)
+        for column in payloads.T:
+            crc = table[crc ^ column]
+        values = crc.astype(np.uint32)
+
+    elif algorithm == ChecksumAlgorithm.CRC16:
+        table = crc16_table()
+        crc = np.zeros(rows, dtype=np.uint16)
+        for column in payloads.T:
+            crc = (crc << 8) ^ table[(crc >> 8) ^ column]
+        values = crc.astype(np.uint32)
+
+    elif algorithm == ChecksumAlgorithm.CRC32:
+        table = crc32_table()
+        crc = np.full(rows, 0xFFFFFFFF, dtype=np.uint32)
+        for column in payloads.T:
+            crc = (crc >> 8) ^ table[(crc ^ column) & 0xFF]
+        values = crc ^ np.uint32(0xFFFFFFFF)
+
+    elif algorithm == ChecksumAlgorithm.XOR:
+        values = np.bitwise_xor.reduce(payloads, axis=1).astype(np.uint32) if width else np.zeros(rows, np.uint32)
+
+    elif algorithm in (ChecksumAlgorithm.FLETCHER16, ChecksumAlgorithm.FLETCHER32):
+        if algorithm == ChecksumAlgorithm.FLETCHER16:
+            words, modulus, shift = payloads.astype(np.int64), 255, 8
+        else:
+            if width % 2:
+                payloads = np.hstack((payloads, np.zeros((rows, 1), dtype=np.uint8)))
+            words = payloads.view('>u2').astype(np.int64)
+            modulus, shift = 65535, 16
+        # sum2 = Σ 前缀和 = Σ (n - i) * w_i
+        weights = np.arange(words.shape[1], 0, -1, dtype=np.int64)
+        sum1 = words.sum(axis=1) % modulus
+        sum2 = (words % modulus) @ weights % modulus
+        values = ((sum2 << shift) | sum1).astype(np.uint32)
+
+    else:
+        return np.empty((rows, 0), dtype=np.uint8)
+
+    return values.astype('>u4').view(np.uint8).reshape(rows, 4)[:, 4 - length:]
+
+def benchmark(algorithms: Optional[Sequence] = None, frame_size: int = 32,
+              frames: int = 10000) -> Dict[str, Dict[str, float]]:
+    """校验和性能测试
+
+    Returns:
+        算法名称 -> {'single': 单帧计算帧/秒, 'block': 整块计算帧/秒}
+    """
+    algorithms = [parse_algorithm(a) for a in algorithms] if algorithms else \
+        [a for a in ChecksumAlgorithm if a != ChecksumAlgorithm.NONE]
+    payloads = np.random.default_rng(0).integers(0, 256, (frames, frame_size), dtype=np.uint8)
+    rows = [row.tobytes() for row in payloads]
+    results = {}
+    for algorithm in algorithms:
+        function = get_checksum_function(algorithm)
+        start = time.perf_counter()
+        for row in rows:
+            function(row)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        calculate_block(algorithm, payloads)
+        block = time.perf_counter() - start
+
+        results[algorithm.value] = {
+            'single': frames / single if single > 0 else float('inf'),
+            'block': frames / block if block > 0 else float('inf')
+        }
+    return results
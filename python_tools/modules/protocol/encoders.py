@@ -0,0 +1,184 @@
+"""
+有效载荷线路编码
+
+对应插件端的 DecoderMethod（PlainText/Hexadecimal/Base64）：帧分隔符保持原样，
+起止分隔符之间的有效载荷按指定方式编码后发送。编码使用 binascii 的批量例程，
+定长帧整块一次编码后再按帧切分，不做逐值转换。
+"""
+
+import binascii
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Type, Union
+
+import numpy as np
+
+from ..config.data_types import DecoderMethod
+
+@dataclass
+class WireStats:
+    """线路字节统计
+
+    Attributes:
+        frames: 已编码帧数
+        payload_bytes: 编码前的有效载荷字节数
+        wire_bytes: 实际发送的字节数（含分隔符、校验和、换行）
+    """
+    frames: int = 0
+    payload_bytes: int = 0
+    wire_bytes: int = 0
+
+    @property
+    def overhead(self) -> float:
+        """线路字节数 / 有效载荷字节数"""
+        return self.wire_bytes / self.payload_bytes if self.payload_bytes else 0.0
+
+    @property
+    def bytes_per_frame(self) -> float:
+        """平均每帧线路字节数"""
+        return self.wire_bytes / self.frames if self.frames else 0.0
+
+    def reset(self):
+        """清零统计"""
+        self.frames = 0
+        self.payload_bytes = 0
+        self.wire_bytes = 0
+
+class PayloadEncoder(ABC):
+    """有效载荷编码器抽象类"""
+
+    method: DecoderMethod
+
+    @abstractmethod
+    def encode(self, data: bytes) -> bytes:
+        """编码单个有效载荷"""
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> bytes:
+        """解码单个有效载荷"""
+        pass
+
+    @abstractmethod
+    def encoded_size(self, size: int) -> int:
+        """size 字节有效载荷编码后的字节数"""
+        pass
+
+    def encode_many(self, payloads: Sequence[bytes]) -> List[bytes]:
+        """编码一组变长有效载荷"""
+        return [self.encode(payload) for payload in payloads]
+
+    def encode_block(self, payloads: np.ndarray) -> np.ndarray:
+        """编码定长有效载荷块 (帧数, 字节数) -> (帧数, 编码后字节数)"""
+        rows, width = payloads.shape
+        encoded = b''.join(self.encode_many([row.tobytes() for row in payloads]))
+        return np.frombuffer(encoded, dtype=np.uint8).reshape(rows, self.encoded_size(width))
+
+    def decode_block(self, encoded: np.ndarray, size: int) -> np.ndarray:
+        """解码定长编码块，size 为原始有效载荷字节数"""
+        decoded = b''.join(self.decode(row.tobytes()) for row in encoded)
+        return np.frombuffer(decoded, dtype=np.uint8).reshape(encoded.shape[0], size)
+
+class PlainTextEncoder(PayloadEncoder):
+    """原样发送"""
+
+    method = DecoderMethod.PLAIN_TEXT
+
+    def encode(self, data: bytes) -> bytes:
+        return bytes(data)
+
+    def decode(self, data: bytes) -> bytes:
+        return bytes(data)
+
+    def encoded_size(self, size: int) -> int:
+        return size
+
+    def encode_many(self, payloads: Sequence[bytes]) -> List[bytes]:
+        return list(payloads)
+
+    def encode_block(self, payloads: np.ndarray) -> np.ndarray:
+        return payloads
+
+    def decode_block(self, encoded: np.ndarray, size: int) -> np.ndarray:
+        return encoded
+
+class HexEncoder(PayloadEncoder):
+    """十六进制编码（小写，每字节两个字符）"""
+
+    method = DecoderMethod.HEXADECIMAL
+
+    def encode(self, data: bytes) -> bytes:
+        return binascii.b2a_hex(data)
+
+    def decode(self, data: bytes) -> bytes:
+        return binascii.a2b_hex(data)
+
+    def encoded_size(self, size: int) -> int:
+        return size * 2
+
+    def encode_many(self, payloads: Sequence[bytes]) -> List[bytes]:
+        # 拼接后一次编码，按原长度的两倍切分
+        encoded = binascii.b2a_hex(b''.join(payloads))
+        result = []
+        position = 0
+        for payload in payloads:
+            end = position + 2 * len(payload)
+            result.append(encoded[position:end])
+            position = end
+        return result
+
+    def encode_block(self, payloads: np.ndarray) -> np.ndarray:
+        rows, width = payloads.shape
+        encoded = binascii.b2a_hex(np.ascontiguousarray(payloads).tobytes())
+        return np.frombuffer(encoded, dtype=np.uint8).reshape(rows, 2 * width)
+
+    def decode_block(self, encoded: np.ndarray, size: int) -> np.ndarray:
+        decoded = binascii.a2b_hex(np.ascontiguousarray(encoded).tobytes())
+        return np.frombuffer(decoded, dtype=np.uint8).reshape(encoded.shape[0], size)
+
+class Base64Encoder(PayloadEncoder):
+    """Base64 编码（标准字母表，带 = 填充，无换行）"""
+
+    method = DecoderMethod.BASE64
+
+    def encode(self, data: bytes) -> bytes:
+        return binascii.b2a_base64(data, newline=False)
+
+    def decode(self, data: bytes) -> bytes:
+        return binascii.a2b_base64(data)
+
+    def encoded_size(self, size: int) -> int:
+        return (size + 2) // 3 * 4
+
+    def encode_block(self, payloads: np.ndarray) -> np.ndarray:
+        """每帧补零到3字节的整数倍后整块一次编码，再把补零产生的尾字符改为 '='
+
+        补零位与 Base64 标准填充时补的零位相同，因此除尾部填充字符外结果逐字节一致。
+        """
+        rows, width = payloads.shape
+        padding = -width % 3
+        if padding:
+            payloads = np.hstack((payloads, np.zeros((rows, padding), dtype=np.uint8)))
+        encoded = binascii.b2a_base64(np.ascontiguousarray(payloads).tobytes(), newline=False)
+        block = np.frombuffer(encoded, dtype=np.uint8).reshape(rows, self.encoded_size(width)).copy()
+        if padding:
+            block[:, -padding:] = ord('=')
+        return block
+
+    def decode_block(self, encoded: np.ndarray, size: int) -> np.ndarray:
+        rows, width = encoded.shape
+        # '=' 视为补零位，整块一次解码后去掉每帧的补零字节
+        data = np.where(encoded == ord('='), ord('A'), encoded).astype(np.uint8)
+        decoded = binascii.a2b_base64(data.tobytes())
+        return np.frombuffer(decoded, dtype=np.uint8).reshape(rows, width // 4 * 3)[:, :size]
+
+ENCODERS: Dict[DecoderMethod, Type[PayloadEncoder]] = {
+    DecoderMethod.PLAIN_TEXT: PlainTextEncoder,
+    DecoderMethod.HEXADECIMAL: HexEncoder,
+    DecoderMethod.BASE64: Base64Encoder
+}
+
+def create_encoder(method: Union[DecoderMethod, int]) -> PayloadEncoder:
+    """根据解码方式（枚举或插件端的数值）创建编码器"""
+    method = DecoderMethod(method)
+    return ENCODERS[method]()
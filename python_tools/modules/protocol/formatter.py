@@ -0,0 +1,191 @@
+"""
+批量数据帧格式化
+
+将 (行数 × 通道数) 的采样块按各通道精度一次性渲染为每行一帧的 `$a,b,c;` 字节流，
+直接写入预分配的 bytearray。全部通道为定点格式时，按块拼接字节模板后一次
+`%` 格式化（在 C 层完成），省去逐帧的 f-string、join、拼接帧头尾和 UTF-8 编码。
+"""
+
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..config.data_types import ChecksumAlgorithm, DecoderMethod
+from .checksum import checksum_length, get_checksum_function, parse_algorithm
+from .encoders import WireStats, create_encoder
+
+# 通道精度: 整数为定点小数位数（%.Nf），字符串为 format() 格式说明（如 'g'、'.6e'）
+Precision = Union[int, str]
+
+# Serial Studio 默认帧格式
+FRAME_START = b'$'
+FRAME_END = b';'
+SEPARATOR = b','
+NEWLINE = b'\n'
+
+# 定点快速路径每次格式化的行数（限制单个模板的大小）
+CHUNK_ROWS = 256
+
+# 预估缓冲区时每个数值的平均字节数
+ESTIMATED_VALUE_WIDTH = 12
+
+class FrameFormatter:
+    """数据帧格式化器
+
+    Attributes:
+        precisions: 各通道精度
+        fixed_point: 是否全部为定点格式（可走块模板快速路径）
+        row_template: 单行字节模板（仅定点格式）
+        checksum: 校验和算法，启用时校验和追加在结束分隔符之后、换行之前
+        encoder: 有效载荷线路编码器（十六进制/Base64 时校验和按编码后的载荷计算）
+        stats: 线路字节统计
+    """
+
+    def __init__(self, precisions: Sequence[Precision], start: bytes = FRAME_START,
+                 end: bytes = FRAME_END, separator: bytes = SEPARATOR,
+                 newline: bytes = NEWLINE, chunk_rows: int = CHUNK_ROWS,
+                 checksum: Union[ChecksumAlgorithm, str] = ChecksumAlgorithm.NONE,
+                 decoder: DecoderMethod = DecoderMethod.PLAIN_TEXT):
+        for precision in precisions:
+            if isinstance(precision, int) and precision < 0:
+                raise ValueError(f"定点精度不能为负数: {precision}")
+        if chunk_rows <= 0:
+            raise ValueError(f"分块行数必须大于0: {chunk_rows}")
+
+        self.precisions: List[Precision] = list(precisions)
+        self.channels = len(self.precisions)
+        self.start = start
+        self.end = end
+        self.separator = separator
+        self.newline = newline
+        self.chunk_rows = chunk_rows
+        self.fixed_point = all(isinstance(p, int) for p in self.precisions)
+        self.checksum = parse_algorithm(checksum)
+        self._checksum = get_checksum_function(self.checksum)
+        self.encoder = create_encoder(decoder)
+        # 明文且无校验和时可整块格式化，否则需要逐帧处理有效载荷
+        self._framed = self.checksum != ChecksumAlgorithm.NONE or self.encoder.method != DecoderMethod.PLAIN_TEXT
+        self.stats = WireStats()
+        self._specs = [f'.{p}f' if isinstance(p, int) else p for p in self.precisions]
+
+        if self.fixed_point:
+            # 模板中的字面量 % 需要转义
+            escape = lambda part: part.replace(b'%', b'%%')
+            self._payload_template = escape(separator).join(b'%%.%df' % p for p in self.precisions)
+            self.row_template = escape(start) + self._payload_template + escape(end) + escape(newline)
+            self._chunk_template = self.row_template * chunk_rows
+        else:
+            self._payload_template = b''
+            self.row_template = b''
+            self._chunk_template = b''
+
+    def estimate_size(self, rows: int) -> int:
+        """预估 rows 行所需的缓冲区字节数，用于预分配"""
+        payload = len(self.separator) * max(0, self.channels - 1) + self.channels * ESTIMATED_VALUE_WIDTH
+        overhead = len(self.start) + len(self.end) + len(self.newline) + checksum_length(self.checksum)
+        return rows * (overhead + self.encoder.encoded_size(payload))
+
+    def render(self, block: np.ndarray) -> bytes:
+        """渲染采样块并返回字节串"""
+        buffer = bytearray()
+        self.render_into(block, buffer)
+        return bytes(buffer)
+
+    def render_into(self, block: np.ndarray, buffer: bytearray, offset: int = 0) -> int:
+        """将采样块渲染到 buffer[offset:]，返回写入的字节数
+
+        buffer 容量不足时自动扩展；容量充足时原地覆盖，不改变 buffer 长度。
+
+        Args:
+            block: 形状为 (行数, 通道数) 的数组，一维数组视为单行
+            buffer: 目标缓冲区
+            offset: 写入起始位置
+        """
+        values = np.asarray(block, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.ndim != 2 or values.shape[1] != self.channels:
+            raise ValueError(f"采样块形状 {values.shape} 与通道数 {self.channels} 不匹配")
+
+        rows = values.shape[0]
+        if rows == 0:
+            return 0
+
+        if self._framed:
+            written, payload_bytes = self._render_framed(values, buffer, offset)
+        else:
+            if self.fixed_point:
+                written = self._render_fixed(values, rows, buffer, offset)
+            else:
+                written = self._render_general(values, buffer, offset)
+            payload_bytes = written - rows * (len(self.start) + len(self.end) + len(self.newline))
+
+        self.stats.frames += rows
+        self.stats.payload_bytes += payload_bytes
+        self.stats.wire_bytes += written
+        return written
+
+    def _render_fixed(self, values: np.ndarray, rows: int, buffer: bytearray, offset: int) -> int:
+        """定点快速路径：整块模板一次格式化"""
+        flat = values.ravel().tolist()
+        channels = self.channels
+        position = offset
+        for first in range(0, rows, self.chunk_rows):
+            count = min(self.chunk_rows, rows - first)
+            template = self._chunk_template if count == self.chunk_rows else self.row_template * count
+            chunk = template % tuple(flat[first * channels:(first + count) * channels])
+            buffer[position:position + len(chunk)] = chunk
+            position += len(chunk)
+        return position - offset
+
+    def _render_general(self, values: np.ndarray, buffer: bytearray, offset: int) -> int:
+        """通用路径：逐值按格式说明格式化"""
+        separator = self.separator.decode('latin-1')
+        prefix = self.start.decode('latin-1')
+        suffix = (self.end + self.newline).decode('latin-1')
+        specs = self._specs
+        text = ''.join(
+            prefix + separator.join([format(value, spec) for value, spec in zip(row, specs)]) + suffix
+            for row in values.tolist()
+        )
+        chunk = text.encode('latin-1')
+        buffer[offset:offset + len(chunk)] = chunk
+        return len(chunk)
+
+    def _render_framed(self, values: np.ndarray, buffer: bytearray, offset: int) -> Tuple[int, int]:
+        """格式化各帧有效载荷，整体编码后逐帧加上分隔符和校验和
+
+        Returns:
+            (写入的字节数, 编码前的有效载荷字节数)
+        """
+        if self.fixed_point:
+            template = self._payload_template
+            payloads = [template % tuple(row) for row in values.tolist()]
+        else:
+            separator = self.separator.decode('latin-1')
+            specs = self._specs
+            payloads = [
+                separator.join([format(value, spec) for value, spec in zip(row, specs)]).encode('latin-1')
+                for row in values.tolist()
+            ]
+        payload_bytes = sum(map(len, payloads))
+        chunk = self._frame_payloads(payloads)
+        buffer[offset:offset + len(chunk)] = chunk
+        return len(chunk), payload_bytes
+
+    def _frame_payloads(self, payloads: Sequence[bytes]) -> bytes:
+        """编码各帧有效载荷并加上分隔符、校验和与换行"""
+        encoded = self.encoder.encode_many(payloads)
+        start, end, newline, checksum = self.start, self.end, self.newline, self._checksum
+        return b''.join([start + payload + end + checksum(payload) + newline for payload in encoded])
+
+    def frame(self, payloads: Sequence[bytes]) -> bytes:
+        """为已格式化好的有效载荷（如组件生成器输出的 `a,b,c`）逐帧编码并加上分隔符和校验和
+
+        不要求通道数与精度匹配，用于数值以外（终端、数据表等）或自行格式化数值的组件。
+        """
+        chunk = self._frame_payloads(payloads)
+        self.stats.frames += len(payloads)
+        self.stats.payload_bytes += sum(map(len, payloads))
+        self.stats.wire_bytes += len(chunk)
+        return chunk
@@ -0,0 +1,71 @@
+"""
+合并帧构建
+
+Serial Studio 项目文件按“一个设备帧包含所有数据集”描述数据：每个数据集通过 index
+指定在帧中的位置。合并帧模式把同一时刻到期的多个组件拼成一帧、一次写出，
+代替每个组件各发一帧。
+"""
+
+from typing import Dict, List
+
+from ..config.data_types import ComponentConfig
+
+def dataset_indices(config: ComponentConfig, count: int) -> List[int]:
+    """组件内各字段的数据集位置（从1开始）
+
+    datasets 为每个字段声明了互不相同的 index 时使用声明的位置，否则按字段顺序编号。
+    """
+    indices = [dataset.get('index') for dataset in config.datasets]
+    if (len(indices) == count and len(set(indices)) == count and
+            all(isinstance(index, int) and index > 0 for index in indices)):
+        return indices
+    return list(range(1, count + 1))
+
+class MergedFrameBuilder:
+    """合并帧构建器
+
+    每个组件在合并帧中占据一段连续位置，组件内的数据集位置加上组件的基准偏移
+    即为合并帧中的全局位置。未到期的组件沿用上一次的数值，帧宽度保持不变。
+
+    Attributes:
+        index_map: 组件名 -> 各字段在合并帧中的位置（从1开始）
+        fields: 合并帧当前各位置的值
+    """
+
+    def __init__(self, start: str = '$', end: str = ';', separator: str = ','):
+        self.start = start
+        self.end = end
+        self.separator = separator
+        self.index_map: Dict[str, List[int]] = {}
+        self.fields: List[str] = []
+
+    @property
+    def width(self) -> int:
+        """合并帧字段数"""
+        return len(self.fields)
+
+    def add_component(self, config: ComponentConfig, data: str) -> List[int]:
+        """为组件分配合并帧中的位置，并以 data 作为初始值
+
+        Returns:
+            分配到的全局位置
+        """
+        if config.name in self.index_map:
+            raise ValueError(f"合并帧中已存在组件: {config.name}")
+        values = data.split(self.separator)
+        local = dataset_indices(config, len(values))
+        base = len(self.fields)
+        self.fields.extend([''] * max(local))
+        self.index_map[config.name] = [base + index for index in local]
+        self.update(config.name, data)
+        return self.index_map[config.name]
+
+    def update(self, name: str, data: str):
+        """用组件的最新数据更新其所在位置"""
+        fields = self.fields
+        for position, value in zip(self.index_map[name], data.split(self.separator)):
+            fields[position - 1] = value
+
+    def render(self) -> str:
+        """生成当前合并帧"""
+        return self.start + self.separator.join(self.fields) + self.end
@@ -19,14 +19,19 @@ import math
 import threading
 import argparse
 import signal
-from datetime import datetime, timedelta 
-from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
 import serial
 import socket
 
+from modules.communication.latency import FrameStamper, LatencyTracker
+from modules.components.pacing import Pacer, PACING_AUTO, PACING_BACKENDS
+from modules.communication.reader import BackgroundReader
+from modules.communication.ring_buffer import CircularBuffer
+
 @dataclass
 class TestConfig:
     """测试配置类"""
@@ -51,6 +56,8 @@ class TestResult:
     average_latency: float
     errors: List[str]
     passed: bool
+    latency: Optional[Dict] = None  # 端到端延迟统计（启用回环测量时）
+    pacing: Optional[Dict] = None  # 发送节拍统计：实际速率与发送间隔抖动
 
 class SerialStudioAutomation:
     """Serial Studio 自动化测试类"""
@@ -61,6 +68,15 @@ class SerialStudioAutomation:
         self.current_test = None
         self.comm_connection = None
         
+        # 端到端延迟测量：帧尾附加序号和发送时刻，从回环数据中匹配
+        self.measure_latency = False
+        self.receive_buffer: Optional[CircularBuffer] = None
+        self.reader: Optional[BackgroundReader] = None
+        
+        # 发送节拍：按绝对到期时刻休眠，spin 为混合模式的忙等时长（秒）
+        self.pacing_backend = PACING_AUTO
+        self.pacing_spin = 0.0
+        
         # 预定义测试配置
         self.test_configs = self._load_test_configs()
         
@@ -287,6 +303,9 @@ class SerialStudioAutomation:
             else:
                 print(f"不支持的通讯类型: {comm_type}")
                 return False
+            
+            if self.measure_latency:
+                self._start_loopback_reader()
                 
             return True
             
@@ -294,15 +313,36 @@ class SerialStudioAutomation:
             print(f"连接失败: {str(e)}")
             return False
     
+    def _start_loopback_reader(self):
+        """启动回环接收线程（设备回显、TCP回显服务或TX/RX短接的串口）"""
+        conn = self.comm_connection
+        if isinstance(conn, serial.Serial):
+            read_into = lambda view: conn.readinto(view[:max(1, min(conn.in_waiting, len(view)))])
+            eof_on_empty = False
+        else:
+            conn.settimeout(0.5)
+            read_into = conn.recv_into
+            eof_on_empty = conn.type == socket.SOCK_STREAM
+        self.receive_buffer = CircularBuffer(1024 * 1024)
+        self.reader = BackgroundReader(read_into, self.receive_buffer, eof_on_empty=eof_on_empty)
+        self.reader.start()
+    
     def _disconnect(self):
         """断开连接"""
+        # 回环读线程无论连接是否存在、关闭是否成功都要停止
+        reader, self.reader = self.reader, None
+        if reader:
+            reader.stop(timeout=0)
         try:
             if self.comm_connection:
                 self.comm_connection.close()
-                self.comm_connection = None
                 print("连接已断开")
         except Exception as e:
             print(f"断开连接失败: {str(e)}")
+        finally:
+            self.comm_connection = None
+            if reader:
+                reader.join()
     
     def _run_single_test(self, config: TestConfig) -> TestResult:
         """运行单个测试"""
@@ -311,16 +351,28 @@ class SerialStudioAutomation:
         packets_failed = 0 
         errors = []
         latencies = []
+        stamper = tracker = None
+        if self.measure_latency and self.receive_buffer is not None:
+            stamper = FrameStamper()
+            tracker = LatencyTracker(self.receive_buffer)
+            tracker.start()
         
         self.is_running = True
-        end_time = start_time + timedelta(seconds=config.duration)
+        pacer = Pacer(config.interval, self.pacing_backend, self.pacing_spin)
+        pacer.start()
+        end_ns = pacer.origin_ns + round(config.duration * 1e9)
         
         print(f"测试开始: {start_time.strftime('%H:%M:%S')}")
         
         try:
-            while datetime.now() < end_time and self.is_running:
+            while pacer.next_deadline < end_ns and self.is_running:
+                # 按绝对时刻等待，生成和发送的耗时不会累积到间隔中
+                pacer.wait()
+                
                 # 生成测试数据
                 data = self._generate_test_data(config)
+                if stamper:
+                    data = stamper.stamp(data)
                 
                 # 记录发送开始时间
                 send_start = time.time()
@@ -341,9 +393,6 @@ class SerialStudioAutomation:
                     packets_failed += 1
                     errors.append(f"数据发送失败: {data}")
                 
-                # 等待间隔
-                time.sleep(config.interval)
-                
         except KeyboardInterrupt:
             print("\n测试被用户中断")
             self.is_running = False
@@ -352,6 +401,8 @@ class SerialStudioAutomation:
             print(error_msg)
             errors.append(error_msg)
         
+        pacer.close()
+        pacing_report = pacer.report()
         actual_end_time = datetime.now()
         duration = (actual_end_time - start_time).total_seconds()
         
@@ -359,6 +410,15 @@ class SerialStudioAutomation:
         success_rate = (packets_sent / (packets_sent + packets_failed) * 100) if (packets_sent + packets_failed) > 0 else 0
         avg_latency = sum(latencies) / len(latencies) if latencies else 0
         
+        # 端到端延迟：等待在途帧回环后按序号统计，平均延迟改为往返时延均值
+        latency_report = None
+        if tracker:
+            tracker.wait(stamper.sent, timeout=1.0)
+            tracker.stop()
+            report = tracker.report(stamper.sent)
+            latency_report = report.to_dict()
+            avg_latency = report.rtt_mean
+        
         # 验证测试结果
         passed = self._validate_test_results(config, packets_sent, duration, errors)
         
@@ -372,7 +432,9 @@ class SerialStudioAutomation:
             success_rate=success_rate,
             average_latency=avg_latency,
             errors=errors,
-            passed=passed
+            passed=passed,
+            latency=latency_report,
+            pacing=pacing_report.to_dict()
         )
     
     def _generate_test_data(self, config: TestConfig) -> str:
@@ -419,10 +481,10 @@ class SerialStudioAutomation:
         )
         return signal
     
-    def _send_data(self, data: str) -> bool:
+    def _send_data(self, data: Union[str, bytes]) -> bool:
         """发送数据"""
         try:
-            data_bytes = data.encode('utf-8')
+            data_bytes = data.encode('utf-8') if isinstance(data, str) else data
             
             if isinstance(self.comm_connection, serial.Serial):
                 self.comm_connection.write(data_bytes)
@@ -472,7 +534,19 @@ class SerialStudioAutomation:
         print(f"发送成功: {result.packets_sent}")
         print(f"发送失败: {result.packets_failed}")
         print(f"成功率: {result.success_rate:.1f}%")
-        print(f"平均延迟: {result.average_latency:.2f}ms")
+        if result.latency:
+            latency = result.latency
+            print(f"往返时延: 平均 {latency['rtt_mean']:.2f}ms, P50 {latency['rtt_p50']:.2f}ms, "
+                  f"P90 {latency['rtt_p90']:.2f}ms, P99 {latency['rtt_p99']:.2f}ms, 最大 {latency['rtt_max']:.2f}ms")
+            print(f"回环接收: {latency['received']}/{latency['sent']}, 丢失 {latency['lost']}, "
+                  f"乱序 {latency['reordered']}, 重复 {latency['duplicates']}")
+        else:
+            print(f"平均发送耗时: {result.average_latency:.2f}ms")
+        if result.pacing:
+            pacing = result.pacing
+            print(f"发送速率: 实际 {pacing['achieved_rate']:.1f}/s, 目标 {pacing['target_rate']:.1f}/s")
+            print(f"间隔抖动: P50 {pacing['jitter_p50']:.0f}µs, P90 {pacing['jitter_p90']:.0f}µs, "
+                  f"P99 {pacing['jitter_p99']:.0f}µs, 最大 {pacing['jitter_max']:.0f}µs")
         print(f"测试状态: {'通过' if result.passed else '失败'}")
         
         if result.errors:
@@ -582,7 +656,19 @@ class SerialStudioAutomation:
                     f.write(f"- **发送成功**: {result.packets_sent}\n")
                     f.write(f"- **发送失败**: {result.packets_failed}\n")
                     f.write(f"- **成功率**: {result.success_rate:.1f}%\n")
-                    f.write(f"- **平均延迟**: {result.average_latency:.2f}ms\n")
+                    if result.latency:
+                        latency = result.latency
+                        f.write(f"- **往返时延**: 平均 {latency['rtt_mean']:.2f}ms / P50 {latency['rtt_p50']:.2f}ms / "
+                                f"P90 {latency['rtt_p90']:.2f}ms / P99 {latency['rtt_p99']:.2f}ms\n")
+                        f.write(f"- **回环接收**: {latency['received']}/{latency['sent']}，丢失 {latency['lost']}，"
+                                f"乱序 {latency['reordered']}，重复 {latency['duplicates']}\n")
+                    else:
+                        f.write(f"- **平均发送耗时**: {result.average_latency:.2f}ms\n")
+                    if result.pacing:
+                        pacing = result.pacing
+                        f.write(f"- **发送速率**: 实际 {pacing['achieved_rate']:.1f}/s，目标 {pacing['target_rate']:.1f}/s\n")
+                        f.write(f"- **间隔抖动**: P50 {pacing['jitter_p50']:.0f}µs / P90 {pacing['jitter_p90']:.0f}µs / "
+                                f"P99 {pacing['jitter_p99']:.0f}µs / 最大 {pacing['jitter_max']:.0f}µs\n")
                     
                     if result.errors:
                         f.write(f"- **错误信息**: {len(result.errors)} 个错误\n")
@@ -607,6 +693,12 @@ def main():
                        default='serial', help='通讯类型')
     parser.add_argument('--test', '-t', help='指定单个测试名称')
     parser.add_argument('--list', '-l', action='store_true', help='列出所有可用测试')
+    parser.add_argument('--latency', action='store_true',
+                       help='测量端到端延迟（帧尾附加序号和时间戳，需要设备或对端回显数据）')
+    parser.add_argument('--timer', choices=PACING_BACKENDS, default=PACING_AUTO,
+                       help='发送节拍的休眠方式（auto 优先使用 clock_nanosleep/timerfd）')
+    parser.add_argument('--spin-us', type=float, default=0.0,
+                       help='到期前忙等的微秒数，用于亚毫秒级发送间隔')
     
     # 串口参数
     parser.add_argument('--port', '-p', default='COM1', help='串口端口')
@@ -625,6 +717,9 @@ def main():
     
     # 创建自动化测试实例
     automation = SerialStudioAutomation()
+    automation.measure_latency = args.latency
+    automation.pacing_backend = args.timer
+    automation.pacing_spin = args.spin_us / 1e6
     
     # 列出可用测试
     if args.list:
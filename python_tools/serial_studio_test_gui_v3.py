@@ -18,10 +18,10 @@ Serial Studio 高级测试工具 - GUI版本 v3.0 (模块化版本)
 """
 
 import sys
-import time
+import copy
 import threading
 from datetime import datetime
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Union
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
@@ -29,8 +29,37 @@ from tkinter import ttk, scrolledtext, messagebox, filedialog
 # 导入模块化的组件
 from modules import (
     ComponentType, CommType, DataGenConfig, ComponentConfig, CommConfig,
-    DefaultConfigs, CommunicationManager, ComponentGeneratorFactory
+    FrameFormat, BinaryFrameConfig, ChecksumAlgorithm, DecoderMethod, DefaultConfigs, CommunicationManager, ComponentGeneratorFactory,
+    SendLoop, EngineProcess, PreviewBuffer, get_port_inventory
 )
+from modules.communication.port_inventory import PORT_ADDED
+from modules.engine.process import EVENT_CONNECTED, EVENT_SENDING, EVENT_LOG
+from modules.engine.send_loop import frame_preview
+from modules.communication.send_queue import BACKPRESSURE_POLICIES
+from modules.protocol.binary import VALUE_TYPES, DEFAULT_VALUE_TYPE
+
+# 精确定时模式下到期前的忙等时长（秒）
+PRECISE_TIMING_SPIN = 0.0005
+
+# 发送队列：关闭选项和容量（帧数）
+SEND_QUEUE_OFF = "off"
+SEND_QUEUE_SIZE = 256
+
+# 独立进程引擎：事件和预览帧的轮询间隔（毫秒）
+ENGINE_POLL_MS = 50
+
+# 预览和日志面板：刷新间隔（毫秒，约 20Hz）、缓冲容量（条）、文本框保留的最大行数
+TEXT_REFRESH_MS = 50
+PREVIEW_BUFFER_SIZE = 200
+LOG_BUFFER_SIZE = 1000
+PREVIEW_MAX_LINES = 1000
+LOG_MAX_LINES = 1000
+
+# 预览采样：每 N 帧显示 1 帧
+PREVIEW_SAMPLE_CHOICES = ("1", "10", "100", "1000")
+
+# 发送期间统计信息的刷新间隔（毫秒）
+STATS_REFRESH_MS = 1000
 
 class SerialStudioAdvancedTestGUI:
     """Serial Studio 高级测试工具GUI - 模块化版本"""
@@ -47,8 +76,22 @@ class SerialStudioAdvancedTestGUI:
         # 状态变量
         self.is_running = False
         self.send_thread = None
+        self.send_loop: Optional[SendLoop] = None
         self.component_configs: List[ComponentConfig] = []
         
+        # 独立进程引擎：启用时连接和发送循环都在子进程中
+        self.engine: Optional[EngineProcess] = None
+        self.engine_connected = False
+        self._stats_job = None
+        
+        # 预览和日志先写入缓冲，由界面定时器批量插入文本框
+        self.preview_buffer = PreviewBuffer(PREVIEW_BUFFER_SIZE)
+        self.log_buffer = PreviewBuffer(LOG_BUFFER_SIZE)
+        self._preview_lines = 0
+        self._log_lines = 0
+        self._failures = 0
+        self._last_failure = ''
+        
         # 初始化通讯配置，尝试获取默认串口
         default_port = self.comm_manager.get_default_serial_port() or "COM1"
         self.comm_config = CommConfig(
@@ -61,16 +104,14 @@ class SerialStudioAdvancedTestGUI:
             timeout=1.0
         )
         
-        # 统计信息
-        self.stats = {
-            'sent_count': 0,
-            'error_count': 0,
-            'start_time': 0
-        }
-        
         # 创建界面
         self._create_widgets()
         self._load_default_configs()
+        self.root.after(TEXT_REFRESH_MS, self._refresh_text_panels)
+        
+        # 串口热插拔通知（在后台刷新线程中回调，转到界面线程处理）
+        get_port_inventory().add_listener(
+            lambda event, port: self.root.after(0, self._on_serial_port_hotplug, event, port))
         
     def _create_widgets(self):
         """创建界面组件"""
@@ -104,7 +145,7 @@ class SerialStudioAdvancedTestGUI:
         self.comm_type_var = tk.StringVar(value="serial")
         comm_combo = ttk.Combobox(comm_frame, textvariable=self.comm_type_var, width=15)
         comm_combo['values'] = [
-            "serial", "tcp_client", "tcp_server", "udp", "udp_multicast"
+            "serial", "tcp_client", "tcp_server", "udp", "udp_multicast", "null", "file", "pipe"
         ]
         comm_combo.state(['readonly'])
         comm_combo.grid(row=0, column=1, sticky=tk.EW, padx=(5, 0))
@@ -122,6 +163,19 @@ class SerialStudioAdvancedTestGUI:
         self.comm_config_frame = ttk.Frame(comm_frame)
         self.comm_config_frame.grid(row=1, column=0, columnspan=4, sticky=tk.EW, pady=(10, 0))
         
+        # 发送队列：生成与写出分离，写阻塞时按策略排队或丢帧，不拖慢发送调度
+        ttk.Label(comm_frame, text="发送队列:").grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
+        self.send_queue_var = tk.StringVar(value=SEND_QUEUE_OFF)
+        queue_combo = ttk.Combobox(comm_frame, textvariable=self.send_queue_var, width=15)
+        queue_combo['values'] = [SEND_QUEUE_OFF] + list(BACKPRESSURE_POLICIES)
+        queue_combo.state(['readonly'])
+        queue_combo.grid(row=2, column=1, sticky=tk.W, padx=(5, 0), pady=(10, 0))
+        
+        # 独立进程：连接和发送循环放到子进程，界面刷新不影响发送速率（连接前选择）
+        self.engine_mode_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(comm_frame, text="独立进程发送", variable=self.engine_mode_var).grid(
+            row=3, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         comm_frame.columnconfigure(1, weight=1)
         
         # 初始化配置界面
@@ -202,7 +256,15 @@ class SerialStudioAdvancedTestGUI:
         ttk.Label(ctrl_frame1, text="持续时间(s):").pack(side=tk.LEFT)
         self.duration_var = tk.StringVar(value="0")
         duration_entry = ttk.Entry(ctrl_frame1, textvariable=self.duration_var, width=8)
-        duration_entry.pack(side=tk.LEFT, padx=(5, 0))
+        duration_entry.pack(side=tk.LEFT, padx=(5, 10))
+        
+        # 合并帧：同一时刻到期的组件拼成一帧、一次写出
+        self.merged_frame_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ctrl_frame1, text="合并帧", variable=self.merged_frame_var).pack(side=tk.LEFT)
+        
+        # 精确定时：到期前短暂忙等，适合亚毫秒级发送间隔（占用一个CPU核心）
+        self.precise_timing_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(ctrl_frame1, text="精确定时", variable=self.precise_timing_var).pack(side=tk.LEFT, padx=(10, 0))
         
         # 当前启用组件显示
         enabled_frame = ttk.Frame(control_frame)
@@ -241,6 +303,14 @@ class SerialStudioAdvancedTestGUI:
         self.preview_auto_scroll = tk.BooleanVar(value=True)
         ttk.Checkbutton(preview_ctrl_frame, text="自动滚动", variable=self.preview_auto_scroll).pack(side=tk.LEFT, padx=(10, 0))
         
+        # 高频发送时只显示每 N 帧中的 1 帧
+        ttk.Label(preview_ctrl_frame, text="显示每N帧:").pack(side=tk.LEFT, padx=(10, 0))
+        self.preview_sample_var = tk.StringVar(value=PREVIEW_SAMPLE_CHOICES[0])
+        sample_combo = ttk.Combobox(preview_ctrl_frame, textvariable=self.preview_sample_var,
+                                    values=PREVIEW_SAMPLE_CHOICES, width=6, state="readonly")
+        sample_combo.pack(side=tk.LEFT, padx=(5, 0))
+        sample_combo.bind('<<ComboboxSelected>>', lambda e: self._apply_preview_sample())
+        
     def _create_log_panel(self, parent):
         """创建日志面板"""
         log_frame = ttk.LabelFrame(parent, text="系统日志", padding=10)
@@ -287,6 +357,8 @@ class SerialStudioAdvancedTestGUI:
             self._create_tcp_config_ui()
         elif comm_type in [CommType.UDP, CommType.UDP_MULTICAST]:
             self._create_udp_config_ui()
+        elif comm_type == CommType.FILE:
+            self._create_file_config_ui()
     
     def _create_serial_config_ui(self):
         """创建串口配置界面"""
@@ -300,7 +372,7 @@ class SerialStudioAdvancedTestGUI:
         self.serial_port_combo.grid(row=0, column=1, sticky=tk.EW, padx=(5, 5))
         
         # 刷新串口按钮
-        refresh_btn = ttk.Button(frame, text="刷新", command=self._refresh_serial_ports, width=8)
+        refresh_btn = ttk.Button(frame, text="刷新", command=lambda: self._refresh_serial_ports(), width=8)
         refresh_btn.grid(row=0, column=2, padx=(0, 10))
         
         # 自动选择默认串口按钮
@@ -355,6 +427,14 @@ class SerialStudioAdvancedTestGUI:
         info_label = ttk.Label(frame, textvariable=self.serial_info_var, foreground="blue")
         info_label.grid(row=2, column=2, columnspan=4, sticky=tk.W, padx=(0, 0), pady=(10, 0))
         
+        # 第四行：虚拟串口（pty），无需硬件
+        self.virtual_serial_var = tk.BooleanVar(value=self.comm_config.virtual_serial)
+        ttk.Checkbutton(frame, text="虚拟串口(pty)", variable=self.virtual_serial_var).grid(
+            row=3, column=0, columnspan=2, sticky=tk.W, pady=(10, 0))
+        self.emulate_baudrate_var = tk.BooleanVar(value=self.comm_config.emulate_baudrate)
+        ttk.Checkbutton(frame, text="模拟波特率", variable=self.emulate_baudrate_var).grid(
+            row=3, column=2, columnspan=2, sticky=tk.W, pady=(10, 0))
+        
         # 配置列权重
         frame.columnconfigure(1, weight=1)
         frame.columnconfigure(3, weight=1)
@@ -363,13 +443,20 @@ class SerialStudioAdvancedTestGUI:
         # 绑定串口选择事件
         self.serial_port_combo.bind('<<ComboboxSelected>>', self._on_serial_port_changed)
         
-        # 初始化串口列表
-        self._refresh_serial_ports()
+        # 初始化串口列表（使用缓存，不重新枚举）
+        self._refresh_serial_ports(rescan=False)
     
-    def _refresh_serial_ports(self):
-        """刷新可用串口列表"""
+    def _refresh_serial_ports(self, rescan: bool = True):
+        """刷新可用串口列表
+        
+        Args:
+            rescan: 是否重新枚举；为 False 时直接使用后台维护的串口缓存
+        """
         try:
-            ports = self.comm_manager.get_available_serial_ports()
+            if rescan:
+                ports = self.comm_manager.refresh_serial_ports()
+            else:
+                ports = self.comm_manager.get_available_serial_ports()
             port_names = [port['device'] for port in ports]
             
             self.serial_port_combo['values'] = port_names
@@ -391,6 +478,13 @@ class SerialStudioAdvancedTestGUI:
         except Exception as e:
             self._log(f"刷新串口列表失败: {e}", "ERROR")
     
+    def _on_serial_port_hotplug(self, event: str, port: dict):
+        """串口插入/拔出"""
+        action = "插入" if event == PORT_ADDED else "拔出"
+        self._log(f"串口{action}: {port['device']} ({port['description']})")
+        if self.comm_config.comm_type == CommType.SERIAL:
+            self._refresh_serial_ports(rescan=False)
+    
     def _auto_select_serial_port(self):
         """自动选择默认串口"""
         try:
@@ -439,8 +533,34 @@ class SerialStudioAdvancedTestGUI:
         self.tcp_port_var = tk.StringVar(value=str(self.comm_config.tcp_port))
         ttk.Entry(frame, textvariable=self.tcp_port_var, width=10).grid(row=0, column=3, sticky=tk.EW, padx=(5, 0))
         
+        # 服务器模式：多客户端广播
+        self.tcp_multi_client_var = tk.BooleanVar(value=self.comm_config.tcp_multi_client)
+        if self.comm_config.comm_type == CommType.TCP_SERVER:
+            ttk.Checkbutton(frame, text="多客户端广播", variable=self.tcp_multi_client_var).grid(
+                row=1, column=0, columnspan=2, sticky=tk.W, pady=(5, 0))
+        
         frame.columnconfigure(1, weight=1)
     
+    def _create_file_config_ui(self):
+        """创建文件输出配置界面"""
+        frame = self.comm_config_frame
+        
+        ttk.Label(frame, text="输出文件:").grid(row=0, column=0, sticky=tk.W)
+        self.file_path_var = tk.StringVar(value=self.comm_config.file_path)
+        ttk.Entry(frame, textvariable=self.file_path_var, width=30).grid(row=0, column=1, sticky=tk.EW, padx=(5, 5))
+        ttk.Button(frame, text="浏览", command=self._browse_output_file, width=8).grid(row=0, column=2)
+        
+        frame.columnconfigure(1, weight=1)
+    
+    def _browse_output_file(self):
+        """选择输出文件"""
+        filename = filedialog.asksaveasfilename(
+            title="选择输出文件",
+            initialfile=self.file_path_var.get()
+        )
+        if filename:
+            self.file_path_var.set(filename)
+    
     def _create_udp_config_ui(self):
         """创建UDP配置界面"""
         frame = self.comm_config_frame
@@ -457,28 +577,114 @@ class SerialStudioAdvancedTestGUI:
         
         frame.columnconfigure(1, weight=1)
     
+    def _is_connected(self) -> bool:
+        return self.engine_connected if self.engine else self.comm_manager.is_connected
+    
     def _toggle_connection(self):
         """切换连接状态"""
-        if not self.comm_manager.is_connected:
+        if not self._is_connected():
+            if self.engine:
+                return  # 引擎正在连接
+            
             # 更新配置
             self._update_comm_config_from_ui()
             
+            if self.engine_mode_var.get():
+                # 独立进程：由引擎子进程建立连接，结果通过事件返回
+                self.engine = EngineProcess()
+                self.engine.start()
+                self.engine.connect(self.comm_config)
+                self._apply_preview_sample()
+                self.conn_status_var.set("连接中...")
+                self.conn_status_label.config(foreground="orange")
+                self.root.after(ENGINE_POLL_MS, self._poll_engine)
+                return
+            
             # 尝试连接
             if self.comm_manager.connect(self.comm_config):
-                self.connect_btn.config(text="断开")
-                self.conn_status_var.set("已连接")
-                self.conn_status_label.config(foreground="green")
-                self._log(f"成功连接到 {self.comm_config.comm_type.value}")
+                self._on_connected(getattr(self.comm_manager.active_connection, 'port', ''))
             else:
                 self._log(f"连接失败: {self.comm_config.comm_type.value}", "ERROR")
         else:
             # 断开连接
-            self.comm_manager.disconnect()
-            self.connect_btn.config(text="连接")
-            self.conn_status_var.set("未连接")
-            self.conn_status_label.config(foreground="red")
+            if self.is_running:
+                self._toggle_sending()
+            if self.engine:
+                self.engine.disconnect()
+                self._close_engine()
+            else:
+                sink_stats = self.comm_manager.get_sink_stats()
+                self.comm_manager.disconnect()
+                if sink_stats:
+                    self._log(f"输出吞吐: {sink_stats.bytes_per_second / 1024:.1f} KB/s, "
+                              f"{sink_stats.frames_per_second:.0f} 帧/秒（共 {sink_stats.frames} 帧）")
+            self._on_disconnected()
             self._log("连接已断开")
     
+    def _on_connected(self, port: str):
+        self.connect_btn.config(text="断开")
+        self.conn_status_var.set("已连接")
+        self.conn_status_label.config(foreground="green")
+        mode = "（独立进程）" if self.engine else ""
+        self._log(f"成功连接到 {self.comm_config.comm_type.value}{mode}")
+        if self.comm_config.comm_type == CommType.SERIAL and self.comm_config.virtual_serial:
+            self._log(f"虚拟串口设备: {port}，请在 Serial Studio 中打开该端口")
+    
+    def _on_disconnected(self):
+        self.connect_btn.config(text="连接")
+        self.conn_status_var.set("未连接")
+        self.conn_status_label.config(foreground="red")
+    
+    def _close_engine(self):
+        """结束引擎子进程，处理其退出前回送的事件"""
+        engine = self.engine
+        self.engine = None
+        self.engine_connected = False
+        self._apply_preview_sample()
+        if engine:
+            self._handle_engine_events(engine.close())
+    
+    def _poll_engine(self):
+        """处理引擎事件并显示帧环中的预览（界面线程中定时执行）"""
+        if not self.engine:
+            return
+        self._handle_engine_events(self.engine.poll_events())
+        if not self.engine:
+            return
+        
+        for frame in self.engine.read_frames():
+            self._update_preview(frame)
+        
+        if not self.engine.alive:
+            self._log("发送引擎进程意外退出", "ERROR")
+            self.is_running = False
+            self.start_btn.config(text="开始发送")
+            self._close_engine()
+            self._on_disconnected()
+            return
+        self.root.after(ENGINE_POLL_MS, self._poll_engine)
+    
+    def _handle_engine_events(self, events: list):
+        for event, *args in events:
+            if event == EVENT_CONNECTED:
+                ok, port = args
+                if ok:
+                    self.engine_connected = True
+                    self._on_connected(port)
+                else:
+                    self._log(f"连接失败: {self.comm_config.comm_type.value}", "ERROR")
+                    self._close_engine()
+                    self._on_disconnected()
+            elif event == EVENT_SENDING:
+                sending, error = args
+                if error:
+                    self._log(f"发送循环错误: {error}", "ERROR")
+                if not sending and self.is_running:
+                    # 持续时间结束或出错
+                    self._toggle_sending()
+            elif event == EVENT_LOG:
+                self._log(*args)
+    
     def _update_comm_config_from_ui(self):
         """从界面更新通讯配置"""
         comm_type = self.comm_config.comm_type
@@ -495,14 +701,27 @@ class SerialStudioAdvancedTestGUI:
                 self.comm_config.parity = parity_value
             self.comm_config.stopbits = float(self.stopbits_var.get())
             self.comm_config.timeout = float(self.timeout_var.get())
+            self.comm_config.virtual_serial = self.virtual_serial_var.get()
+            self.comm_config.emulate_baudrate = self.emulate_baudrate_var.get()
             
         elif comm_type in [CommType.TCP_CLIENT, CommType.TCP_SERVER]:
             self.comm_config.host = self.tcp_host_var.get()
             self.comm_config.tcp_port = int(self.tcp_port_var.get())
+            self.comm_config.tcp_multi_client = self.tcp_multi_client_var.get()
             
         elif comm_type in [CommType.UDP, CommType.UDP_MULTICAST]:
             self.comm_config.host = self.udp_host_var.get()
             self.comm_config.udp_remote_port = int(self.udp_remote_port_var.get())
+            
+        elif comm_type == CommType.FILE:
+            self.comm_config.file_path = self.file_path_var.get()
+        
+        queue_policy = self.send_queue_var.get()
+        if queue_policy == SEND_QUEUE_OFF:
+            self.comm_config.send_queue_size = 0
+        else:
+            self.comm_config.send_queue_size = SEND_QUEUE_SIZE
+            self.comm_config.backpressure = queue_policy
     
     def _load_default_configs(self):
         """加载默认配置"""
@@ -517,6 +736,12 @@ class SerialStudioAdvancedTestGUI:
     
     def _update_component_list(self):
         """更新组件列表显示"""
+        # 通知发送循环重新同步调度
+        if self.send_loop:
+            self.send_loop.set_components(self.component_configs)
+        if self.engine and self.is_running:
+            self.engine.set_components(self.component_configs)
+        
         # 清空现有项目
         for item in self.comp_tree.get_children():
             self.comp_tree.delete(item)
@@ -667,7 +892,7 @@ class SerialStudioAdvancedTestGUI:
         """显示简化的组件配置对话框"""
         dialog = tk.Toplevel(self.root)
         dialog.title("组件配置" if not config else f"编辑组件: {config.name}")
-        dialog.geometry("500x400")
+        dialog.geometry("500x520")
         dialog.transient(self.root)
         dialog.grab_set()
         
@@ -699,6 +924,41 @@ class SerialStudioAdvancedTestGUI:
         
         basic_frame.columnconfigure(1, weight=1)
         
+        # 帧编码
+        frame_frame = ttk.LabelFrame(dialog, text="帧编码", padding=10)
+        frame_frame.pack(fill=tk.X, padx=10)
+        
+        ttk.Label(frame_frame, text="帧格式:").grid(row=0, column=0, sticky=tk.W, pady=2)
+        format_var = tk.StringVar(value=(config.frame_format if config else FrameFormat.TEXT).value)
+        ttk.Combobox(frame_frame, textvariable=format_var, values=[f.value for f in FrameFormat],
+                     width=27, state="readonly").grid(row=0, column=1, sticky=tk.EW, padx=(5, 0), pady=2)
+        
+        # 二进制帧各通道的数值类型（按通道分别指定的配置在未修改此项时保持不变）
+        ttk.Label(frame_frame, text="二进制数值类型:").grid(row=1, column=0, sticky=tk.W, pady=2)
+        declared_types = config.binary_frame.value_types if config else []
+        initial_value_type = declared_types[0] if declared_types else DEFAULT_VALUE_TYPE
+        value_type_var = tk.StringVar(value=initial_value_type)
+        ttk.Combobox(frame_frame, textvariable=value_type_var, values=list(VALUE_TYPES),
+                     width=27, state="readonly").grid(row=1, column=1, sticky=tk.EW, padx=(5, 0), pady=2)
+        
+        # 校验和（紧跟在帧结束分隔符之后）
+        ttk.Label(frame_frame, text="校验和:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        checksum_names = {algorithm.value or "无": algorithm for algorithm in ChecksumAlgorithm}
+        checksum_var = tk.StringVar(value=(config.checksum if config else ChecksumAlgorithm.NONE).value or "无")
+        ttk.Combobox(frame_frame, textvariable=checksum_var, values=list(checksum_names),
+                     width=27, state="readonly").grid(row=2, column=1, sticky=tk.EW, padx=(5, 0), pady=2)
+        
+        # 有效载荷编码（Serial Studio 项目中的解码方式需与此一致）
+        ttk.Label(frame_frame, text="载荷编码:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        decoder_names = {"明文": DecoderMethod.PLAIN_TEXT, "十六进制": DecoderMethod.HEXADECIMAL,
+                         "Base64": DecoderMethod.BASE64}
+        current_decoder = config.decoder if config else DecoderMethod.PLAIN_TEXT
+        decoder_var = tk.StringVar(value=next(n for n, d in decoder_names.items() if d == current_decoder))
+        ttk.Combobox(frame_frame, textvariable=decoder_var, values=list(decoder_names),
+                     width=27, state="readonly").grid(row=3, column=1, sticky=tk.EW, padx=(5, 0), pady=2)
+        
+        frame_frame.columnconfigure(1, weight=1)
+        
         # 按钮
         btn_frame = ttk.Frame(dialog)
         btn_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -714,6 +974,10 @@ class SerialStudioAdvancedTestGUI:
                 frequency = float(frequency_var.get())
                 enabled = enabled_var.get()
                 
+                binary_frame = copy.deepcopy(config.binary_frame) if config else BinaryFrameConfig()
+                if value_type_var.get() != initial_value_type:
+                    binary_frame.value_types = [value_type_var.get()]
+                
                 # 创建新配置（使用原有的数据生成配置或默认配置）
                 new_config = ComponentConfig(
                     name=name,
@@ -722,7 +986,11 @@ class SerialStudioAdvancedTestGUI:
                     frequency=frequency,
                     datasets=config.datasets.copy() if config and config.datasets else [],
                     widget_config=config.widget_config.copy() if config and config.widget_config else {},
-                    data_generation=config.data_generation.copy() if config and config.data_generation else []
+                    data_generation=config.data_generation.copy() if config and config.data_generation else [],
+                    frame_format=FrameFormat(format_var.get()),
+                    binary_frame=binary_frame,
+                    checksum=checksum_names[checksum_var.get()],
+                    decoder=decoder_names[decoder_var.get()]
                 )
                 
                 # 保存配置
@@ -753,7 +1021,7 @@ class SerialStudioAdvancedTestGUI:
     def _toggle_sending(self):
         """切换发送状态"""
         if not self.is_running:
-            if not self.comm_manager.is_connected:
+            if not self._is_connected():
                 messagebox.showwarning("警告", "请先建立连接")
                 return
             
@@ -763,105 +1031,157 @@ class SerialStudioAdvancedTestGUI:
                 messagebox.showwarning("警告", "请至少启用一个数据组件")
                 return
             
+            # 发送间隔为发送循环的最长休眠时间
+            try:
+                interval = int(self.interval_var.get()) / 1000.0
+                duration = float(self.duration_var.get())
+            except ValueError:
+                messagebox.showwarning("警告", "发送间隔和持续时间必须是数字")
+                return
+            if interval <= 0:
+                messagebox.showwarning("警告", "发送间隔必须大于0")
+                return
+            merged = self.merged_frame_var.get()
+            spin = PRECISE_TIMING_SPIN if self.precise_timing_var.get() else 0.0
+            
             # 开始发送
             self.is_running = True
             self.start_btn.config(text="停止发送")
-            self.stats['start_time'] = time.time()
-            self.send_thread = threading.Thread(target=self._send_data_loop, daemon=True)
-            self.send_thread.start()
+            if self.engine:
+                self.engine.start_sending(self.component_configs, interval, duration, merged, spin)
+            else:
+                self.send_loop = SendLoop(
+                    self.component_factory, self.comm_manager, self.comm_config, self.component_configs,
+                    interval=interval, duration=duration, merged=merged, spin=spin,
+                    on_frame=self._on_frame_sent,
+                    on_log=lambda message, level: self.root.after(0, self._log, message, level))
+                self.send_thread = threading.Thread(target=self._send_data_loop, daemon=True)
+                self.send_thread.start()
+            self._schedule_stats_refresh()
             self._log("开始发送数据")
             
         else:
             # 停止发送
             self.is_running = False
+            if self.engine:
+                self.engine.stop_sending()
+            elif self.send_loop:
+                self.send_loop.stop()
             self.start_btn.config(text="开始发送")
             self._log("停止发送数据")
     
     def _send_data_loop(self):
-        """数据发送循环 - 使用模块化的组件工厂"""
+        """发送线程：运行发送循环，持续时间结束或出错后恢复界面状态"""
         try:
-            interval_ms = int(self.interval_var.get())
-            interval_s = interval_ms / 1000.0
-            duration_s = float(self.duration_var.get())
-            
-            start_time = time.time()
-            last_stats_time = start_time
-            
-            while self.is_running:
-                current_time = time.time()
-                
-                # 检查持续时间
-                if duration_s > 0 and (current_time - start_time) >= duration_s:
-                    self.root.after(0, self._toggle_sending)
-                    break
-                
-                # 生成和发送数据 - 使用组件工厂
-                enabled_components = [c for c in self.component_configs if c.enabled]
-                
-                for config in enabled_components:
-                    # 检查组件发送频率
-                    if config.frequency > 0:
-                        time_since_start = current_time - start_time
-                        expected_count = int(time_since_start * config.frequency)
-                        actual_count = getattr(config, '_send_count', 0)
-                        
-                        if expected_count > actual_count:
-                            # 使用组件工厂生成数据
-                            data = self.component_factory.generate_component_data(config)
-                            frame_data = f"${data};"
-                            
-                            # 发送数据
-                            if self.comm_manager.send_data(frame_data, self.comm_config):
-                                self.stats['sent_count'] += 1
-                                config._send_count = getattr(config, '_send_count', 0) + 1
-                                
-                                # 更新预览
-                                self.root.after(0, lambda d=frame_data, n=config.name: self._update_preview(f"[{n}] {d}"))
-                            else:
-                                self.stats['error_count'] += 1
-                                self.root.after(0, lambda d=frame_data: self._log(f"发送失败: {d}", "WARNING"))
-                
-                # 更新统计信息
-                if current_time - last_stats_time >= 1.0:  # 每秒更新一次
-                    elapsed = current_time - start_time
-                    rate = self.stats['sent_count'] / elapsed if elapsed > 0 else 0
-                    stats_text = f"发送: {self.stats['sent_count']} | 失败: {self.stats['error_count']} | 速率: {rate:.1f} msg/s"
-                    self.root.after(0, lambda: self.stats_var.set(stats_text))
-                    last_stats_time = current_time
-                
-                # 全局时间步进
-                self.component_factory.step()
-                
-                # 等待
-                time.sleep(interval_s)
-                
+            self.send_loop.run()
         except Exception as e:
             self.root.after(0, lambda: self._log(f"发送循环错误: {str(e)}", "ERROR"))
+        if self.is_running:
             self.root.after(0, self._toggle_sending)
     
-    def _update_preview(self, data: str):
-        """更新数据预览"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        preview_line = f"[{timestamp}] {data}\n"
-        
-        self.preview_text.insert(tk.END, preview_line)
-        
-        # 限制预览行数
-        lines = int(self.preview_text.index('end-1c').split('.')[0])
-        if lines > 1000:
-            self.preview_text.delete('1.0', '100.0')
+    def _on_frame_sent(self, label: str, frame_data: Union[str, bytes], ok: bool):
+        """发送线程中每次发送后回调：写入预览缓冲或记录失败"""
+        if ok:
+            self._update_preview(f"[{label}] {frame_preview(frame_data)}")
+        else:
+            # 连续失败合并为一条日志，界面处理前只调度一次
+            self._failures += 1
+            self._last_failure = frame_preview(frame_data)
+            if self._failures == 1:
+                self.root.after(TEXT_REFRESH_MS, self._log_failures)
+    
+    def _log_failures(self):
+        count, self._failures = self._failures, 0
+        if count == 1:
+            self._log(f"发送失败: {self._last_failure}", "WARNING")
+        elif count:
+            self._log(f"发送失败 {count} 次，最近一帧: {self._last_failure}", "WARNING")
+    
+    def _schedule_stats_refresh(self):
+        if self._stats_job:
+            self.root.after_cancel(self._stats_job)
+        self._stats_job = self.root.after(STATS_REFRESH_MS, self._refresh_stats)
+    
+    def _refresh_stats(self):
+        """刷新统计信息，发送期间每秒执行一次"""
+        self._stats_job = None
+        queue = None
+        if self.engine:
+            stats = self.engine.stats()
+            sent, errors, rate = stats.sent, stats.errors, stats.rate
+            if self.comm_config.send_queue_size > 0:
+                queue = (stats.queue_depth, stats.queue_dropped)
+        elif self.send_loop:
+            sent, errors, rate = self.send_loop.sent_count, self.send_loop.error_count, self.send_loop.rate
+            queue_stats = self.comm_manager.get_queue_stats()
+            if queue_stats:
+                queue = (queue_stats.depth, queue_stats.dropped)
+        else:
+            return
         
-        # 自动滚动
-        if self.preview_auto_scroll.get():
-            self.preview_text.see(tk.END)
+        stats_text = f"发送: {sent} | 失败: {errors} | 速率: {rate:.1f} msg/s"
+        if queue:
+            stats_text += f" | 队列: {queue[0]} | 丢弃: {queue[1]}"
+        self.stats_var.set(stats_text)
+        if self.is_running:
+            self._schedule_stats_refresh()
+    
+    def _apply_preview_sample(self):
+        """应用预览采样间隔：引擎模式下由子进程采样后才写入帧环，界面缓冲不再重复采样"""
+        sample_every = int(self.preview_sample_var.get())
+        if self.engine:
+            self.engine.set_preview_sample(sample_every)
+            self.preview_buffer.set_sample_every(1)
+        else:
+            self.preview_buffer.set_sample_every(sample_every)
+    
+    def _update_preview(self, data: str):
+        """更新数据预览（可在发送线程中调用，只写入预览缓冲）"""
+        self.preview_buffer.push(data)
+    
+    def _refresh_text_panels(self):
+        """定时把预览和日志缓冲批量插入文本框"""
+        entries = self.preview_buffer.drain()
+        if entries:
+            text = "".join(f"[{datetime.fromtimestamp(t).strftime('%H:%M:%S.%f')[:-3]}] {data}\n"
+                           for t, data in entries)
+            self._preview_lines = self._append_text(self.preview_text, text, self._preview_lines,
+                                                    PREVIEW_MAX_LINES, self.preview_auto_scroll.get())
+        
+        entries = self.log_buffer.drain()
+        if entries:
+            text = "".join(message for _, message in entries)
+            self._log_lines = self._append_text(self.log_text, text, self._log_lines, LOG_MAX_LINES, True)
+        
+        self.root.after(TEXT_REFRESH_MS, self._refresh_text_panels)
+    
+    @staticmethod
+    def _append_text(widget, text: str, lines: int, max_lines: int, scroll: bool) -> int:
+        """一次插入多行并删除超出 max_lines 的最早行，返回文本框中的行数
+        
+        行数由调用方累计，不通过 index('end-1c') 重新统计。
+        """
+        widget.insert(tk.END, text)
+        lines += text.count('\n')
+        if lines > max_lines:
+            widget.delete('1.0', f'{lines - max_lines + 1}.0')
+            lines = max_lines
+        if scroll:
+            widget.see(tk.END)
+        return lines
     
     def _clear_preview(self):
         """清空预览"""
+        self.preview_buffer.clear()
         self.preview_text.delete('1.0', tk.END)
+        self._preview_lines = 0
     
     def _reset_stats(self):
         """重置统计"""
-        self.stats = {'sent_count': 0, 'error_count': 0, 'start_time': time.time()}
+        if self.engine:
+            self.engine.reset_stats()
+        elif self.send_loop:
+            self.send_loop.reset_stats()
         self.stats_var.set("发送: 0 | 失败: 0 | 速率: 0.0 msg/s")
         self._log("统计信息已重置")
     
@@ -880,19 +1200,16 @@ class SerialStudioAdvancedTestGUI:
             log_message = f"[{timestamp}] [{level}] {message}\n"
             
             if hasattr(self, 'log_text'):
-                self.log_text.insert(tk.END, log_message)
-                self.log_text.see(tk.END)
-                
-                # 限制日志行数
-                lines = int(self.log_text.index('end-1c').split('.')[0])
-                if lines > 1000:
-                    self.log_text.delete('1.0', '100.0')
+                # 由界面定时器批量插入
+                self.log_buffer.push(log_message)
             else:
                 print(log_message.strip())  # 在界面未初始化时输出到控制台
     
     def _clear_log(self):
         """清空日志"""
+        self.log_buffer.clear()
         self.log_text.delete('1.0', tk.END)
+        self._log_lines = 0
     
     def run(self):
         """运行GUI"""
@@ -900,6 +1217,10 @@ class SerialStudioAdvancedTestGUI:
             self.root.mainloop()
         finally:
             self.is_running = False
+            if self.send_loop:
+                self.send_loop.stop()
+            if self.engine:
+                self.engine.close()
             self.comm_manager.disconnect()
 
 def main():
@@ -185,6 +185,1662 @@ def test_serial_studio_protocol():
         print(f"✗ Serial Studio协议测试失败: {e}")
         return False
 
+def test_block_generation():
+    """测试批量数据生成接口"""
+    print("\n=== 批量数据生成测试 ===")
+    try:
+        import numpy as np
+        from modules import ComponentGeneratorFactory, DefaultConfigs
+        from modules.components.base import DataGenerator
+        
+        generator = DataGenerator()
+        configs = DefaultConfigs.get_default_component_configs()
+        t = np.arange(1000) / 1000.0
+        
+        success_count = 0
+        for config in configs:
+            block = generator.generate_component_block(config, t)
+            if block.shape == (1000, len(config.data_generation)) and np.isfinite(block).all():
+                success_count += 1
+            else:
+                print(f"✗ {config.name:15} -> 形状或数值异常: {block.shape}")
+        print(f"组件批量生成结果: {success_count}/{len(configs)} 成功")
+        
+        # 确定性规则的批量结果应与逐点公式一致
+        import math
+        from modules import DataGenConfig, DataGenRule
+        sine = DataGenConfig(DataGenRule.SINE_WAVE, -1, 1, frequency=2.0, amplitude=0.8)
+        expected = [0.8 * math.sin(2 * math.pi * 2.0 * x) for x in t[:10]]
+        sine_ok = np.allclose(generator.generate_block(sine, t[:10]), expected)
+        print(f"{'✓' if sine_ok else '✗'} 正弦波批量结果与逐点公式一致")
+        
+        # 自定义函数中的 random.* 在批量求值时每个采样点独立抽样，而不是一个值广播到整块
+        noisy = DataGenConfig(DataGenRule.CUSTOM_FUNCTION, custom_function="random.uniform(0, 1) + 0 * t")
+        values = generator.generate_block(noisy, t)
+        random_ok = len(np.unique(values)) == len(t) and 0 <= values.min() and values.max() < 1
+        print(f"{'✓' if random_ok else '✗'} 自定义函数随机数逐点独立: {len(np.unique(values))} 个不同值")
+        
+        factory = ComponentGeneratorFactory()
+        block = factory.generate_component_block(configs[0], 50)
+        print(f"✓ 工厂批量生成 {configs[0].name}: {block.shape}")
+        
+        return success_count == len(configs) and sine_ok and random_ok and block.shape[0] == 50
+        
+    except Exception as e:
+        print(f"✗ 批量数据生成测试失败: {e}")
+        return False
+
+def test_custom_function_validation():
+    """测试自定义函数表达式的白名单校验"""
+    print("\n=== 自定义函数校验测试 ===")
+    try:
+        from modules import DataGenRule, DataGenConfig
+        from modules.components.base import DataGenerator
+        from modules.config.expressions import ExpressionError
+        
+        generator = DataGenerator()
+        valid = DataGenConfig(DataGenRule.CUSTOM_FUNCTION, -2, 2,
+                              custom_function="abs(sin(2*pi*1.2*t)) + math.cos(t)")
+        value = generator.generate_value(valid)
+        print(f"✓ 合法表达式 -> {value:.4f}")
+        
+        rejected = 0
+        # 改变随机流状态的函数（random.seed 等）同样被拒绝，以免破坏按通道种子派生的随机流
+        bad_expressions = ['__import__("os").getcwd()', 't.__class__', 'open("x")', 'sin(',
+                           'random.seed(1)', 'random.setstate(0)', 'random.getstate()']
+        for expression in bad_expressions:
+            try:
+                DataGenConfig(DataGenRule.CUSTOM_FUNCTION, custom_function=expression)
+                print(f"✗ 未拒绝非法表达式: {expression}")
+            except ExpressionError:
+                rejected += 1
+        
+        print(f"非法表达式拒绝结果: {rejected}/{len(bad_expressions)}")
+        
+        # 允许的抽样函数在批量求值时都有向量化实现
+        from modules.config.expressions import RANDOM_ATTRIBUTES
+        from modules.components.rng import VectorRandom
+        vectorized = all(hasattr(VectorRandom, name) for name in RANDOM_ATTRIBUTES)
+        print(f"{'✓' if vectorized else '✗'} random 抽样函数均支持批量求值")
+        return rejected == len(bad_expressions) and vectorized
+        
+    except Exception as e:
+        print(f"✗ 自定义函数校验测试失败: {e}")
+        return False
+
+def test_precompiled_samplers():
+    """测试预编译采样器与批量接口一致，且修改配置后失效"""
+    print("\n=== 预编译采样器测试 ===")
+    try:
+        import numpy as np
+        from modules import DataGenRule, DataGenConfig
+        from modules.components.base import DataGenerator
+        from modules.components.samplers import get_sampler
+        
+        generator = DataGenerator()
+        t = np.linspace(0, 10, 200)
+        deterministic_rules = [
+            DataGenRule.CONSTANT, DataGenRule.SINE_WAVE, DataGenRule.COSINE_WAVE,
+            DataGenRule.SQUARE_WAVE, DataGenRule.SAWTOOTH_WAVE, DataGenRule.TRIANGLE_WAVE,
+            DataGenRule.LINEAR_INCREASE, DataGenRule.LINEAR_DECREASE,
+            DataGenRule.EXPONENTIAL, DataGenRule.LOGARITHMIC
+        ]
+        
+        success_count = 0
+        for rule in deterministic_rules:
+            config = DataGenConfig(rule, -1, 3, amplitude=1.5, frequency=0.7, phase=0.3, step_size=0.2)
+            sampler = get_sampler(config)
+            scalar = [sampler(x) for x in t]
+            if np.allclose(scalar, generator.generate_block(config, t)):
+                success_count += 1
+            else:
+                print(f"✗ {rule.value:15} -> 采样器与批量结果不一致")
+        print(f"采样器一致性结果: {success_count}/{len(deterministic_rules)} 成功")
+        
+        config = DataGenConfig(DataGenRule.CONSTANT, 1.0)
+        before = generator.generate_value(config)
+        config.min_value = 2.0
+        after = generator.generate_value(config)
+        invalidated = (before, after) == (1.0, 2.0)
+        print(f"{'✓' if invalidated else '✗'} 修改配置后采样器重新编译")
+        
+        # 原地修改 parameters 字典同样使采样器失效
+        config = DataGenConfig(DataGenRule.SQUARE_WAVE, -1, 1, frequency=100.0)
+        plain = get_sampler(config).table is None
+        config.parameters['band_limited'] = True
+        config.parameters['sample_rate'] = 1000
+        in_place = plain and get_sampler(config).table is not None
+        print(f"{'✓' if in_place else '✗'} 原地修改 parameters 后采样器重新编译")
+        
+        return success_count == len(deterministic_rules) and invalidated and in_place
+        
+    except Exception as e:
+        print(f"✗ 预编译采样器测试失败: {e}")
+        return False
+
+def test_virtual_clock():
+    """测试虚拟时钟：按采样序号推进，快于实时且可复现"""
+    print("\n=== 虚拟时钟测试 ===")
+    try:
+        from modules import ComponentGeneratorFactory, DefaultConfigs, VirtualClock
+        
+        config = next(c for c in DefaultConfigs.get_default_component_configs()
+                      if c.name.startswith("函数发生器"))
+        
+        runs = []
+        start = time.time()
+        for _ in range(2):
+            factory = ComponentGeneratorFactory(clock=VirtualClock(config.frequency))
+            runs.append(list(factory.generate_frames(config, 3600)))
+        elapsed = time.time() - start
+        
+        final_time = factory.data_generator.clock.now()
+        print(f"生成 2 x 3600 帧（各 {final_time:.1f}s 虚拟时间）耗时 {elapsed:.3f}s")
+        
+        reproducible = runs[0] == runs[1]
+        exact = final_time == 3.6
+        print(f"{'✓' if reproducible else '✗'} 两次运行结果完全一致")
+        print(f"{'✓' if exact else '✗'} 每步恰好前进 1/rate 秒")
+        return reproducible and exact
+        
+    except Exception as e:
+        print(f"✗ 虚拟时钟测试失败: {e}")
+        return False
+
+def test_seeded_streams():
+    """测试随机流：相同种子可复现，按组件拆分生成与单进程结果逐位一致"""
+    print("\n=== 随机流复现测试 ===")
+    try:
+        from modules import ComponentGeneratorFactory, DefaultConfigs, VirtualClock
+        
+        configs = DefaultConfigs.get_default_component_configs()
+        
+        def run(selected):
+            factory = ComponentGeneratorFactory(clock=VirtualClock(100.0), seed=1234)
+            frames = {c.name: [] for c in selected}
+            for _ in range(50):
+                for config in selected:
+                    frames[config.name].append(factory.generate_component_data(config))
+                factory.step()
+            return frames
+        
+        combined = run(configs)
+        # 模拟分片：每个组件在独立的工厂中生成
+        sharded = {}
+        for config in configs:
+            sharded.update(run([config]))
+        
+        identical = combined == sharded
+        print(f"{'✓' if identical else '✗'} 分片生成与整体生成结果一致")
+        
+        different_seed = ComponentGeneratorFactory(clock=VirtualClock(100.0), seed=4321)
+        other = different_seed.generate_component_data(configs[0])
+        varies = other != combined[configs[0].name][0]
+        print(f"{'✓' if varies else '✗'} 不同种子产生不同数据")
+        return identical and varies
+        
+    except Exception as e:
+        print(f"✗ 随机流复现测试失败: {e}")
+        return False
+
+def test_phase_oscillators():
+    """测试相位累加振荡器的精度和带限波表"""
+    print("\n=== 相位累加振荡器测试 ===")
+    try:
+        import math
+        import numpy as np
+        from modules import DataGenRule, DataGenConfig
+        from modules.components.oscillators import PhaseOscillator, TABLE_SIZE
+        
+        # 波表插值误差
+        oscillator = PhaseOscillator(DataGenConfig(DataGenRule.SINE_WAVE, -1, 1, frequency=7.0))
+        t = np.arange(5000) / 1000.0
+        error = max(abs(oscillator(x) - math.sin(2 * math.pi * 7.0 * x)) for x in t)
+        accurate = error < 1e-6
+        print(f"{'✓' if accurate else '✗'} 正弦波表插值最大误差: {error:.2e}")
+        
+        # 长时间运行（约3天后）相位仍与精确相位一致
+        rate, frequency = 1000, 5.0
+        start_index = 3 * 24 * 3600 * rate
+        oscillator = PhaseOscillator(DataGenConfig(DataGenRule.SAWTOOTH_WAVE, -1, 1, frequency=frequency))
+        drift = 0.0
+        for n in range(start_index, start_index + 2000):
+            oscillator(n / rate)
+            exact_phase = (n * 5 % rate) / rate  # 整数运算得到的精确相位
+            offset = abs(oscillator.phase - exact_phase)
+            drift = max(drift, min(offset, 1 - offset))
+        stable = drift < 1e-6
+        print(f"{'✓' if stable else '✗'} 长时间运行后相位偏差: {drift:.2e}")
+        
+        # 带限方波不包含超过奈奎斯特频率的谐波
+        config = DataGenConfig(DataGenRule.SQUARE_WAVE, -1, 1, frequency=100.0,
+                               parameters={'band_limited': True, 'sample_rate': 1000})
+        table = PhaseOscillator(config).table[:TABLE_SIZE]
+        spectrum = np.abs(np.fft.rfft(table)) / TABLE_SIZE
+        band_limited = spectrum[6:].max() < 1e-9 and spectrum[5] > 0.01
+        print(f"{'✓' if band_limited else '✗'} 带限方波只包含5次以内谐波")
+        
+        # 低频时谐波数受波表长度限制
+        config = DataGenConfig(DataGenRule.SAWTOOTH_WAVE, -1, 1, frequency=0.01,
+                               parameters={'band_limited': True, 'sample_rate': 1000})
+        harmonics = PhaseOscillator(config)._band_limit_harmonics(config)
+        capped = harmonics == TABLE_SIZE // 2
+        print(f"{'✓' if capped else '✗'} 低频带限谐波数上限: {harmonics}")
+        
+        return accurate and stable and band_limited and capped
+        
+    except Exception as e:
+        print(f"✗ 相位累加振荡器测试失败: {e}")
+        return False
+
+def test_lorenz_attractor():
+    """测试洛伦兹吸引子：三个通道共享RK4轨迹并满足系统方程"""
+    print("\n=== 洛伦兹吸引子测试 ===")
+    try:
+        import numpy as np
+        from modules import ComponentGeneratorFactory, DefaultConfigs, VirtualClock
+        
+        config = next(c for c in DefaultConfigs.get_default_component_configs()
+                      if c.name.startswith("洛伦兹吸引子"))
+        rate = 1000.0
+        factory = ComponentGeneratorFactory(clock=VirtualClock(rate))
+        
+        start = time.time()
+        points = np.array([[float(v) for v in frame.split(',')]
+                           for frame in factory.generate_frames(config, 5000)])
+        elapsed = time.time() - start
+        print(f"1kHz 生成 5000 个3D点耗时 {elapsed:.3f}s")
+        
+        x, y, z = points[:, 0], points[:, 1], points[:, 2]
+        bounded = np.abs(x).max() < 25 and np.abs(y).max() < 35 and z.min() > -1 and z.max() < 55
+        print(f"{'✓' if bounded else '✗'} 轨迹位于吸引子范围内")
+        
+        # dz/dt = x*y - beta*z（每个采样点推进 1/rate 秒，speed=1）
+        dz = np.gradient(z[1000:], 1 / rate)
+        expected = x[1000:] * y[1000:] - 8 / 3 * z[1000:]
+        correlation = np.corrcoef(dz, expected)[0, 1]
+        coupled = correlation > 0.99
+        print(f"{'✓' if coupled else '✗'} X/Y/Z 来自同一轨迹 (相关系数 {correlation:.4f})")
+        
+        # 输出按通道量程裁剪
+        from modules import DataGenConfig, DataGenRule
+        from modules.components.base import DataGenerator
+        narrow = DataGenConfig(DataGenRule.ODE_SYSTEM, -5, 5, parameters={'system': 'lorenz', 'axis': 0})
+        values = DataGenerator().generate_block(narrow, np.arange(5000) / rate)
+        clipped = values.min() == -5 and values.max() == 5
+        print(f"{'✓' if clipped else '✗'} 轨迹输出裁剪到 [{values.min():.0f}, {values.max():.0f}]")
+        
+        # 时钟已运行 1 小时后才首次采样：从该时刻开始积分，不从 0 补算
+        from modules.components.ode import ODEIntegrator
+        late = DataGenerator()
+        start = time.perf_counter()
+        blocks = [late.generate_block(channel, 3600 + np.arange(1000) / rate, (config.name, i))
+                  for i, channel in enumerate(config.data_generation)]
+        integrator = ODEIntegrator('lorenz')
+        state = integrator.state_at(3600.0)
+        late_elapsed = time.perf_counter() - start
+        in_range = all(channel.min_value <= block.min() and block.max() <= channel.max_value
+                       for channel, block in zip(config.data_generation, blocks))
+        late_ok = (late_elapsed < 0.5 and in_range and np.isfinite(state).all()
+                   and len(integrator.trajectory) <= 2 * integrator.block_size + 1)
+        print(f"{'✓' if late_ok else '✗'} t=3600s 首次采样耗时 {late_elapsed * 1000:.1f}ms，输出位于量程内")
+
+        return bounded and coupled and clipped and late_ok
+
+    except Exception as e:
+        print(f"✗ 洛伦兹吸引子测试失败: {e}")
+        return False
+
+def test_frame_formatter():
+    """测试批量帧格式化：按通道精度渲染到预分配缓冲区"""
+    print("\n=== 批量帧格式化测试 ===")
+    try:
+        import numpy as np
+        from modules import (ComponentGeneratorFactory, ComponentConfig, ComponentType,
+                             DataGenConfig, DataGenRule, FrameFormatter, VirtualClock)
+        
+        formatter = FrameFormatter([3, 2, 1])
+        block = np.array([[1.23456, -2.5, 30.04], [0.0, 100.0, -0.25]])
+        rendered = formatter.render(block)
+        expected = b"$1.235,-2.50,30.0;\n$0.000,100.00,-0.2;\n"
+        template_ok = rendered == expected
+        print(f"{'✓' if template_ok else '✗'} 定点模板输出: {rendered!r}")
+        
+        # 通用格式与定点格式结果一致，且可写入缓冲区中间位置
+        general = FrameFormatter([3, 2, '.1f'])
+        buffer = bytearray(b'#' * 8)
+        written = general.render_into(block, buffer, 4)
+        general_ok = bytes(buffer[4:4 + written]) == expected and buffer[:4] == b'####'
+        print(f"{'✓' if general_ok else '✗'} 通用格式路径与定点路径一致")
+        
+        # 预分配缓冲区容量充足时原地写入，长度不变
+        rows = 5000
+        large = np.random.default_rng(0).normal(0, 10, (rows, 3))
+        preallocated = bytearray(formatter.estimate_size(rows))
+        size = len(preallocated)
+        written = formatter.render_into(large, preallocated)
+        inplace_ok = len(preallocated) == size and preallocated[:written].count(b'\n') == rows
+        print(f"{'✓' if inplace_ok else '✗'} 预分配缓冲区原地写入 {written} 字节")
+        
+        # 组件批量渲染与逐帧生成的文本格式一致
+        config = ComponentConfig(
+            name="格式化测试",
+            component_type=ComponentType.ACCELEROMETER,
+            data_generation=[
+                DataGenConfig(DataGenRule.LINEAR_INCREASE, 0, 100, step_size=0.5),
+                DataGenConfig(DataGenRule.CONSTANT, -1.23456, -1.23456),
+                DataGenConfig(DataGenRule.LINEAR_DECREASE, 0, 100, step_size=0.25)
+            ]
+        )
+        frame_factory = ComponentGeneratorFactory(clock=VirtualClock(config.frequency))
+        frames = b''.join(f"${frame};\n".encode('utf-8')
+                          for frame in frame_factory.generate_frames(config, 100))
+        block_factory = ComponentGeneratorFactory(clock=VirtualClock(config.frequency))
+        output = bytearray()
+        block_factory.render_component_block(config, 100, output)
+        matches = bytes(output) == frames
+        print(f"{'✓' if matches else '✗'} 组件批量渲染与逐帧输出一致")
+        
+        start = time.time()
+        for _ in range(10):
+            formatter.render_into(large, preallocated)
+        elapsed = (time.time() - start) / 10
+        print(f"渲染 {rows} 帧耗时 {elapsed * 1000:.1f}ms ({rows / elapsed:.0f} 帧/秒)")
+        
+        return template_ok and general_ok and inplace_ok and matches
+        
+    except Exception as e:
+        print(f"✗ 批量帧格式化测试失败: {e}")
+        return False
+
+def test_binary_frames():
+    """测试二进制帧：struct 单帧打包与整块打包一致，并可按布局还原"""
+    print("\n=== 二进制帧测试 ===")
+    try:
+        import struct
+        import numpy as np
+        from modules import (ComponentGeneratorFactory, ComponentConfig, ComponentType, DataGenConfig,
+                             DataGenRule, FrameFormat, BinaryFrameConfig, BinaryFrameLayout, VirtualClock)
+        
+        layout = BinaryFrameLayout(['float32', 'int16', 'uint8'], scales=[1.0, 100.0, 1.0],
+                                   start=b'\xaa\x55', end=b'\r\n')
+        block = np.array([[1.5, -2.34, 7.0], [0.25, 400.0, 300.0]])
+        packed = layout.render(block)
+        single = layout.pack(block[0]) + layout.pack(block[1])
+        expected = struct.pack('<2sfhB2s', b'\xaa\x55', 1.5, -234, 7, b'\r\n')
+        layout_ok = layout.frame_size == 11 and packed == single and packed[:11] == expected
+        print(f"{'✓' if layout_ok else '✗'} 单帧 struct 与整块 NumPy 打包一致 (帧长 {layout.frame_size})")
+        
+        # int16 饱和: 400*100 超出范围；uint8 饱和: 300 -> 255
+        restored = layout.unpack(packed)
+        saturated = restored[1, 1] == 32767 / 100 and restored[1, 2] == 255
+        print(f"{'✓' if saturated else '✗'} 整数类型缩放取整并饱和")
+        
+        config = ComponentConfig(
+            name="二进制测试",
+            component_type=ComponentType.ACCELEROMETER,
+            frequency=100.0,
+            data_generation=[
+                DataGenConfig(DataGenRule.SINE_WAVE, -2, 2, amplitude=2.0, frequency=1.0),
+                DataGenConfig(DataGenRule.COSINE_WAVE, -2, 2, amplitude=2.0, frequency=1.0),
+                DataGenConfig(DataGenRule.NOISE, 8, 11, noise_level=0.1)
+            ],
+            frame_format=FrameFormat.BINARY,
+            binary_frame=BinaryFrameConfig(value_types=['int16'], scales=[1000.0])
+        )
+        rows = 1000
+        factory = ComponentGeneratorFactory(clock=VirtualClock(config.frequency), seed=1)
+        buffer = bytearray(factory.get_formatter(config).estimate_size(rows))
+        written = factory.render_component_block(config, rows, buffer)
+        
+        reference = ComponentGeneratorFactory(clock=VirtualClock(config.frequency), seed=1)
+        values = reference.generate_component_block(config, rows)
+        decoded = factory.get_formatter(config).unpack(bytes(buffer[:written]))
+        roundtrip = written == rows * 8 and np.allclose(decoded, values, atol=0.0005 + 1e-9)
+        print(f"{'✓' if roundtrip else '✗'} 组件整块二进制编码可还原 ({written} 字节)")
+        
+        config.frame_format = FrameFormat.TEXT
+        text = bytearray()
+        text_size = reference.render_component_block(config, rows, text)
+        print(f"同样 {rows} 帧: 文本 {text_size} 字节, 二进制 {written} 字节 ({text_size / written:.1f}x)")
+        
+        return layout_ok and saturated and roundtrip
+        
+    except Exception as e:
+        print(f"✗ 二进制帧测试失败: {e}")
+        return False
+
+def test_checksums():
+    """测试校验和：与插件端 Checksum.ts 算法一致，并可附加到文本和二进制帧"""
+    print("\n=== 帧校验和测试 ===")
+    try:
+        import numpy as np
+        from modules import (ComponentGeneratorFactory, ComponentConfig, ComponentType, DataGenConfig,
+                             DataGenRule, FrameFormat, ChecksumAlgorithm, VirtualClock)
+        from modules.protocol import checksum
+        
+        # 标准校验值
+        reference = b'123456789'
+        known = {
+            'CRC-8': 'f4', 'CRC-16': '31c3', 'CRC-32': 'cbf43926', 'XOR': '31',
+            'MD5': '25f9e794323b453885f5181f1b624d0b'
+        }
+        known_ok = all(checksum.calculate(name, reference).hex() == value for name, value in known.items())
+        print(f"{'✓' if known_ok else '✗'} CRC/XOR/MD5 标准校验值")
+        
+        # 按 Checksum.ts 的逐字节循环实现对照 Fletcher
+        def ts_fletcher16(data):
+            sum1 = sum2 = 0
+            for byte in data:
+                sum1 = (sum1 + byte) % 255
+                sum2 = (sum2 + sum1) % 255
+            return bytes([sum2, sum1])
+        
+        def ts_fletcher32(data):
+            data = data + b'\x00' if len(data) % 2 else data
+            sum1 = sum2 = 0
+            for i in range(0, len(data), 2):
+                sum1 = (sum1 + int.from_bytes(data[i:i + 2], 'big')) % 65535
+                sum2 = (sum2 + sum1) % 65535
+            return sum2.to_bytes(2, 'big') + sum1.to_bytes(2, 'big')
+        
+        payloads = np.random.default_rng(3).integers(0, 256, (200, 17), dtype=np.uint8)
+        rows = [row.tobytes() for row in payloads]
+        fletcher_ok = all(checksum.calculate('Fletcher-16', row) == ts_fletcher16(row) and
+                          checksum.calculate('fletcher_32', row) == ts_fletcher32(row) for row in rows)
+        print(f"{'✓' if fletcher_ok else '✗'} Fletcher-16/32 与插件端实现一致")
+        
+        block_ok = all(
+            checksum.calculate_block(algorithm, payloads).tobytes() ==
+            b''.join(checksum.calculate(algorithm, row) for row in rows)
+            for algorithm in ChecksumAlgorithm
+        )
+        print(f"{'✓' if block_ok else '✗'} 整块向量化计算与单帧计算一致")
+        
+        # 帧附加校验和: $载荷;校验和
+        config = ComponentConfig(
+            name="校验和测试",
+            component_type=ComponentType.GYROSCOPE,
+            frequency=100.0,
+            data_generation=[DataGenConfig(DataGenRule.SINE_WAVE, -90, 90, amplitude=90.0)] * 3,
+            checksum=ChecksumAlgorithm.CRC16
+        )
+        factory = ComponentGeneratorFactory(clock=VirtualClock(config.frequency))
+        text = bytearray()
+        factory.render_component_block(config, 50, text)
+        frames = bytes(text).split(b'\n')[:-1]
+        text_ok = len(frames) == 50 and all(
+            checksum.verify('CRC-16', frame[1:frame.index(b';')], frame[frame.index(b';') + 1:])
+            for frame in frames
+        )
+        print(f"{'✓' if text_ok else '✗'} 文本帧校验和: {frames[0]!r}")
+        
+        config.frame_format = FrameFormat.BINARY
+        layout = factory.get_formatter(config)
+        binary = layout.render(factory.generate_component_block(config, 50))
+        size = layout.frame_size
+        binary_ok = all(
+            checksum.verify('CRC-16', binary[i + layout.payload_start:i + layout.payload_end], binary[i + size - 2:i + size])
+            for i in range(0, len(binary), size)
+        ) and layout.pack(layout.unpack(binary[:size])[0]) == binary[:size]
+        print(f"{'✓' if binary_ok else '✗'} 二进制帧校验和 (帧长 {size})")
+        
+        for name, rates in checksum.benchmark(frames=5000).items():
+            print(f"  {name:12} 单帧 {rates['single']:>10.0f} 帧/秒  整块 {rates['block']:>10.0f} 帧/秒")
+        
+        return known_ok and fletcher_ok and block_ok and text_ok and binary_ok
+        
+    except Exception as e:
+        print(f"✗ 帧校验和测试失败: {e}")
+        return False
+
+def test_wire_encoders():
+    """测试十六进制/Base64 线路编码：整块编码结果与逐帧编码一致并统计线路字节"""
+    print("\n=== 线路编码测试 ===")
+    try:
+        import base64
+        import numpy as np
+        from modules import (ComponentGeneratorFactory, DefaultConfigs, DecoderMethod,
+                             FrameFormat, ChecksumAlgorithm, VirtualClock)
+        from modules.protocol.encoders import create_encoder
+        from modules.protocol import checksum
+        
+        payloads = np.random.default_rng(5).integers(0, 256, (64, 13), dtype=np.uint8)
+        block_ok = True
+        for method in DecoderMethod:
+            encoder = create_encoder(method)
+            encoded = encoder.encode_block(payloads)
+            expected = b''.join(encoder.encode(row.tobytes()) for row in payloads)
+            decoded = encoder.decode_block(encoded, payloads.shape[1])
+            block_ok &= encoded.tobytes() == expected and np.array_equal(decoded, payloads)
+        block_ok &= create_encoder(2).encode(b'ab') == base64.b64encode(b'ab')
+        print(f"{'✓' if block_ok else '✗'} 整块编码/解码与逐帧一致")
+        
+        config = next(c for c in DefaultConfigs.get_default_component_configs()
+                      if c.name.startswith("多通道ADC"))
+        rows = 2000
+        sizes = {}
+        frames_ok = True
+        for frame_format in FrameFormat:
+            for method in DecoderMethod:
+                config.frame_format = frame_format
+                config.decoder = method
+                config.checksum = ChecksumAlgorithm.CRC16
+                factory = ComponentGeneratorFactory(clock=VirtualClock(config.frequency), seed=7)
+                formatter = factory.get_formatter(config)
+                buffer = bytearray()
+                written = factory.render_component_block(config, rows, buffer)
+                sizes[(frame_format, method)] = formatter.stats.bytes_per_frame
+                frames_ok &= formatter.stats.wire_bytes == written and formatter.stats.frames == rows
+                
+                data = bytes(buffer)
+                if frame_format == FrameFormat.BINARY:
+                    restored = formatter.unpack(data)
+                    frames_ok &= restored.shape == (rows, len(config.data_generation))
+                    first = data[:formatter.frame_size]
+                else:
+                    first = data.split(b'\n', 1)[0]
+                encoded = first[1:first.index(b';')]
+                frames_ok &= checksum.verify('CRC-16', encoded, first[first.index(b';') + 1:][:2])
+                if method == DecoderMethod.HEXADECIMAL:
+                    frames_ok &= all(chr(c) in '0123456789abcdef' for c in encoded)
+        config.decoder = DecoderMethod.PLAIN_TEXT
+        config.frame_format = FrameFormat.TEXT
+        config.checksum = ChecksumAlgorithm.NONE
+        print(f"{'✓' if frames_ok else '✗'} 文本/二进制帧在三种编码下均可校验")
+        
+        for (frame_format, method), size in sizes.items():
+            print(f"  {frame_format.value:6} {method.name:11} {size:6.1f} 字节/帧")
+        
+        return block_ok and frames_ok
+        
+    except Exception as e:
+        print(f"✗ 线路编码测试失败: {e}")
+        return False
+
+def test_merged_frame():
+    """测试合并帧：同一时刻到期的组件按数据集位置拼为一帧"""
+    print("\n=== 合并帧测试 ===")
+    try:
+        from modules import (ComponentGeneratorFactory, ComponentConfig, ComponentType, DataGenConfig,
+                             DataGenRule, DefaultConfigs, MergedFrameBuilder, VirtualClock)
+        
+        builder = MergedFrameBuilder()
+        accel = ComponentConfig("加速度", ComponentType.ACCELEROMETER)
+        leds = ComponentConfig("LED", ComponentType.LED_PANEL,
+                               datasets=[{"index": 2}, {"index": 1}, {"index": 3}])
+        first = builder.add_component(accel, "1.0,2.0,3.0")
+        second = builder.add_component(leds, "a,b,c")
+        layout_ok = first == [1, 2, 3] and second == [5, 4, 6] and builder.render() == "$1.0,2.0,3.0,b,a,c;"
+        print(f"{'✓' if layout_ok else '✗'} 数据集位置映射: {builder.index_map}")
+        
+        builder.update("加速度", "4.0,5.0,6.0")
+        hold_ok = builder.render() == "$4.0,5.0,6.0,b,a,c;"
+        print(f"{'✓' if hold_ok else '✗'} 未到期组件沿用上一次数值")
+        
+        # 按 GUI 发送循环的到期规则模拟 1 秒：逐组件发送与合并发送的写次数
+        configs = [c for c in DefaultConfigs.get_default_component_configs()
+                   if c.component_type != ComponentType.TERMINAL][:10]
+        factory = ComponentGeneratorFactory(clock=VirtualClock(1000.0))
+        merged = MergedFrameBuilder()
+        for config in configs:
+            merged.add_component(config, factory.generate_component_data(config))
+        counts = {config.name: 0 for config in configs}
+        separate_writes = merged_writes = 0
+        tick = 0.001
+        for step in range(1, 1001):
+            due = [c for c in configs if int(step * tick * c.frequency) > counts[c.name]]
+            for config in due:
+                counts[config.name] += 1
+                merged.update(config.name, factory.generate_component_data(config))
+            separate_writes += len(due)
+            merged_writes += 1 if due else 0
+            factory.step()
+        frame = merged.render()
+        width_ok = frame.count(',') + 1 == merged.width
+        print(f"{'✓' if width_ok else '✗'} {len(configs)} 个组件合并帧宽度 {merged.width}")
+        print(f"1秒内写次数: 逐组件 {separate_writes}，合并帧 {merged_writes}")
+        
+        return layout_ok and hold_ok and width_ok and merged_writes < separate_writes
+        
+    except Exception as e:
+        print(f"✗ 合并帧测试失败: {e}")
+        return False
+
+def test_write_coalescing():
+    """测试写合并：按字节阈值或最大延迟写出，UDP 数据报不拆分帧"""
+    print("\n=== 写合并测试 ===")
+    try:
+        import socket
+        import threading
+        import time
+        from modules import CoalescingWriter, CommConfig, CommType, CommunicationManager
+        
+        writes = []
+        writer = CoalescingWriter(writes.append, max_bytes=100, max_latency=0.02)
+        for i in range(30):
+            writer.write(b"$1.00,2.00;\n")
+        size_ok = writer.stats.flush_reasons.get('size') == 3 and len(writes) == 3
+        time.sleep(0.1)
+        latency_ok = writer.stats.flush_reasons.get('latency') == 1 and len(writes) == 4
+        writer.close()
+        order_ok = b"".join(writes) == b"$1.00,2.00;\n" * 30
+        print(f"{'✓' if size_ok and latency_ok and order_ok else '✗'} 30帧合并为 {writer.stats.writes} 次写出: "
+              f"{writer.stats.flush_reasons}，最长等待 {writer.stats.max_delay * 1000:.1f}ms")
+        
+        # UDP 回环：每个数据报只包含完整帧且不超过阈值
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(1.0)
+        config = CommConfig(CommType.UDP, host='127.0.0.1', udp_local_port=0,
+                            udp_remote_port=receiver.getsockname()[1],
+                            buffer_size=50, write_coalescing=True, coalesce_latency=0.01)
+        manager = CommunicationManager()
+        frame = b"$12.345,67.890;\n"
+        connected = manager.connect(config)
+        for _ in range(20):
+            manager.send_data(frame, config)
+        stats = manager.get_write_stats()
+        manager.disconnect()
+        datagrams = []
+        try:
+            while True:
+                datagrams.append(receiver.recv(65536))
+        except socket.timeout:
+            pass
+        receiver.close()
+        udp_ok = (connected and b"".join(datagrams) == frame * 20 and
+                  all(len(d) <= 50 and len(d) % len(frame) == 0 for d in datagrams))
+        print(f"{'✓' if udp_ok else '✗'} UDP 20帧 -> {len(datagrams)} 个数据报，刷新原因 {stats.flush_reasons}")
+        
+        # 写出在锁外进行：慢速写出期间仍可提交新帧
+        release = threading.Event()
+        slow_writes = []
+        def slow_write(data):
+            release.wait(1.0)
+            slow_writes.append(data)
+        writer = CoalescingWriter(slow_write, max_bytes=10, max_latency=1.0)
+        flusher = threading.Thread(target=writer.write, args=(b"0123456789",))
+        flusher.start()
+        time.sleep(0.05)
+        started = time.perf_counter()
+        writer.write(b"abc")
+        submit_time = time.perf_counter() - started
+        release.set()
+        flusher.join()
+        writer.close()
+        unblocked_ok = submit_time < 0.5 and b"".join(slow_writes) == b"0123456789abc"
+        print(f"{'✓' if unblocked_ok else '✗'} 慢速写出期间提交耗时 {submit_time * 1000:.1f}ms")
+
+        # 写出失败计入统计，并在下一次提交时抛给调用方
+        def failing_write(data):
+            raise OSError("设备已断开")
+        writer = CoalescingWriter(failing_write, max_bytes=4, max_latency=1.0)
+        writer.write(b"1234")
+        try:
+            writer.write(b"5678")
+            error_ok = False
+        except RuntimeError:
+            error_ok = writer.stats.errors == 1 and isinstance(writer.last_error, OSError)
+        writer.close()
+        manager = CommunicationManager()
+        manager.is_connected = True
+        manager.active_connection = object()
+        manager.writer = CoalescingWriter(failing_write, max_bytes=4, max_latency=1.0)
+        sink_config = CommConfig(CommType.NULL)
+        first = manager.send_data(b"1234", sink_config)
+        second = manager.send_data(b"5678", sink_config)
+        manager.writer.close()
+        error_ok = error_ok and first and not second
+        print(f"{'✓' if error_ok else '✗'} 写出失败: 统计 {writer.stats.errors} 次，下一次发送返回 {second}")
+
+        # 数据报模式下超过上限的单帧直接拒绝
+        writer = CoalescingWriter(writes.append, max_bytes=50, datagram=True, max_datagram=64)
+        try:
+            writer.write(b"x" * 65)
+            oversize_ok = False
+        except ValueError:
+            oversize_ok = writer.stats.frames == 0
+        writer.close()
+        print(f"{'✓' if oversize_ok else '✗'} 超长数据报被拒绝")
+
+        return size_ok and latency_ok and order_ok and udp_ok and unblocked_ok and error_ok and oversize_ok
+
+    except Exception as e:
+        print(f"✗ 写合并测试失败: {e}")
+        return False
+
+def test_async_transport():
+    """测试异步通讯后端：一个事件循环同时驱动 TCP 服务器、TCP 客户端和 UDP"""
+    print("\n=== 异步通讯测试 ===")
+    try:
+        import asyncio
+        import socket
+        from modules import AsyncCommunicationManager, CommConfig, CommType
+        
+        def free_port() -> int:
+            with socket.socket() as s:
+                s.bind(('127.0.0.1', 0))
+                return s.getsockname()[1]
+        
+        async def scenario():
+            frame = "$1.00,2.00,3.00;\n"
+            received = {}
+            
+            # 外部 TCP 服务器，供 TCP 客户端连接
+            async def on_client(reader, writer):
+                received['tcp_client'] = await reader.read(-1)
+                writer.close()
+            server = await asyncio.start_server(on_client, '127.0.0.1', 0)
+            client_config = CommConfig(CommType.TCP_CLIENT, host='127.0.0.1',
+                                       tcp_port=server.sockets[0].getsockname()[1])
+            
+            # 管理器作为 TCP 服务器，外部客户端在连接建立后读取
+            server_config = CommConfig(CommType.TCP_SERVER, host='127.0.0.1', tcp_port=free_port(), timeout=2.0)
+            async def external_client():
+                await asyncio.sleep(0.05)
+                reader, writer = await asyncio.open_connection('127.0.0.1', server_config.tcp_port)
+                received['tcp_server'] = await reader.read(-1)
+                writer.close()
+            
+            # UDP 接收端
+            loop = asyncio.get_running_loop()
+            datagrams = []
+            class Receiver(asyncio.DatagramProtocol):
+                def datagram_received(self, data, addr):
+                    datagrams.append(data)
+            udp_transport, _ = await loop.create_datagram_endpoint(Receiver, local_addr=('127.0.0.1', 0))
+            udp_config = CommConfig(CommType.UDP, host='127.0.0.1', udp_local_port=0,
+                                    udp_remote_port=udp_transport.get_extra_info('sockname')[1])
+            
+            managers = [(AsyncCommunicationManager(), c) for c in (client_config, server_config, udp_config)]
+            reader_task = asyncio.create_task(external_client())
+            connected = await asyncio.gather(*(m.connect(c) for m, c in managers))
+            
+            async def send(manager, config):
+                results = [await manager.send_data(frame, config) for _ in range(100)]
+                await manager.disconnect()
+                return all(results)
+            sent = await asyncio.gather(*(send(m, c) for m, c in managers))
+            await reader_task
+            await asyncio.sleep(0.05)
+            server.close()
+            udp_transport.close()
+            return connected, sent, received, b"".join(datagrams), frame.encode() * 100
+        
+        connected, sent, received, udp_data, expected = asyncio.run(scenario())
+        tcp_ok = received.get('tcp_client') == expected and received.get('tcp_server') == expected
+        udp_ok = udp_data == expected
+        print(f"{'✓' if all(connected) else '✗'} 三个连接并发建立: {connected}")
+        print(f"{'✓' if tcp_ok else '✗'} TCP 客户端/服务器各收到 {len(received.get('tcp_client', b''))}/"
+              f"{len(received.get('tcp_server', b''))} 字节")
+        print(f"{'✓' if udp_ok else '✗'} UDP 收到 {len(udp_data)} 字节")
+        
+        return all(connected) and all(sent) and tcp_ok and udp_ok
+        
+    except Exception as e:
+        print(f"✗ 异步通讯测试失败: {e}")
+        return False
+
+def test_fanout_server():
+    """测试多客户端广播：所有客户端收到相同数据，慢速客户端被断开或跳帧"""
+    print("\n=== 多客户端广播测试 ===")
+    try:
+        import socket
+        import threading
+        import time
+        from modules import CommConfig, CommType, CommunicationManager, FanoutServer
+        
+        def run(policy: str):
+            config = CommConfig(CommType.TCP_SERVER, host='127.0.0.1', tcp_port=0, tcp_multi_client=True,
+                                client_buffer_size=32 * 1024, slow_client_policy=policy)
+            manager = CommunicationManager()
+            if not manager.connect(config):
+                return None
+            server = manager.active_connection
+            address = server.address
+            
+            readers, received = [], [bytearray(), bytearray()]
+            def read(sock, sink):
+                while True:
+                    data = sock.recv(65536)
+                    if not data:
+                        break
+                    sink += data
+            for sink in received:
+                sock = socket.create_connection(address)
+                thread = threading.Thread(target=read, args=(sock, sink), daemon=True)
+                thread.start()
+                readers.append((sock, thread))
+            # 慢速客户端：连接后从不读取
+            slow = socket.socket()
+            slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+            slow.connect(address)
+            deadline = time.monotonic() + 2.0
+            while server.client_count < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            
+            frame = b"$" + b"1234.5678," * 50 + b";\n"
+            frames = 20000
+            start = time.perf_counter()
+            for _ in range(frames):
+                manager.send_data(frame, config)
+                if server.clients()[0]['pending'] > 16 * 1024:
+                    time.sleep(0.001)
+            elapsed = time.perf_counter() - start
+            deadline = time.monotonic() + 3.0
+            while any(c['pending'] and c['address'] != slow.getsockname() for c in server.clients()) \
+                    and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stats = server.stats
+            clients_left = server.client_count
+            manager.disconnect()
+            for sock, thread in readers:
+                thread.join(timeout=2.0)
+                sock.close()
+            slow.close()
+            expected = frame * frames
+            return stats, clients_left, all(bytes(r) == expected for r in received), elapsed
+        
+        drop = run('drop')
+        drop_ok = drop is not None and drop[2] and drop[0].clients_dropped == 1 and drop[1] == 2
+        print(f"{'✓' if drop_ok else '✗'} drop 策略: 2个正常客户端完整接收，断开慢速客户端 "
+              f"{drop[0].clients_dropped if drop else '-'} 个，用时 {drop[3] * 1000:.0f}ms" if drop else "✗ 启动失败")
+        
+        skip = run('skip')
+        skip_ok = skip is not None and skip[2] and skip[0].frames_skipped > 0 and skip[1] == 3
+        print(f"{'✓' if skip_ok else '✗'} skip 策略: 慢速客户端保持连接，跳过 "
+              f"{skip[0].frames_skipped if skip else '-'} 帧" if skip else "✗ 启动失败")
+        
+        try:
+            FanoutServer('127.0.0.1', 0, slow_client_policy='wait')
+            policy_ok = False
+        except ValueError:
+            policy_ok = True
+        print(f"{'✓' if policy_ok else '✗'} 拒绝未知策略")
+
+        # 首次发送未写完的剩余部分同样受缓冲区上限约束
+        def oversized(policy: str):
+            server = FanoutServer('127.0.0.1', 0, client_buffer_size=1024, slow_client_policy=policy)
+            server.start()
+            slow = socket.create_connection(server.address)
+            deadline = time.monotonic() + 2.0
+            while server.client_count < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            server.broadcast(b"x" * (8 * 1024 * 1024))
+            pending = [c['pending'] for c in server.clients()]
+            stats = server.stats
+            server.close()
+            slow.close()
+            return stats, pending
+        stats, pending = oversized('drop')
+        bound_ok = stats.clients_dropped == 1 and pending == []
+        stats, pending = oversized('skip')
+        bound_ok = bound_ok and stats.frames_skipped == 1 and pending == [0]
+        print(f"{'✓' if bound_ok else '✗'} 超过缓冲区上限的大帧: drop 断开，skip 整帧跳过")
+
+        return drop_ok and skip_ok and policy_ok and bound_ok
+        
+    except Exception as e:
+        print(f"✗ 多客户端广播测试失败: {e}")
+        return False
+
+def test_receive_path():
+    """测试接收路径：后台读线程、环形缓冲区零拷贝读取与帧扫描"""
+    print("\n=== 接收路径测试 ===")
+    try:
+        import socket
+        import threading
+        import time
+        import numpy as np
+        from modules import (ChecksumAlgorithm, CircularBuffer, CommConfig, CommType,
+                             CommunicationManager, FrameFormatter, FrameScanner)
+        
+        # 回卷与覆盖：容量 16 字节
+        ring = CircularBuffer(16)
+        ring.append(b"0123456789")
+        ring.skip(8)
+        ring.append(b"$ab;$cd")
+        wrap_ok = (bytes(ring.peek()) == b"89$ab;$cd" and ring.find(b";$") == 5
+                   and isinstance(ring.read(2), memoryview))
+        ring.append(b"x" * 20)
+        overwrite_ok = bytes(ring.peek()) == b"x" * 16 and ring.overwritten == 7 + 20 - 16
+        print(f"{'✓' if wrap_ok and overwrite_ok else '✗'} 跨边界查找/零拷贝读取/覆盖旧数据 "
+              f"(覆盖 {ring.overwritten} 字节)")
+        
+        # 校验和帧扫描：损坏帧被丢弃
+        formatter = FrameFormatter([2, 2], checksum=ChecksumAlgorithm.CRC16)
+        block = np.arange(20, dtype=np.float64).reshape(10, 2)
+        data = bytearray(formatter.render(block))
+        data[5] ^= 0x01
+        ring = CircularBuffer(256)
+        ring.append(b"noise" + bytes(data))
+        scanner = FrameScanner(ring, checksum=ChecksumAlgorithm.CRC16)
+        frames = [bytes(f) for f in scanner.frames()]
+        checksum_ok = (len(frames) == 9 and frames[0] == b"2.00,3.00" and scanner.stats.checksum_errors == 1)
+        print(f"{'✓' if checksum_ok else '✗'} 校验和帧扫描: {len(frames)} 帧有效，"
+              f"{scanner.stats.checksum_errors} 帧校验失败")
+
+        # 返回的帧是副本，后续写入覆盖原区域不影响已取出的帧
+        ring = CircularBuffer(8)
+        ring.append(b"$abc;")
+        frame = FrameScanner(ring).next_frame()
+        ring.append(b"z" * 8)
+        copy_ok = isinstance(frame, bytes) and frame == b"abc"
+        print(f"{'✓' if copy_ok else '✗'} 提取的帧不随缓冲区覆盖而改变: {frame!r}")
+        
+        # TCP 回环：对端回显，后台读线程接收并按帧切分
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        def echo():
+            conn, _ = listener.accept()
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                conn.sendall(data)
+            conn.close()
+        threading.Thread(target=echo, daemon=True).start()
+        
+        config = CommConfig(CommType.TCP_CLIENT, host='127.0.0.1', tcp_port=listener.getsockname()[1])
+        manager = CommunicationManager()
+        manager.connect(config)
+        buffer = manager.start_reader(config, capacity=64 * 1024)
+        scanner = FrameScanner(buffer)
+        count = 5000
+        received = []
+        start = time.perf_counter()
+        for i in range(count):
+            manager.send_data(f"${i},{i * 0.5:.1f};\n", config)
+            received.extend(bytes(f) for f in scanner.frames())
+        deadline = time.monotonic() + 3.0
+        while len(received) < count and time.monotonic() < deadline:
+            buffer.wait_for_data(1, 0.05)
+            received.extend(bytes(f) for f in scanner.frames())
+        elapsed = time.perf_counter() - start
+        stats = manager.get_receive_stats()
+        manager.disconnect()
+        listener.close()
+        loop_ok = received == [f"{i},{i * 0.5:.1f}".encode() for i in range(count)]
+        print(f"{'✓' if loop_ok else '✗'} TCP 回显 {len(received)}/{count} 帧，接收 {stats.bytes_received} 字节 "
+              f"/ {stats.reads} 次读取，{count / elapsed:.0f} 帧/秒")
+        
+        return wrap_ok and overwrite_ok and checksum_ok and copy_ok and loop_ok
+        
+    except Exception as e:
+        print(f"✗ 接收路径测试失败: {e}")
+        return False
+
+def test_latency_measurement():
+    """测试端到端延迟：尾标匹配、丢帧/乱序/重复统计和自动化脚本回环测量"""
+    print("\n=== 端到端延迟测试 ===")
+    try:
+        import socket
+        import threading
+        from modules.communication.latency import FrameStamper, LatencyTracker
+        from modules import CircularBuffer
+        
+        # 人为构造乱序、重复和丢帧
+        stamper = FrameStamper()
+        frames = [stamper.stamp("$1.0,2.0;\n") for _ in range(6)]
+        stamp_ok = frames[0].startswith(b"$1.0,2.0;<0,") and frames[0].endswith(b">\n")
+        buffer = CircularBuffer(4096)
+        tracker = LatencyTracker(buffer)
+        for index in [0, 2, 1, 2, 4]:
+            buffer.append(frames[index])
+        tracker.poll()
+        report = tracker.report(stamper.sent)
+        counts_ok = (report.received == 4 and report.lost == 2 and report.reordered == 1
+                     and report.duplicates == 1 and report.rtt_p99 >= report.rtt_p50 > 0)
+        print(f"{'✓' if stamp_ok and counts_ok else '✗'} 接收 {report.received}/{report.sent}，丢失 {report.lost}，"
+              f"乱序 {report.reordered}，重复 {report.duplicates}")
+        
+        # 自动化脚本经 TCP 回显服务测量往返时延
+        from serial_studio_automation import SerialStudioAutomation, TestConfig
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen(1)
+        def echo():
+            conn, _ = listener.accept()
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                conn.sendall(data)
+            conn.close()
+        threading.Thread(target=echo, daemon=True).start()
+        
+        automation = SerialStudioAutomation()
+        automation.measure_latency = True
+        automation._connect('tcp', host='127.0.0.1', port=listener.getsockname()[1])
+        config = TestConfig("回环", "延迟测量", duration=1, interval=0.005,
+                            data_format="$%ACC_X%,%ACC_Y%,%ACC_Z%;\n", expected_components=[], validation_rules={})
+        result = automation._run_single_test(config)
+        reader = automation.reader
+        automation._disconnect()
+        listener.close()
+        # 连接对象已不存在时断开也要停止回环读线程
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        udp.bind(('127.0.0.1', 0))
+        automation.comm_connection = udp
+        automation._start_loopback_reader()
+        orphan = automation.reader
+        automation.comm_connection = None
+        automation._disconnect()
+        udp.close()
+        stopped_ok = (automation.reader is None and not reader._thread.is_alive()
+                      and not orphan._thread.is_alive())
+        print(f"{'✓' if stopped_ok else '✗'} 断开后回环读线程已停止")
+        latency = result.latency
+        loop_ok = (latency is not None and latency['sent'] == result.packets_sent > 0
+                   and latency['lost'] == 0 and result.average_latency == latency['rtt_mean'])
+        print(f"{'✓' if loop_ok else '✗'} TCP 回显 {latency['received']}/{latency['sent']} 帧，RTT P50 "
+              f"{latency['rtt_p50']:.3f}ms，P99 {latency['rtt_p99']:.3f}ms" if latency else "✗ 未生成延迟统计")
+        
+        return stamp_ok and counts_ok and loop_ok and stopped_ok
+        
+    except Exception as e:
+        print(f"✗ 端到端延迟测试失败: {e}")
+        return False
+
+def test_virtual_serial():
+    """测试虚拟串口：pty 从设备可作为串口打开，节流速率符合线路参数"""
+    print("\n=== 虚拟串口测试 ===")
+    try:
+        import os
+        import time
+        import serial
+        from modules import CommConfig, CommType, CommunicationManager
+        
+        if not hasattr(os, 'openpty'):
+            print("✓ 当前平台不支持伪终端，跳过")
+            return True
+        from modules.communication.virtual_serial import VirtualSerialPort, bits_per_character
+        
+        # 不节流：经 CommunicationManager 发送，从设备端用 pyserial 读取，并回写
+        config = CommConfig(CommType.SERIAL, baudrate=115200, virtual_serial=True, emulate_baudrate=False)
+        manager = CommunicationManager()
+        connected = manager.connect(config)
+        port = manager.active_connection.port
+        device = serial.Serial(port, 115200, timeout=1.0)
+        buffer = manager.start_reader(config, capacity=4096)
+        manager.send_data("$1.00,2.00;\n", config)
+        echo = device.read(12)
+        device.write(b"ack\n")
+        device.flush()
+        buffer.wait_for_data(4, 1.0)
+        reply = bytes(buffer.peek())
+        device.close()
+        manager.disconnect()
+        pair_ok = connected and echo == b"$1.00,2.00;\n" and reply == b"ack\n"
+        print(f"{'✓' if pair_ok else '✗'} 虚拟串口 {port} 双向收发")
+        
+        # 9600 8N1 节流：960 字节/秒，发送 480 字节约需 0.5 秒
+        bits_ok = bits_per_character(8, 'N', 1) == 10 and bits_per_character(7, 'E', 2) == 11
+        port = VirtualSerialPort(9600, tx_buffer_size=64, timeout=0.1)
+        reader = serial.Serial(port.port, 9600, timeout=0.1)
+        start = time.perf_counter()
+        port.write(b"x" * 480)
+        port.flush()
+        elapsed = time.perf_counter() - start
+        received = len(reader.read(1000))
+        
+        # 写超时：缓冲区满且超过写超时即计为溢出
+        port.write_timeout = 0.05
+        try:
+            port.write(b"y" * 1000)
+            overrun_ok = False
+        except serial.SerialTimeoutException:
+            overrun_ok = port.stats.overruns == 1 and port.stats.dropped_bytes > 0
+        reader.close()
+        port.close()
+        pace_ok = 0.4 < elapsed < 0.7 and received == 480
+        print(f"{'✓' if pace_ok else '✗'} 9600bps 发送 480 字节用时 {elapsed:.3f}s（理论 0.5s），对端收到 {received} 字节")
+        print(f"{'✓' if overrun_ok else '✗'} 写超时溢出: {port.stats.overruns} 次，丢弃 {port.stats.dropped_bytes} 字节")
+
+        # 不节流且对端不读取：pty 缓冲区满后同样按写超时抛出，而不是一直阻塞
+        port = VirtualSerialPort(pace=False, write_timeout=0.1)
+        start = time.perf_counter()
+        try:
+            port.write(b"z" * (1024 * 1024))
+            unpaced_ok = False
+        except serial.SerialTimeoutException:
+            unpaced_ok = port.stats.overruns == 1 and port.stats.dropped_bytes > 0
+        blocked = time.perf_counter() - start
+        port.close()
+        unpaced_ok = unpaced_ok and blocked < 1.0
+        print(f"{'✓' if unpaced_ok else '✗'} 不节流写超时: {blocked:.3f}s 后抛出，丢弃 {port.stats.dropped_bytes} 字节")
+
+        return pair_ok and bits_ok and pace_ok and overrun_ok and unpaced_ok
+        
+    except Exception as e:
+        print(f"✗ 虚拟串口测试失败: {e}")
+        return False
+
+def test_sinks():
+    """测试数据汇：丢弃/文件/管道输出与生成吞吐上限"""
+    print("\n=== 数据汇测试 ===")
+    try:
+        import os
+        import subprocess
+        import sys
+        import tempfile
+        from modules import (CommConfig, CommType, CommunicationManager, ComponentGeneratorFactory,
+                             ComponentType, DefaultConfigs, NullSink, VirtualClock)
+        from modules.communication.sinks import measure_generation_throughput
+        
+        # 经 CommunicationManager 写文件
+        path = os.path.join(tempfile.mkdtemp(), "frames.dat")
+        config = CommConfig(CommType.FILE, file_path=path)
+        manager = CommunicationManager()
+        connected = manager.connect(config)
+        for i in range(1000):
+            manager.send_data(f"${i},{i * 2};\n", config)
+        stats = manager.get_sink_stats()
+        manager.disconnect()
+        with open(path, 'rb') as f:
+            content = f.read()
+        file_ok = connected and content.count(b"\n") == 1000 and stats.frames == 1000 and stats.bytes == len(content)
+        print(f"{'✓' if file_ok else '✗'} 文件输出 {stats.frames} 帧 / {stats.bytes} 字节")
+        
+        # 管道：子进程向标准输出写 100 帧，父进程读取
+        code = ("from modules import CommConfig, CommType, CommunicationManager\n"
+                "c = CommConfig(CommType.PIPE); m = CommunicationManager(); m.connect(c)\n"
+                "[m.send_data('$1,2;\\n', c) for _ in range(100)]\n"
+                "m.disconnect()\n")
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, timeout=30,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+        pipe_ok = output == b"$1,2;\n" * 100
+        print(f"{'✓' if pipe_ok else '✗'} 管道输出 {len(output)} 字节")
+        
+        # 生成吞吐上限：默认组件批量生成写入丢弃汇
+        configs = [c for c in DefaultConfigs.get_default_component_configs()
+                   if c.component_type != ComponentType.TERMINAL]
+        factory = ComponentGeneratorFactory(clock=VirtualClock(1000.0))
+        stats = measure_generation_throughput(factory, configs, NullSink(), duration=0.3)
+        null_ok = stats.frames > 0 and stats.frames_per_second > 0
+        print(f"{'✓' if null_ok else '✗'} 生成吞吐上限: {stats.frames_per_second:,.0f} 帧/秒, "
+              f"{stats.bytes_per_second / 1024 / 1024:.1f} MB/s（{len(configs)} 个组件）")
+        
+        return file_ok and pipe_ok and null_ok
+        
+    except Exception as e:
+        print(f"✗ 数据汇测试失败: {e}")
+        return False
+
+def test_port_inventory():
+    """测试串口清单缓存：增删通知、/dev 热插拔监听和缓存命中"""
+    print("\n=== 串口清单缓存测试 ===")
+    try:
+        import os
+        import threading
+        import time
+        from modules import CommunicationManager, SerialPortInventory
+        from modules.communication.port_inventory import PORT_ADDED, PORT_REMOVED, scan_serial_ports
+        
+        devices = ['/dev/ttyUSB0']
+        scans = []
+        def fake_scan():
+            scans.append(time.monotonic())
+            return [{'device': d, 'description': 'USB Serial'} for d in devices]
+        
+        inventory = SerialPortInventory(scan=fake_scan)
+        events = []
+        arrived = threading.Event()
+        def on_change(event, port):
+            events.append((event, port['device']))
+            arrived.set()
+        inventory.add_listener(on_change)
+        baseline_ok = [p['device'] for p in inventory.ports()] == ['/dev/ttyUSB0'] and not events
+        devices.append('/dev/ttyACM0')
+        devices.remove('/dev/ttyUSB0')
+        inventory.refresh()
+        events_ok = events == [(PORT_ADDED, '/dev/ttyACM0'), (PORT_REMOVED, '/dev/ttyUSB0')]
+        print(f"{'✓' if baseline_ok and events_ok else '✗'} 增删通知: {events}")
+        
+        # 后台监听：在 /dev 中创建 tty 节点触发刷新（/dev 不可写时跳过）
+        inventory.start()
+        mode = inventory.watch_mode
+        probe = f"/dev/ttyINVENTORY{os.getpid()}"
+        watch_ok = True
+        if mode == 'inotify' and os.access('/dev', os.W_OK):
+            events.clear()
+            arrived.clear()
+            devices.append(probe)
+            open(probe, 'w').close()
+            try:
+                watch_ok = arrived.wait(2.0) and events == [(PORT_ADDED, probe)]
+            finally:
+                os.remove(probe)
+            print(f"{'✓' if watch_ok else '✗'} inotify 监听 /dev: {events}")
+        else:
+            print(f"✓ 后台刷新方式: {mode}（/dev 不可写，跳过热插拔模拟）")
+        inventory.stop()
+        
+        # 共享缓存：重复查询不再枚举
+        start = time.perf_counter()
+        scan_serial_ports()
+        scan_time = time.perf_counter() - start
+        CommunicationManager.get_available_serial_ports()
+        start = time.perf_counter()
+        for _ in range(100):
+            CommunicationManager.get_available_serial_ports()
+        cached_time = (time.perf_counter() - start) / 100
+        cache_ok = cached_time < scan_time
+        print(f"{'✓' if cache_ok else '✗'} 枚举 {scan_time * 1000:.2f}ms，缓存查询 {cached_time * 1e6:.1f}µs")
+        
+        return baseline_ok and events_ok and watch_ok and cache_ok
+        
+    except Exception as e:
+        print(f"✗ 串口清单缓存测试失败: {e}")
+        return False
+
+def test_component_scheduler():
+    """测试组件调度器：到期顺序、追赶批量和实际发送速率"""
+    print("\n=== 组件调度器测试 ===")
+    try:
+        import time
+        from modules import ComponentScheduler
+        
+        # 虚拟纳秒时钟：1000Hz 与 30Hz 组件
+        now = [0]
+        scheduler = ComponentScheduler(clock_ns=lambda: now[0])
+        scheduler.add('fast', 1000.0)
+        scheduler.add('slow', 30.0)
+        first = scheduler.due()
+        now[0] = 1_000_000_000
+        batch = dict(scheduler.due())
+        # 1 秒内：起点各一帧，之后 fast 1000 帧、slow 30 帧一次取出
+        counts_ok = sorted(first) == [('fast', 1), ('slow', 1)] and batch == {'fast': 1000, 'slow': 30}
+        print(f"{'✓' if counts_ok else '✗'} 追赶批量: {batch}")
+        
+        next_ok = scheduler.next_deadline() == 1_001_000_000 and scheduler.time_until_next() == 0.001
+        scheduler.sync({'slow': 30.0})
+        now[0] = 2_000_000_000
+        sync_ok = dict(scheduler.due()) == {'slow': 30} and len(scheduler) == 1
+        print(f"{'✓' if next_ok and sync_ok else '✗'} 下一到期时刻与组件同步")
+        
+        capped = ComponentScheduler(clock_ns=lambda: now[0], max_catchup=10)
+        capped.add('fast', 1000.0, start_ns=0)
+        cap_ok = capped.due() == [('fast', 10)] and capped.stats.skipped == 2001 - 10
+        deadlines = capped.recent_deadlines('fast', 10)
+        cap_ok = cap_ok and deadlines == [1_991_000_000 + i * 1_000_000 for i in range(10)]
+        print(f"{'✓' if cap_ok else '✗'} 追赶上限: 跳过 {capped.stats.skipped} 个采样，"
+              f"补发最近 10 个到期时刻")
+        
+        # 实际时钟：休眠到下一到期时刻，1000Hz 组件 0.3 秒约 300 帧（不受全局间隔限制）
+        scheduler = ComponentScheduler()
+        scheduler.add('fast', 1000.0)
+        sent = 0
+        start = time.monotonic()
+        while time.monotonic() - start < 0.3:
+            sent += sum(count for _, count in scheduler.due())
+            time.sleep(min(scheduler.time_until_next(), 0.1))
+        rate = sent / (time.monotonic() - start)
+        rate_ok = 900 <= rate <= 1100
+        print(f"{'✓' if rate_ok else '✗'} 1000Hz 组件实际速率: {rate:.0f} 帧/秒, "
+              f"追赶批次 {scheduler.stats.catchup_passes}")
+        
+        return counts_ok and next_ok and sync_ok and cap_ok and rate_ok
+        
+    except Exception as e:
+        print(f"✗ 组件调度器测试失败: {e}")
+        return False
+
+def test_pacing():
+    """测试发送节拍：绝对到期时刻不因发送耗时漂移，记录间隔抖动"""
+    print("\n=== 发送节拍测试 ===")
+    try:
+        import time
+        from modules import Pacer, DeadlineSleeper
+        from modules.components.pacing import PACING_SLEEP, PacingStats
+        
+        def busy(seconds):
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                pass
+        
+        # 每次发送耗时 2ms、间隔 5ms：相对休眠只能达到约 143/s，绝对到期时刻保持 200/s
+        start = time.monotonic()
+        naive = 0
+        while time.monotonic() - start < 0.3:
+            busy(0.002)
+            naive += 1
+            time.sleep(0.005)
+        naive_rate = naive / (time.monotonic() - start)
+        
+        pacer = Pacer(0.005)
+        for _ in range(60):
+            pacer.wait()
+            busy(0.002)
+        report = pacer.report()
+        pacer.close()
+        rate_ok = abs(report.achieved_rate - 200) < 10 and report.target_rate == 200
+        print(f"{'✓' if rate_ok else '✗'} {pacer.sleeper.backend}: 实际 {report.achieved_rate:.1f}/s "
+              f"(相对休眠 {naive_rate:.1f}/s), 抖动 P50 {report.jitter_p50:.0f}µs / P99 {report.jitter_p99:.0f}µs")
+        
+        # 混合模式：到期前忙等，唤醒不早于到期时刻
+        sleeper = DeadlineSleeper(PACING_SLEEP, spin=0.0005)
+        deadline = time.monotonic_ns() + 2_000_000
+        spin_ok = sleeper.sleep_until(deadline) >= deadline
+        print(f"{'✓' if spin_ok else '✗'} 混合休眠不早于到期时刻")
+        
+        # 统计：计划间隔 1ms，一次唤醒晚 300µs
+        stats = PacingStats()
+        for deadline, actual in [(0, 0), (1_000_000, 1_000_000), (2_000_000, 2_300_000), (3_000_000, 3_000_000)]:
+            stats.record(deadline, actual)
+        stats_report = stats.report()
+        stats_ok = (stats_report.jitter_max == 300 and stats_report.lateness_max == 300
+                    and stats_report.target_rate == stats_report.achieved_rate == 1000)
+        print(f"{'✓' if stats_ok else '✗'} 抖动统计: 最大 {stats_report.jitter_max:.0f}µs")
+        
+        try:
+            DeadlineSleeper('busy')
+            invalid_ok = False
+        except ValueError:
+            invalid_ok = True
+        
+        return rate_ok and spin_ok and stats_ok and invalid_ok
+        
+    except Exception as e:
+        print(f"✗ 发送节拍测试失败: {e}")
+        return False
+
+def test_send_queue():
+    """测试发送队列：写线程阻塞时各背压策略的排队、丢帧和替换"""
+    print("\n=== 发送队列测试 ===")
+    try:
+        import threading
+        import time
+        from modules import SendQueue, CommunicationManager, CommConfig, CommType
+        
+        # 写线程在 gate 打开前阻塞，模拟串口写超时
+        def run(policy, frames):
+            gate = threading.Event()
+            written = []
+            def slow_write(data):
+                gate.wait()
+                written.append(data)
+            queue = SendQueue(slow_write, capacity=4, policy=policy)
+            # 第一帧被写线程取走并阻塞后，队列才开始积压
+            accepted = [queue.put(frames[0][1], frames[0][0])]
+            while queue.depth:
+                time.sleep(0.001)
+            start = time.perf_counter()
+            for key, data in frames[1:]:
+                if policy == 'block' and queue.depth >= 4:
+                    threading.Timer(0.05, gate.set).start()
+                accepted.append(queue.put(data, key))
+            elapsed = time.perf_counter() - start
+            gate.set()
+            queue.flush(1.0)
+            queue.close()
+            return queue.stats, written, accepted, elapsed
+        
+        frames = [(None, b'%d' % i) for i in range(20)]
+        stats, written, _, elapsed = run('block', frames)
+        block_ok = len(written) == 20 and stats.dropped == 0 and stats.blocked_time > 0
+        print(f"{'✓' if block_ok else '✗'} block: 写出 {len(written)} 帧, 生成线程等待 {stats.blocked_time * 1000:.0f}ms")
+        
+        stats, written, accepted, elapsed = run('drop_newest', frames)
+        newest_ok = (written == [b'0', b'1', b'2', b'3', b'4'] and stats.dropped_newest == 15
+                     and accepted.count(False) == 15 and elapsed < 0.05)
+        print(f"{'✓' if newest_ok else '✗'} drop_newest: 写出 {[w.decode() for w in written]}, 丢弃 {stats.dropped_newest}")
+        
+        stats, written, _, elapsed = run('drop_oldest', frames)
+        oldest_ok = (written[0] == b'0' and written[-4:] == [b'16', b'17', b'18', b'19']
+                     and stats.dropped_oldest == 15 and stats.max_depth == 4)
+        print(f"{'✓' if oldest_ok else '✗'} drop_oldest: 写出 {[w.decode() for w in written]}, 丢弃 {stats.dropped_oldest}")
+        
+        # 两个组件交替放入：每个组件最多排队一帧，写出的是各自最新值
+        frames = [('acc' if i % 2 else 'gps', b'%d' % i) for i in range(20)]
+        stats, written, _, elapsed = run('coalesce', frames)
+        coalesce_ok = sorted(written[1:]) == [b'18', b'19'] and stats.max_depth <= 2 and stats.coalesced == 17
+        print(f"{'✓' if coalesce_ok else '✗'} coalesce: 写出 {[w.decode() for w in written]}, 替换 {stats.coalesced}")
+        
+        # 通讯管理器：send_data 入队，断开前写出全部排队帧
+        manager = CommunicationManager()
+        config = CommConfig(comm_type=CommType.NULL, send_queue_size=64)
+        manager.connect(config)
+        buffer = bytearray(b'$1,2,3;\n')
+        for _ in range(1000):
+            manager.send_data(memoryview(buffer), config)
+        buffer[:] = b'XXXXXXXX'
+        manager.flush()
+        sink_stats = manager.get_sink_stats()
+        queue_stats = manager.get_queue_stats()
+        manager_ok = sink_stats.frames == 1000 and queue_stats.sent == 1000 and queue_stats.depth == 0
+        manager.disconnect()
+        print(f"{'✓' if manager_ok else '✗'} 通讯管理器发送队列: 写出 {queue_stats.sent} 帧, 最大排队 {queue_stats.max_depth}")
+        
+        try:
+            SendQueue(lambda data: None, policy='drop_all')
+            invalid_ok = False
+        except ValueError:
+            invalid_ok = True
+        
+        return block_ok and newest_ok and oldest_ok and coalesce_ok and manager_ok and invalid_ok
+        
+    except Exception as e:
+        print(f"✗ 发送队列测试失败: {e}")
+        return False
+
+def test_engine_process():
+    """测试独立进程引擎：共享帧环、统计快照和子进程发送"""
+    print("\n=== 独立进程引擎测试 ===")
+    try:
+        import time
+        from modules import SharedFrameRing, SharedStats, EngineProcess, CommConfig, CommType, ComponentConfig, ComponentType
+        
+        # 帧环：跨越环尾的记录完整读出，空间不足时丢弃新记录而不阻塞
+        ring = SharedFrameRing(64)
+        reader = SharedFrameRing(name=ring.name)
+        written = [ring.write(b'x' * 20) for _ in range(3)]
+        first = reader.read(1)
+        written.append(ring.write(b'abcdefghijklmnopqrstuvwxyz'))
+        records = reader.read()
+        ring_ok = (written == [True, True, False, True] and ring.dropped == 1
+                   and first == [b'x' * 20] and records == [b'x' * 20, b'abcdefghijklmnopqrstuvwxyz'] and len(ring) == 0)
+        print(f"{'✓' if ring_ok else '✗'} 帧环: 写入 {written}, 丢弃 {ring.dropped}")
+        reader.close()
+        ring.close()
+        
+        stats = SharedStats(('sent', 'errors'))
+        stats.publish(sent=5, errors=1)
+        stats_ok = stats.snapshot() == {'sent': 5, 'errors': 1}
+        stats.close()
+        print(f"{'✓' if stats_ok else '✗'} 统计块快照: sent=5, errors=1")
+        
+        # 子进程连接空输出并按组件频率发送 0.5 秒
+        engine = EngineProcess()
+        engine.start()
+        engine.connect(CommConfig(comm_type=CommType.NULL))
+        component = ComponentConfig("加速度", ComponentType.ACCELEROMETER, frequency=200)
+        engine.set_preview_sample(10)
+        engine.start_sending([component], interval=0.1, duration=0.5)
+        events, frames = [], []
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            events += engine.poll_events()
+            frames += engine.read_frames()
+            if ('sending', False, None) in events:
+                break
+            time.sleep(0.02)
+        result = engine.stats()
+        events += engine.close()
+        
+        engine_ok = (events[0] == ('connected', True, '') and ('sending', False, None) in events
+                     and 80 <= result.sent <= 110 and result.errors == 0
+                     and 0 < len(frames) <= result.sent / 10 and frames[0].startswith("[加速度] ")
+                     and not engine.alive)
+        print(f"{'✓' if engine_ok else '✗'} 子进程发送: {result.sent} 帧, 速率 {result.rate:.0f} 帧/秒, 每10帧预览 1 条共 {len(frames)} 条")
+        
+        return ring_ok and stats_ok and engine_ok
+        
+    except Exception as e:
+        print(f"✗ 独立进程引擎测试失败: {e}")
+        return False
+
+def test_preview_buffer():
+    """测试预览缓冲：采样、环满覆盖和批量取出"""
+    print("\n=== 预览缓冲测试 ===")
+    try:
+        import time
+        from modules import PreviewBuffer
+        
+        # 每 10 帧保留 1 帧
+        buffer = PreviewBuffer(capacity=100, sample_every=10)
+        kept = [buffer.push(f"frame {i}") for i in range(1, 101)]
+        entries = buffer.drain()
+        sample_ok = (kept.count(True) == 10 and [text for _, text in entries] == [f"frame {i}" for i in range(10, 101, 10)]
+                     and len(buffer) == 0 and buffer.drain() == [])
+        print(f"{'✓' if sample_ok else '✗'} 采样: 放入 {buffer.offered} 帧, 保留 {len(entries)} 帧")
+        
+        # 界面来不及取出时只保留最新的 capacity 条
+        buffer = PreviewBuffer(capacity=50)
+        start = time.perf_counter()
+        for i in range(100000):
+            buffer.push(f"frame {i}")
+        elapsed = time.perf_counter() - start
+        entries = buffer.drain()
+        overflow_ok = (len(entries) == 50 and entries[-1][1] == "frame 99999"
+                       and buffer.overwritten == 100000 - 50)
+        print(f"{'✓' if overflow_ok else '✗'} 环满覆盖: 保留 {len(entries)} 条, 覆盖 {buffer.overwritten} 条, "
+              f"每帧 {elapsed / 100000 * 1e9:.0f}ns")
+        
+        try:
+            buffer.set_sample_every(0)
+            invalid_ok = False
+        except ValueError:
+            invalid_ok = True
+        print(f"{'✓' if invalid_ok else '✗'} 无效采样间隔被拒绝")
+        
+        return sample_ok and overflow_ok and invalid_ok
+        
+    except Exception as e:
+        print(f"✗ 预览缓冲测试失败: {e}")
+        return False
+
+def test_send_loop_frames():
+    """测试发送循环按组件帧格式成帧：写入文件输出后按帧布局解析"""
+    print("\n=== 发送循环成帧测试 ===")
+    try:
+        import os
+        import tempfile
+        from modules import (SendLoop, ComponentGeneratorFactory, CommunicationManager, CommConfig, CommType,
+                             ComponentConfig, ComponentType, DataGenConfig, DataGenRule, FrameFormat,
+                             BinaryFrameConfig)
+        from modules.protocol.binary import compile_layout
+        
+        def send(config, duration=0.1):
+            """以文件输出运行发送循环，返回写出的字节"""
+            handle, path = tempfile.mkstemp(suffix='.dat')
+            os.close(handle)
+            try:
+                manager = CommunicationManager()
+                comm_config = CommConfig(comm_type=CommType.FILE, file_path=path)
+                manager.connect(comm_config)
+                loop = SendLoop(ComponentGeneratorFactory(), manager, comm_config, [config],
+                                interval=0.01, duration=duration)
+                loop.run()
+                manager.disconnect()
+                with open(path, 'rb') as f:
+                    return f.read(), loop.sent_count
+            finally:
+                os.remove(path)
+        
+        channels = [DataGenConfig(DataGenRule.SINE_WAVE, -100, 100, amplitude=100, frequency=1.0),
+                    DataGenConfig(DataGenRule.CONSTANT, 42)]
+        
+        # 二进制帧：int16 定长帧，可按帧布局还原数值
+        binary = ComponentConfig("二进制", ComponentType.PLOT, frequency=100, data_generation=channels,
+                                 frame_format=FrameFormat.BINARY,
+                                 binary_frame=BinaryFrameConfig(value_types=['int16']))
+        data, sent = send(binary)
+        layout = compile_layout(binary)
+        values = layout.unpack(data)
+        binary_ok = (sent > 0 and len(data) == sent * layout.frame_size
+                     and (values[:, 1] == 42).all() and abs(values[:, 0]).max() <= 100)
+        print(f"{'✓' if binary_ok else '✗'} 二进制帧: {sent} 帧, 每帧 {layout.frame_size} 字节")
+        
+        def split_frames(data, checksum_size):
+            """按 $载荷;校验和\\n 逐帧切分（校验和为原始字节，可能包含换行）"""
+            frames, position = [], 0
+            while position < len(data):
+                end = data.index(b';', position)
+                frames.append((data[position + 1:end], data[end + 1:end + 1 + checksum_size]))
+                position = end + 1 + checksum_size + 1
+            return frames
+        
+        # 文本帧的校验和在实时发送中同样追加
+        from modules import ChecksumAlgorithm
+        from modules.protocol.checksum import verify
+        text = ComponentConfig("校验和", ComponentType.PLOT, frequency=100, data_generation=channels,
+                               checksum=ChecksumAlgorithm.CRC16)
+        data, sent = send(text)
+        frames = split_frames(data, 2)
+        checksum_ok = (sent > 0 and len(frames) == sent
+                       and all(verify(ChecksumAlgorithm.CRC16, payload, crc) for payload, crc in frames))
+        print(f"{'✓' if checksum_ok else '✗'} 文本帧 CRC-16: {len(frames)} 帧校验通过")
+        
+        # Base64 载荷编码：分隔符保持原样，载荷解码后为 CSV 数值
+        import base64
+        from modules import DecoderMethod
+        encoded = ComponentConfig("Base64", ComponentType.MULTIPLOT, frequency=100, data_generation=channels,
+                                  decoder=DecoderMethod.BASE64)
+        data, sent = send(encoded)
+        payloads = [base64.b64decode(payload).decode() for payload, _ in split_frames(data, 0)]
+        decoder_ok = (sent > 0 and len(payloads) == sent
+                      and all(float(payload.split(',')[1]) == 42 for payload in payloads))
+        print(f"{'✓' if decoder_ok else '✗'} Base64 载荷: {payloads[0] if payloads else ''}")
+        
+        # 追赶补发：逾期采样按各自的到期时刻生成，时钟每个采样时隙前进一步
+        import time
+        import numpy as np
+        clock = ComponentConfig("时刻", ComponentType.PLOT, frequency=200,
+                                data_generation=[DataGenConfig(DataGenRule.CUSTOM_FUNCTION, 0, 1e9,
+                                                               custom_function="t")],
+                                frame_format=FrameFormat.BINARY,
+                                binary_frame=BinaryFrameConfig(value_types=['float64']))
+        factory = ComponentGeneratorFactory()
+        manager = CommunicationManager()
+        comm_config = CommConfig(comm_type=CommType.NULL)
+        manager.connect(comm_config)
+        written = []
+        def stall(label, frame_data, ok):
+            written.append(frame_data)
+            if len(written) == 3:
+                time.sleep(0.05)
+        loop = SendLoop(factory, manager, comm_config, [clock], interval=0.01, duration=0.2, on_frame=stall)
+        loop.run()
+        manager.disconnect()
+        times = compile_layout(clock).unpack(b"".join(written))[:, 0]
+        gaps = np.diff(times)
+        catchup_ok = (len(written) < len(times) and gaps.max() < 2 / clock.frequency
+                      and gaps.min() > 0 and factory.data_generator.time_counter == len(times))
+        print(f"{'✓' if catchup_ok else '✗'} 追赶补发: {len(times)} 个采样 / {len(written)} 次写出，"
+              f"采样间隔 {gaps.min() * 1000:.2f}-{gaps.max() * 1000:.2f}ms")
+
+        # 更新组件列表：同名组件就地合并，未变的通道保留原生成配置（振荡器相位、ODE 状态不重置）
+        import copy
+        loop = SendLoop(factory, manager, comm_config, [clock, binary])
+        sine = binary.data_generation[0]
+        edited = copy.deepcopy(binary)
+        edited.checksum = ChecksumAlgorithm.CRC16
+        edited.data_generation[1].min_value = 7
+        loop.set_components([clock, edited])
+        current = loop._components[1]
+        inplace_ok = (current is binary and binary.checksum == ChecksumAlgorithm.CRC16
+                      and binary.data_generation[0] is sine and binary.data_generation[1].min_value == 7)
+        print(f"{'✓' if inplace_ok else '✗'} 组件就地更新: 未变通道保留原配置对象")
+
+        return binary_ok and checksum_ok and decoder_ok and catchup_ok and inplace_ok
+
+    except Exception as e:
+        print(f"✗ 发送循环成帧测试失败: {e}")
+        return False
+
 def main():
     """主测试函数"""
     print("Serial Studio 模块化功能完整性测试")
@@ -196,7 +1852,33 @@ def main():
         test_data_generation_rules,
         test_communication_manager,
         test_time_stepping,
-        test_serial_studio_protocol
+        test_serial_studio_protocol,
+        test_block_generation,
+        test_custom_function_validation,
+        test_precompiled_samplers,
+        test_virtual_clock,
+        test_seeded_streams,
+        test_phase_oscillators,
+        test_lorenz_attractor,
+        test_frame_formatter,
+        test_binary_frames,
+        test_checksums,
+        test_wire_encoders,
+        test_merged_frame,
+        test_write_coalescing,
+        test_async_transport,
+        test_fanout_server,
+        test_receive_path,
+        test_latency_measurement,
+        test_virtual_serial,
+        test_sinks,
+        test_port_inventory,
+        test_component_scheduler,
+        test_pacing,
+        test_send_queue,
+        test_engine_process,
+        test_preview_buffer,
+        test_send_loop_frames
     ]
     
     results = []
@@ -216,7 +1898,7 @@ def main():
     
     test_names = [
         "模块导入", "组件工厂", "数据生成规则", 
-        "通讯管理器", "时间步进", "协议格式"
+        "通讯管理器", "时间步进", "协议格式", "批量生成", "表达式校验", "预编译采样器", "虚拟时钟", "随机流复现", "相位振荡器", "洛伦兹吸引子", "帧格式化", "二进制帧", "帧校验和", "线路编码", "合并帧", "写合并", "异步通讯", "多客户端广播", "接收路径", "端到端延迟", "虚拟串口", "数据汇", "串口清单缓存", "组件调度器", "发送节拍", "发送队列", "独立进程引擎", "预览缓冲", "发送循环成帧"
     ]
     
     for i, (name, result) in enumerate(zip(test_names, results)):